@@ -1,6 +1,9 @@
 // Load cards data
 let cardsData = null;
 let authorsData = null;
+// Normalized card name -> no (card_aliases.json), and no -> card
+let cardAliases = null;
+let cardsByNo = null;
 
 // Global tooltip management to prevent conflicts
 let currentTooltip = null;
@@ -12,9 +15,27 @@ const TOOLTIP_HIDE_DELAY = 150; // Delay before hiding tooltip (ms)
 // Load cards.json and authors.json
 async function loadCardsData() {
   try {
-    const cardsResponse = await fetch(chrome.runtime.getURL('cards.json'));
-    cardsData = await cardsResponse.json();
+    // Projected bundle with the fields shown here (scripts/card_bundles.py), else all the cards
+    try {
+      const bundleResponse = await fetch(chrome.runtime.getURL('cards.zh.json'));
+      if (!bundleResponse.ok) throw new Error(`cards.zh.json: HTTP ${bundleResponse.status}`);
+      cardsData = await bundleResponse.json();
+    } catch (error) {
+      const cardsResponse = await fetch(chrome.runtime.getURL('cards.json'));
+      if (!cardsResponse.ok) throw new Error(`cards.json: HTTP ${cardsResponse.status}`);
+      cardsData = await cardsResponse.json();
+    }
     console.log('Cards data loaded:', cardsData.length, 'cards');
+    cardsByNo = new Map(cardsData.map(c => [c.no, c]));
+
+    try {
+      const aliasesResponse = await fetch(chrome.runtime.getURL('card_aliases.json'));
+      if (!aliasesResponse.ok) throw new Error(`card_aliases.json: HTTP ${aliasesResponse.status}`);
+      cardAliases = await aliasesResponse.json();
+    } catch (error) {
+      // Fall back to scanning the cards by name
+      console.warn('Card aliases not found:', error);
+    }
 
     const authorsResponse = await fetch(chrome.runtime.getURL('authors.json'));
     authorsData = await authorsResponse.json();
@@ -27,6 +48,11 @@ async function loadCardsData() {
   }
 }
 
+// Same normalization as scripts/card_aliases.py
+function normalizeCardName(name) {
+  return name.normalize('NFKC').toLowerCase().replace(/\s+/g, '');
+}
+
 // Find card by numbering (no field) first, then by cnName, then by enName
 function findCard(cardContainer) {
   if (!cardsData) return null;
@@ -35,18 +61,27 @@ function findCard(cardContainer) {
   const numberingElement = cardContainer.querySelector('.card-numbering');
   if (numberingElement) {
     const numbering = numberingElement.textContent.trim();
-    const card = cardsData.find(c => c.no === numbering);
+    const card = cardsByNo.get(numbering);
     if (card) return card;
   }
 
-  // If no match by numbering, try to match by cnName
+  // If no match by numbering, try to match by name
   const titleElement = cardContainer.querySelector('.card-title');
   if (!titleElement) return null;
 
   const cardName = titleElement.textContent.trim();
 
+  // One lookup in the alias table (BGA names, cnName, enName, jpName)
+  let card;
+  if (cardAliases) {
+    const no = cardAliases[normalizeCardName(cardName)];
+    card = no && cardsByNo.get(no);
+    if (card) return card;
+  }
+
+  // Names missing from the alias table: scan the cards
   // Exact match first with cnName
-  let card = cardsData.find(c => c.cnName === cardName);
+  card = cardsData.find(c => c.cnName === cardName);
   if (card) return card;
 
   // Try removing common whitespace/formatting differences for cnName
@@ -2,7 +2,7 @@ import cssText from "data-text:~style.css"
 import type { PlasmoCSConfig } from "plasmo"
 
 import type { ICard, IAuthors, TTierType } from "~types/card"
-import { findCard, getStatsData, getPrimaryTierColor, getAdpColor, getTierColor } from "~lib/cardUtils"
+import { fetchCards, findCard, getStatsData, getPrimaryTierColor, getAdpColor, getTierColor } from "~lib/cardUtils"
 
 export const config: PlasmoCSConfig = {
   matches: [
@@ -28,9 +28,7 @@ async function loadData() {
   if (isDataLoaded) return
 
   try {
-    const cardsUrl = chrome.runtime.getURL("cards.json")
-    const cardsResponse = await fetch(cardsUrl)
-    cardsData = await cardsResponse.json()
+    cardsData = await fetchCards()
     console.log("[Agricola Tutor] Cards data loaded:", cardsData.length, "cards")
 
     try {
@@ -176,7 +174,7 @@ function injectStyles() {
 }
 
 // Create tier badge element
-function createTierBadge(tier: string, desc: string | undefined, tierType: TTierType): HTMLElement | null {
+function createTierBadge(tier: string | undefined, desc: string | undefined, tierType: TTierType): HTMLElement | null {
   if (!tier || tier.trim() === "") return null
 
   const color = getTierColor(tier, tierType)
@@ -1,5 +1,6 @@
 import { useState, useEffect } from "react"
 import type { ICard, IAuthors } from "~types/card"
+import { fetchCards } from "~lib/cardUtils"
 
 export function useCardsData() {
   const [cardsData, setCardsData] = useState<ICard[]>([])
@@ -13,10 +14,8 @@ export function useCardsData() {
         setIsLoading(true)
         setError(null)
 
-        // Load cards.json from extension
-        const cardsUrl = chrome.runtime.getURL("cards.json")
-        const cardsResponse = await fetch(cardsUrl)
-        const cards = await cardsResponse.json()
+        // Load the card bundle of the UI locale from extension
+        const cards = await fetchCards()
         setCardsData(cards)
         console.log("Cards data loaded:", cards.length, "cards")
 
@@ -1,3 +1,4 @@
+import { getUILanguage } from "~lib/i18n"
 import type { ICard, IStats, TTierType } from "~types/card"
 
 // Get tier color based on tier level and type
@@ -155,3 +156,18 @@ export const STATS_LABELS = {
   apr: "APR",
   drawPlayRate: "Draw Play Rate"
 }
+
+// Load the card bundle of the UI locale (only the fields this extension shows,
+// see scripts/card_bundles.py), falling back to the full cards.json
+export async function fetchCards(): Promise<ICard[]> {
+  const locale = getUILanguage().startsWith("zh") ? "zh" : "en"
+  try {
+    const bundleResponse = await fetch(chrome.runtime.getURL(`cards.${locale}.json`))
+    if (!bundleResponse.ok) throw new Error(`cards.${locale}.json: HTTP ${bundleResponse.status}`)
+    return await bundleResponse.json()
+  } catch {
+    const cardsResponse = await fetch(chrome.runtime.getURL("cards.json"))
+    if (!cardsResponse.ok) throw new Error(`cards.json: HTTP ${cardsResponse.status}`)
+    return await cardsResponse.json()
+  }
+}
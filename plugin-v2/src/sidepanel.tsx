@@ -2,7 +2,7 @@ import "./style.css"
 import { useState, useCallback, useMemo, useEffect, useRef } from "react"
 
 import type { ICard, IAuthors } from "~types/card"
-import { searchCards, getStatsData, getTierColor, getAdpColor, getDrawPlayRateColor } from "~lib/cardUtils"
+import { fetchCards, searchCards, getStatsData, getTierColor, getAdpColor, getDrawPlayRateColor } from "~lib/cardUtils"
 import { t, getUILanguage } from "~lib/i18n"
 import { JpWikiScoreBadge } from "~components/JpWikiScoreBadge"
 
@@ -232,9 +232,7 @@ function SidePanel() {
       try {
         setIsLoading(true)
 
-        const cardsUrl = chrome.runtime.getURL("cards.json")
-        const cardsResponse = await fetch(cardsUrl)
-        const cards = await cardsResponse.json()
+        const cards = await fetchCards()
         setCardsData(cards)
 
         try {
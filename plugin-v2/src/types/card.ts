@@ -1,14 +1,15 @@
 export interface ICard {
   no: string;
-  cnName: string;
-  enName: string;
+  // Empty fields are left out of the card bundles (scripts/card_bundles.py)
+  cnName?: string;
+  enName?: string;
   desc?: string;
-  baituTier: string;
-  enTier: string;
-  chenTier: string;
-  baituDesc: string;
-  enDesc: string;
-  chenDesc: string;
+  baituTier?: string;
+  enTier?: string;
+  chenTier?: string;
+  baituDesc?: string;
+  enDesc?: string;
+  chenDesc?: string;
   enDesc_trans2zh?: string;
   jpwiki_score?: string;
   comment_jpwiki_cn?: string;
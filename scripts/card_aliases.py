@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Alias table from every known card name to its no
+
+Collects the BGA display names of bga卡牌名.xlsx and the cnName, enName and
+jpName of each card, normalizes them (NFKC, lowercase, no whitespace; the
+content scripts apply the same normalization with
+name.normalize('NFKC').toLowerCase().replace(/\\s+/g, '')) and maps each
+normalized name to one no, so a card title on the game page resolves with
+a single lookup.
+
+When two cards share a name the first one wins, in this order: BGA names,
+cnName, enName, jpName, each in cards.json order. That matches the order in
+which the content scripts used to scan the cards.
+
+Usage:
+    python card_aliases.py "Lover" ["石材保管人" ...]
+"""
+
+import argparse
+import json
+import os
+import re
+import unicodedata
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+BGA_NAMES_FILE = 'bga卡牌名.xlsx'
+OUTPUT_FILE = 'card_aliases.json'
+
+NAME_FIELDS = ['cnName', 'enName', 'jpName']
+
+NO_PATTERN = re.compile(r'^[A-Z]\d{3}$')
+
+
+def normalize_name(name):
+    return re.sub(r'\s+', '', unicodedata.normalize('NFKC', str(name)).lower())
+
+
+def parse_bga_names(excel_path):
+    """Read (name, no) pairs from the BGA name sheet
+    The sheet lays out name / no column pairs side by side, so every cell
+    holding a card no is paired with the name in the cell to its left.
+    """
+    # pandas is only needed for this sheet
+    import pandas as pd
+
+    pairs = []
+    df = pd.read_excel(excel_path, header=None, dtype=str)
+    for row in df.itertuples(index=False):
+        cells = [str(cell).strip() if pd.notna(cell) else '' for cell in row]
+        for col in range(1, len(cells)):
+            if NO_PATTERN.match(cells[col]) and cells[col - 1]:
+                pairs.append((cells[col - 1], cells[col]))
+    return pairs
+
+
+def build_aliases(cards, bga_names=()):
+    """Return ({normalized name: no}, number of names claimed by more than one no)
+    Only nos present in cards are used, since clients resolve against them.
+    """
+    known = {card.get('no', '') for card in cards}
+    aliases = {}
+    conflicts = set()
+
+    def add(name, no):
+        alias = normalize_name(name)
+        if not alias or no not in known:
+            return
+        if alias in aliases and aliases[alias] != no:
+            conflicts.add(alias)
+        aliases.setdefault(alias, no)
+
+    for name, no in bga_names:
+        add(name, no)
+    for field in NAME_FIELDS:
+        for card in cards:
+            if card.get(field):
+                add(card[field], card['no'])
+    for card in cards:
+        add(card['no'], card['no'])
+
+    return aliases, len(conflicts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resolve card names through the alias table')
+    parser.add_argument('names', nargs='+')
+    parser.add_argument('--aliases', default=os.path.join(SCRIPT_DIR, OUTPUT_FILE))
+    args = parser.parse_args()
+
+    with open(args.aliases, 'r', encoding='utf-8') as f:
+        aliases = json.load(f)
+
+    for name in args.names:
+        print(f"{name}\t{aliases.get(normalize_name(name), '-')}")
+
+
+if __name__ == '__main__':
+    main()
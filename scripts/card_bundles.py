@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-target, per-locale projections of card_all.json
+
+card_all.json carries every field of every client. Each client only
+renders part of it (see TARGETS, taken from the components of each
+client), and a UI locale only shows part of that: enDesc_trans2zh is only
+displayed in the zh UI. So for every target and locale a bundle keeps only
+the rendered fields, drops empty strings (every client checks them for
+truthiness) and is written compactly as cards.<locale>.json.
+
+card_bundles.json maps each target to its bundle per locale, with the
+fields and size of each bundle:
+    {"plugin-v2": {"dir": "plugin-v2/assets", "bundles": {"zh": {"file": "cards.zh.json", ...}}}}
+
+Clients load the bundle of their UI locale and fall back to cards.json,
+which is card_all.json with only the STATS_FIELDS of each stats snapshot.
+The other stats fields (the raw counts, the confidence intervals and
+lowSample) are written separately to card_stats.json, which stays with
+the build outputs until a client renders them:
+    {"A001": {"default": {"drafted": 779, "winRatePlayLow": 0.36, ...}}}
+
+Usage:
+    python card_bundles.py [--cards card_all.json]
+"""
+
+import argparse
+import json
+import os
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+BUNDLE_DIR = 'bundles'
+MANIFEST_FILE = 'card_bundles.json'
+# Under BUNDLE_DIR; only FALLBACK_FILE is synced to the targets (sync_artifacts.py)
+FALLBACK_FILE = 'cards.json'
+STATS_DETAIL_FILE = 'card_stats.json'
+
+LOCALES = ['zh', 'en']
+
+# Card fields every client renders (name, tier badges with their comments, stats)
+COMMON_FIELDS = [
+    'no', 'cnName', 'enName', 'baituTier', 'enTier', 'chenTier', 'baituDesc', 'enDesc', 'chenDesc', 'stats'
+]
+# Stats shown by the stats badges and tooltips
+STATS_FIELDS = ['pwr', 'adp', 'apr', 'drawPlayRate']
+
+# Fields only shown in some UI locales
+LOCALE_FIELDS = {
+    'enDesc_trans2zh': ['zh']
+}
+
+TARGETS = {
+    'plugin-v1': {
+        'dir': 'plugin-v1',
+        # The content script has a Chinese UI only
+        'locales': ['zh'],
+        'fields': COMMON_FIELDS
+    },
+    'plugin-v2': {
+        'dir': os.path.join('plugin-v2', 'assets'),
+        'locales': LOCALES,
+        'fields': COMMON_FIELDS + ['desc', 'jpwiki_score', 'comment_jpwiki_cn', 'enDesc_trans2zh']
+    },
+    'web': {
+        'dir': os.path.join('web', 'public'),
+        'locales': LOCALES,
+        'fields': COMMON_FIELDS + ['desc', 'jpwiki_score', 'enDesc_trans2zh']
+    }
+}
+
+
+def bundle_file(locale):
+    return f"cards.{locale}.json"
+
+
+def bundle_fields(target, locale):
+    """Fields of a target's bundle in one locale"""
+    return [field for field in TARGETS[target]['fields']
+            if locale in LOCALE_FIELDS.get(field, [locale])]
+
+
+def project_stats(stats, keep=True):
+    """Keep (or with keep=False, drop) the STATS_FIELDS of every snapshot"""
+    projected = {
+        stream: {key: value for key, value in values.items() if (key in STATS_FIELDS) == keep}
+        for stream, values in stats.items()
+    }
+    return {stream: values for stream, values in projected.items() if values}
+
+
+def project_card(card, fields):
+    projected = {}
+    for field in fields:
+        value = card.get(field)
+        if field == 'stats' and value:
+            value = project_stats(value)
+        if value in (None, '', {}):
+            continue
+        projected[field] = value
+    return projected
+
+
+def project_cards(cards, target, locale):
+    fields = bundle_fields(target, locale)
+    return [project_card(card, fields) for card in cards]
+
+
+def fallback_cards(cards):
+    """cards.json: every field of card_all.json, with only the STATS_FIELDS stats"""
+    return [dict(card, stats=project_stats(card['stats'])) if card.get('stats') else card for card in cards]
+
+
+def stats_detail(cards):
+    """card_stats.json: {no: {snapshot: stats fields other than STATS_FIELDS}}"""
+    detail = {}
+    for card in cards:
+        stats = project_stats(card.get('stats') or {}, keep=False)
+        if stats:
+            detail[card['no']] = stats
+    return detail
+
+
+def dump_bundle(cards):
+    return json.dumps(cards, ensure_ascii=False, separators=(',', ':'))
+
+
+def build_bundles(cards):
+    """Return ({(target, locale): bundle JSON text}, manifest)"""
+    bundles = {}
+    manifest = {}
+    for target, spec in TARGETS.items():
+        entry = {'dir': spec['dir'].replace(os.sep, '/'), 'bundles': {}}
+        for locale in spec['locales']:
+            content = dump_bundle(project_cards(cards, target, locale))
+            bundles[(target, locale)] = content
+            entry['bundles'][locale] = {
+                'file': bundle_file(locale),
+                'fields': bundle_fields(target, locale),
+                'bytes': len(content.encode('utf-8'))
+            }
+        manifest[target] = entry
+    return bundles, manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write the per-target, per-locale card bundles')
+    parser.add_argument('--cards', default=os.path.join(SCRIPT_DIR, 'card_all.json'))
+    parser.add_argument('--output', default=os.path.join(SCRIPT_DIR, BUNDLE_DIR), help='Bundle directory')
+    args = parser.parse_args()
+
+    with open(args.cards, 'r', encoding='utf-8') as f:
+        cards = json.load(f)
+    full_size = len(dump_bundle(cards).encode('utf-8'))
+
+    bundles, manifest = build_bundles(cards)
+    for (target, locale), content in bundles.items():
+        filepath = os.path.join(args.output, target, bundle_file(locale))
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+    with open(os.path.join(args.output, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(args.output, FALLBACK_FILE), 'w', encoding='utf-8') as f:
+        json.dump(fallback_cards(cards), f, ensure_ascii=False, indent=2)
+    with open(os.path.join(args.output, STATS_DETAIL_FILE), 'w', encoding='utf-8') as f:
+        f.write(dump_bundle(stats_detail(cards)))
+
+    for target, entry in manifest.items():
+        for locale, bundle in entry['bundles'].items():
+            print(f"{target}\t{locale}\t{bundle['bytes']} bytes ({bundle['bytes'] / full_size:.0%} of the full cards)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Indexed, cached access to the built cards (card_all.json)
+
+The file is read once, on the first lookup. Only a small summary of each
+card (no, names, tiers, stats) is kept as Python objects, for the indexes;
+the full card is kept as its compact UTF-8 JSON and decoded on demand
+through an LRU cache. Returned cards are shared with the cache, so treat
+them as read-only.
+
+    import card_library
+    card_library.get('C174')
+    card_library.batch_get(['A001', 'B003'])
+    card_library.by_name('石材保管人')          # any language, NFKC/case/space-insensitive
+    card_library.filter(deck='A', tier_source='baitu', tier='T1', min_pwr=1.5, sort='pwr', order='desc')
+
+The module functions use card_all.json next to this file; create a
+CardLibrary for another file.
+
+Usage:
+    python card_library.py get C174 A001
+    python card_library.py name Lover
+    python card_library.py filter --deck A --min-pwr 1.5 --sort pwr --order desc --limit 10
+"""
+
+import argparse
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+from card_aliases import normalize_name
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CARDS_FILE = os.path.join(SCRIPT_DIR, 'card_all.json')
+
+TIER_SOURCES = {
+    'baitu': 'baituTier',
+    'en': 'enTier',
+    'chen': 'chenTier'
+}
+
+STAT_METRICS = ['pwr', 'adp', 'apr', 'drawPlayRate']
+SNAPSHOTS = ['default', 'nb']
+
+NAME_FIELDS = ['cnName', 'enName', 'jpName']
+
+# Decoded cards kept by the LRU cache
+CACHE_SIZE = 1024
+
+
+def get_deck(no):
+    """Return the deck prefix of a card no (e.g. 'A' for 'A001')"""
+    return no.rstrip('0123456789')
+
+
+class CardStore:
+    """Immutable set of cards plus the indexes used to answer queries"""
+
+    def __init__(self, cards):
+        self.cards = cards
+        self.by_no = {}
+        self.by_deck = {}
+        self.by_tier = {}
+        # (snapshot, metric) -> (sorted values, card indexes in the same order)
+        self.stat_index = {}
+        # (snapshot, metric) -> {card index: position in sorted order}
+        self.stat_rank = {}
+        # (snapshot, metric) -> indexes of the cards without that metric
+        self.stat_missing = {}
+        # sorted (normalized name, card index) pairs over every name variant
+        self.names = []
+
+        for idx, card in enumerate(cards):
+            no = card.get('no', '')
+            self.by_no[no] = idx
+            self.by_deck.setdefault(get_deck(no), []).append(idx)
+
+            for source, field in TIER_SOURCES.items():
+                tier = card.get(field, '').strip()
+                if tier:
+                    self.by_tier.setdefault((source, tier), []).append(idx)
+
+            for field in NAME_FIELDS:
+                name = normalize_name(card.get(field, ''))
+                if name:
+                    self.names.append((name, idx))
+
+        self.names.sort()
+        self.name_keys = [name for name, _ in self.names]
+
+        for snapshot in SNAPSHOTS:
+            for metric in STAT_METRICS:
+                pairs = []
+                for idx, card in enumerate(cards):
+                    value = card.get('stats', {}).get(snapshot, {}).get(metric)
+                    if value is not None:
+                        pairs.append((value, idx))
+                pairs.sort()
+                values = [value for value, _ in pairs]
+                order = [idx for _, idx in pairs]
+                self.stat_index[(snapshot, metric)] = (values, order)
+                self.stat_rank[(snapshot, metric)] = {idx: pos for pos, idx in enumerate(order)}
+                self.stat_missing[(snapshot, metric)] = [idx for idx in range(len(cards))
+                                                         if idx not in self.stat_rank[(snapshot, metric)]]
+
+    @classmethod
+    def load(cls, filepath):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def get(self, no):
+        idx = self.by_no.get(no)
+        return self.cards[idx] if idx is not None else None
+
+    def name_prefix(self, prefix):
+        """Return the set of card indexes with any name starting with prefix"""
+        prefix = normalize_name(prefix)
+        start = bisect_left(self.name_keys, prefix)
+        end = bisect_left(self.name_keys, prefix + '\uffff')
+        return {idx for _, idx in self.names[start:end]}
+
+    def stat_range(self, snapshot, metric, low=None, high=None):
+        """Return the set of card indexes whose metric is within [low, high]"""
+        values, order = self.stat_index[(snapshot, metric)]
+        start = bisect_left(values, low) if low is not None else 0
+        end = bisect_right(values, high) if high is not None else len(values)
+        return set(order[start:end])
+
+    def select(self, deck=None, tier_source=None, tier=None, snapshot='default',
+               ranges=None, prefix=None, sort='no', order='asc'):
+        """Return the indexes of the matching cards, sorted
+
+        ranges maps a metric name to a (low, high) tuple, either end may be None.
+        Sorting by a metric puts the cards without it last, in no order.
+        """
+        candidates = []
+
+        if deck:
+            candidates.append(set(self.by_deck.get(deck, [])))
+
+        if tier_source:
+            if tier_source not in TIER_SOURCES:
+                raise ValueError(f"Unknown tier_source: {tier_source}")
+            if tier:
+                candidates.append(set(self.by_tier.get((tier_source, tier), [])))
+            else:
+                candidates.append({idx for (source, _), idxs in self.by_tier.items()
+                                   if source == tier_source for idx in idxs})
+
+        for metric, (low, high) in (ranges or {}).items():
+            candidates.append(self.stat_range(snapshot, metric, low, high))
+
+        if prefix:
+            candidates.append(self.name_prefix(prefix))
+
+        descending = order == 'desc'
+
+        if sort == 'no':
+            if candidates:
+                selected = sorted(set.intersection(*sorted(candidates, key=len)))
+            else:
+                selected = list(range(len(self.cards)))
+            if descending:
+                selected.reverse()
+        elif sort in STAT_METRICS:
+            _, presorted = self.stat_index[(snapshot, sort)]
+            missing = self.stat_missing[(snapshot, sort)]
+            if candidates:
+                rank = self.stat_rank[(snapshot, sort)]
+                matched = set.intersection(*sorted(candidates, key=len))
+                selected = sorted((idx for idx in matched if idx in rank), key=rank.__getitem__, reverse=descending)
+                selected += sorted(idx for idx in matched if idx not in rank)
+            else:
+                selected = (presorted[::-1] if descending else presorted) + missing
+        else:
+            raise ValueError(f"Unknown sort key: {sort}")
+
+        return selected
+
+    def query(self, page=1, page_size=50, **criteria):
+        """Filter, sort and page cards (criteria as in select)
+        Returns (total, list of cards on the requested page).
+        """
+        selected = self.select(**criteria)
+        start = (page - 1) * page_size
+        return len(selected), [self.cards[idx] for idx in selected[start:start + page_size]]
+
+
+def summarize(card):
+    """The fields the indexes need: no, names, tiers and the stat metrics"""
+    summary = {field: card.get(field, '') for field in ['no'] + NAME_FIELDS + list(TIER_SOURCES.values())}
+    stats = {}
+    for snapshot, values in (card.get('stats') or {}).items():
+        metrics = {metric: values[metric] for metric in STAT_METRICS if values.get(metric) is not None}
+        if metrics:
+            stats[snapshot] = metrics
+    if stats:
+        summary['stats'] = stats
+    return summary
+
+
+class CardLibrary:
+    """Lazily loaded card_all.json with indexed lookups"""
+
+    def __init__(self, filepath=CARDS_FILE, cache_size=CACHE_SIZE):
+        self.filepath = filepath
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        # (CardStore, {normalized name: card indexes}, decode function),
+        # replaced as a whole so a lookup never sees a half-reset library
+        self._snapshot = None
+
+    def _load(self):
+        """Return the current snapshot, reading the file on first use"""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                cards = json.load(f)
+
+            records = [json.dumps(card, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                       for card in cards]
+            names = {}
+            for idx, card in enumerate(cards):
+                for field in NAME_FIELDS:
+                    if card.get(field):
+                        ids = names.setdefault(normalize_name(card[field]), [])
+                        if idx not in ids:
+                            ids.append(idx)
+
+            @lru_cache(maxsize=self.cache_size)
+            def decode(idx):
+                return json.loads(records[idx])
+
+            self._snapshot = (CardStore([summarize(card) for card in cards]), names, decode)
+            return self._snapshot
+
+    @property
+    def store(self):
+        return self._load()[0]
+
+    def reload(self):
+        """Drop the loaded cards; the next lookup reads the file again
+        Lookups already running finish on the previous cards.
+        """
+        with self._lock:
+            self._snapshot = None
+
+    def __len__(self):
+        return len(self.store.cards)
+
+    def get(self, no):
+        """Return the card with this no, or None"""
+        store, _, decode = self._load()
+        idx = store.by_no.get(no)
+        return decode(idx) if idx is not None else None
+
+    def batch_get(self, nos):
+        """Return the cards of several nos, in the same order (None where unknown)"""
+        store, _, decode = self._load()
+        return [decode(store.by_no[no]) if no in store.by_no else None for no in nos]
+
+    def by_name(self, name):
+        """Return the cards having this cnName, enName or jpName, ignoring case,
+        width and whitespace differences
+        """
+        _, names, decode = self._load()
+        return [decode(idx) for idx in names.get(normalize_name(name), [])]
+
+    def filter(self, deck=None, tier_source=None, tier=None, snapshot='default', prefix=None,
+               sort='no', order='asc', limit=None, **bounds):
+        """Return the matching cards
+
+        bounds are min_<metric> / max_<metric> over STAT_METRICS of the stats
+        snapshot (e.g. min_pwr=1.5, max_adp=3); cards without that metric
+        never match, and sort by a metric lists them last. prefix matches the
+        start of any name.
+        """
+        if snapshot not in SNAPSHOTS:
+            raise ValueError(f"Unknown stats snapshot: {snapshot}")
+        ranges = {}
+        for key, value in bounds.items():
+            bound, _, metric = key.partition('_')
+            if bound not in ('min', 'max') or metric not in STAT_METRICS:
+                raise TypeError(f"filter() got an unexpected keyword argument '{key}'")
+            low, high = ranges.get(metric, (None, None))
+            ranges[metric] = (value, high) if bound == 'min' else (low, value)
+
+        store, _, decode = self._load()
+        selected = store.select(deck=deck, tier_source=tier_source, tier=tier, snapshot=snapshot,
+                                ranges=ranges, prefix=prefix, sort=sort, order=order)
+        return [decode(idx) for idx in selected[:limit]]
+
+    def cache_info(self):
+        return self._load()[2].cache_info()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_library():
+    """The CardLibrary over card_all.json used by the module functions"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = CardLibrary()
+        return _default
+
+
+def get(no):
+    return default_library().get(no)
+
+
+def batch_get(nos):
+    return default_library().batch_get(nos)
+
+
+def by_name(name):
+    return default_library().by_name(name)
+
+
+def filter(**criteria):
+    return default_library().filter(**criteria)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Look up cards of card_all.json')
+    parser.add_argument('--cards', default=CARDS_FILE)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('get', help='Cards by no').add_argument('nos', nargs='+')
+    subparsers.add_parser('name', help='Cards by name in any language').add_argument('names', nargs='+')
+
+    filter_parser = subparsers.add_parser('filter', help='Cards matching filters')
+    filter_parser.add_argument('--deck')
+    filter_parser.add_argument('--tier-source', choices=list(TIER_SOURCES))
+    filter_parser.add_argument('--tier')
+    filter_parser.add_argument('--stats', choices=SNAPSHOTS, default='default')
+    filter_parser.add_argument('--prefix')
+    filter_parser.add_argument('--sort', choices=['no'] + STAT_METRICS, default='no')
+    filter_parser.add_argument('--order', choices=['asc', 'desc'], default='asc')
+    filter_parser.add_argument('--limit', type=int)
+    for metric in STAT_METRICS:
+        filter_parser.add_argument(f'--min-{metric}', type=float, dest=f'min_{metric}')
+        filter_parser.add_argument(f'--max-{metric}', type=float, dest=f'max_{metric}')
+
+    args = parser.parse_args()
+    library = CardLibrary(args.cards)
+
+    if args.command == 'get':
+        cards = [card for card in library.batch_get(args.nos) if card]
+    elif args.command == 'name':
+        cards = [card for name in args.names for card in library.by_name(name)]
+    else:
+        bounds = {key: value for key, value in vars(args).items()
+                  if key.startswith(('min_', 'max_')) and value is not None}
+        cards = library.filter(deck=args.deck, tier_source=args.tier_source, tier=args.tier, snapshot=args.stats,
+                               prefix=args.prefix, sort=args.sort, order=args.order, limit=args.limit, **bounds)
+
+    for card in cards:
+        stats = card.get('stats', {}).get(getattr(args, 'stats', 'default'), {})
+        print(f"{card['no']}\t{card.get('cnName', '')}\t{card.get('enName', '')}\t"
+              f"pwr={stats.get('pwr', '-')}\tadp={stats.get('adp', '-')}")
+
+
+if __name__ == '__main__':
+    main()
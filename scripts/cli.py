@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Single entry point for the scripts of this directory
+
+Each subcommand imports its module (and that module's dependencies, e.g.
+numpy for build or pandas for excel-update) only when it runs, so startup
+stays fast for the light commands used from hooks and editor tasks.
+
+Source files are looked up under --input-root and outputs written under
+--output-root; both default to this directory, whatever the working
+directory is.
+
+Usage:
+    python cli.py build [--jobs 4] [--watch] [--strict] ...
+    python cli.py sync
+    python cli.py match
+    python cli.py srt-slice "even more set 次发.srt" [start_line] [chunk_size]
+    python cli.py srt-convert [directory]
+    python cli.py srt-extract ["even more set 职业_1.srt"] [--output segments.json]
+    python cli.py excel-update
+    python cli.py --input-root data/ --output-root out/ build
+"""
+
+import argparse
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def input_file(args, name):
+    """A path as given if it exists, else relative to the input root"""
+    return name if os.path.exists(name) else os.path.join(args.input_root, name)
+
+
+def run_build(args):
+    import generate_index
+    generate_index.run(args)
+
+
+def run_sync(args):
+    import sync_artifacts
+    sync_artifacts.sync_artifacts(args.output_root, args.project_root)
+
+
+def run_match(args):
+    import match_cards
+    match_cards.match_cards(os.path.join(args.input_root, 'set_o.json'),
+                            os.path.join(args.output_root, 'card_all.json'))
+
+
+def run_srt_slice(args):
+    import slice_srt
+    slice_srt.slice_srt(input_file(args, args.srt_file), args.start_line, args.chunk_size)
+
+
+def run_srt_convert(args):
+    import srt_to_txt
+    srt_to_txt.main(args.directory or args.input_root)
+
+
+def run_srt_extract(args):
+    import parse_srt
+    parse_srt.main([input_file(args, args.srt_file),
+                    '--output', os.path.join(args.output_root, args.output)])
+
+
+def run_excel_update(args):
+    import update_cards_from_excel
+    update_cards_from_excel.main(os.path.join(args.input_root, '卡牌.xlsx'),
+                                 os.path.join(args.input_root, 'cards.json'))
+
+
+def build_parser(build_options=None):
+    """The cli.py parser
+    build_options is the parent parser of the build subcommand
+    (generate_index.build_parser); without it build accepts any option, so
+    generate_index is only imported once the command is known to be build.
+    """
+    parser = argparse.ArgumentParser(description='Agricola card data tools')
+    parser.add_argument('--input-root', default=SCRIPT_DIR, help='Directory of the source files (default: scripts/)')
+    parser.add_argument('--output-root', help='Directory of the outputs (default: the input root)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser(
+        'build', help='Run generate_index.py (--jobs, --watch, --strict...; see build --help)',
+        parents=[build_options] if build_options else [], add_help=build_options is not None
+    ).set_defaults(run=run_build)
+
+    sync_parser = subparsers.add_parser('sync', help='Copy the build outputs to plugin-v1, plugin-v2 and web')
+    sync_parser.add_argument('--project-root', default=os.path.dirname(SCRIPT_DIR),
+                             help='Directory holding plugin-v1, plugin-v2 and web')
+    sync_parser.set_defaults(run=run_sync)
+
+    subparsers.add_parser('match', help='Fill the no of set_o.json from card_all.json').set_defaults(run=run_match)
+
+    slice_parser = subparsers.add_parser('srt-slice', help='Print an SRT file chunk by chunk')
+    slice_parser.add_argument('srt_file')
+    slice_parser.add_argument('start_line', nargs='?', type=int, default=1)
+    slice_parser.add_argument('chunk_size', nargs='?', type=int, default=100)
+    slice_parser.set_defaults(run=run_srt_slice)
+
+    convert_parser = subparsers.add_parser('srt-convert', help='Convert every SRT file of a directory to TXT')
+    convert_parser.add_argument('directory', nargs='?', help='Default: the input root')
+    convert_parser.set_defaults(run=run_srt_convert)
+
+    extract_parser = subparsers.add_parser('srt-extract', help='Split an SRT file into card review segments')
+    extract_parser.add_argument('srt_file', nargs='?', default='even more set 职业_1.srt')
+    extract_parser.add_argument('--output', default='segments.json', help='Relative to the output root')
+    extract_parser.set_defaults(run=run_srt_extract)
+
+    subparsers.add_parser(
+        'excel-update', help='Update cards.json names and nos from 卡牌.xlsx'
+    ).set_defaults(run=run_excel_update)
+
+    return parser
+
+
+def main(argv=None):
+    args, _ = build_parser().parse_known_args(argv)
+    if args.command == 'build':
+        import generate_index
+        args = build_parser(generate_index.build_parser(add_help=False, roots=False)).parse_args(argv)
+    else:
+        args = build_parser().parse_args(argv)
+
+    args.input_root = os.path.abspath(args.input_root)
+    args.output_root = os.path.abspath(args.output_root or args.input_root)
+    args.run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Differential check of the generate_index.py outputs between two pipelines
+
+Each side is either a directory holding already-built outputs, or a git
+revision. A revision's scripts/ is exported with git archive to a
+temporary directory, given the current input files (so both sides build
+from the same inputs) and built there with generate_index.py.
+
+The outputs are then diffed structurally, keyed by card no:
+    index.csv, index_missing.csv   row by row, column by column
+    card_all.json                  card by card, nested fields flattened to
+                                   dotted paths (stats.default.pwr, videoClips[0][1])
+Numbers (including numeric CSV cells) are equal within --tolerance, so
+float noise in the stats does not count as a change.
+
+The report lists, per file, the nos only on one side, the number of
+changed cards per field and a few examples of each. The exit status is
+1 when the outputs differ.
+
+Usage:
+    python diff_outputs.py HEAD~1 HEAD
+    python diff_outputs.py baseline_outputs/ . [--ignore statsTrend] [--examples 5] [--report diff.json]
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+OUTPUTS = ['index.csv', 'index_missing.csv', 'card_all.json']
+
+TOLERANCE = 1e-6
+EXAMPLES = 3
+
+
+def read_csv_rows(filepath):
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def read_json_rows(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def keyed_rows(rows):
+    """Return {no: row}; repeated nos get '#2', '#3'... suffixes in file order"""
+    keyed = {}
+    seen = defaultdict(int)
+    for row in rows:
+        no = str(row.get('no', ''))
+        seen[no] += 1
+        keyed[no if seen[no] == 1 else f"{no}#{seen[no]}"] = row
+    return keyed
+
+
+def flatten(value, prefix=''):
+    """Flatten nested dicts and lists to {dotted path: leaf value}"""
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(flatten(item, f"{prefix}.{key}" if prefix else str(key)))
+        return flat
+    if isinstance(value, list):
+        flat = {}
+        for idx, item in enumerate(value):
+            flat.update(flatten(item, f"{prefix}[{idx}]"))
+        # Keep empty containers visible
+        return flat or {prefix: []}
+    return {prefix: value}
+
+
+def as_number(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and value.strip():
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def values_equal(a, b, tolerance=TOLERANCE):
+    if a == b:
+        return True
+    x, y = as_number(a), as_number(b)
+    if x is None or y is None:
+        return False
+    if math.isnan(x) or math.isnan(y):
+        return math.isnan(x) and math.isnan(y)
+    return math.isclose(x, y, rel_tol=tolerance, abs_tol=tolerance)
+
+
+def ignored(path, ignore):
+    return any(path == prefix or path.startswith(prefix + '.') or path.startswith(prefix + '[')
+               for prefix in ignore)
+
+
+def diff_rows(rows_a, rows_b, tolerance=TOLERANCE, ignore=(), examples=EXAMPLES):
+    """Keyed diff of two row lists; returns the report of one file"""
+    keyed_a, keyed_b = keyed_rows(rows_a), keyed_rows(rows_b)
+    changed_fields = defaultdict(list)
+    changed = 0
+
+    for no in sorted(keyed_a.keys() & keyed_b.keys()):
+        flat_a, flat_b = flatten(keyed_a[no]), flatten(keyed_b[no])
+        row_changed = False
+        for path in sorted(flat_a.keys() | flat_b.keys()):
+            if ignored(path, ignore):
+                continue
+            a, b = flat_a.get(path), flat_b.get(path)
+            if not values_equal(a, b, tolerance):
+                row_changed = True
+                changed_fields[path].append((no, a, b))
+        changed += row_changed
+
+    # Count list positions as one field: videoClips[0][1] -> videoClips[],
+    # and a row once however many of its positions changed
+    fields = defaultdict(lambda: {'count': 0, 'examples': []})
+    field_nos = defaultdict(set)
+    for path, entries in changed_fields.items():
+        field = path.split('[', 1)[0] + ('[]' if '[' in path else '')
+        for no, a, b in entries:
+            field_nos[field].add(no)
+            if len(fields[field]['examples']) < examples:
+                fields[field]['examples'].append({'no': no, 'path': path, 'a': a, 'b': b})
+    for field, nos in field_nos.items():
+        fields[field]['count'] = len(nos)
+
+    return {
+        'rows': [len(rows_a), len(rows_b)],
+        'only_a': sorted(keyed_a.keys() - keyed_b.keys()),
+        'only_b': sorted(keyed_b.keys() - keyed_a.keys()),
+        'changed': changed,
+        'fields': dict(sorted(fields.items(), key=lambda item: -item[1]['count']))
+    }
+
+
+def diff_outputs(dir_a, dir_b, tolerance=TOLERANCE, ignore=(), examples=EXAMPLES):
+    """Return {output file: report} for the outputs of two directories"""
+    report = {}
+    for name in OUTPUTS:
+        path_a, path_b = os.path.join(dir_a, name), os.path.join(dir_b, name)
+        missing = [path for path in (path_a, path_b) if not os.path.exists(path)]
+        if missing:
+            report[name] = {'missing': missing}
+            continue
+        read = read_json_rows if name.endswith('.json') else read_csv_rows
+        report[name] = diff_rows(read(path_a), read(path_b), tolerance, ignore, examples)
+    return report
+
+
+def is_revision(spec):
+    result = subprocess.run(['git', 'rev-parse', '--verify', '--quiet', f"{spec}^{{commit}}"],
+                            cwd=SCRIPT_DIR, capture_output=True, text=True)
+    return result.returncode == 0
+
+
+def input_files():
+    """Current input files of the pipeline, relative to the scripts directory"""
+    # Deferred: only needed to build revisions
+    import generate_index
+    return [name for name in generate_index.all_source_files()
+            if os.path.exists(os.path.join(SCRIPT_DIR, name))]
+
+
+def build_revision(revision, workdir, build_args=()):
+    """Export scripts/ at a revision into workdir, copy the current inputs in and build
+    Returns the directory holding the outputs.
+    """
+    archive = subprocess.run(['git', 'archive', '--prefix=scripts/', f"{revision}:scripts"],
+                             cwd=os.path.dirname(SCRIPT_DIR), capture_output=True, check=True)
+    subprocess.run(['tar', '-x', '-C', workdir], input=archive.stdout, check=True)
+    scripts_dir = os.path.join(workdir, 'scripts')
+
+    for name in input_files():
+        shutil.copy2(os.path.join(SCRIPT_DIR, name), os.path.join(scripts_dir, name))
+    # Outputs committed at that revision must not survive a failing build
+    for name in OUTPUTS:
+        if os.path.exists(os.path.join(scripts_dir, name)):
+            os.remove(os.path.join(scripts_dir, name))
+
+    print(f"Building {revision} in {scripts_dir}...")
+    result = subprocess.run([sys.executable, 'generate_index.py', *build_args], cwd=scripts_dir,
+                            capture_output=True, text=True, encoding='utf-8')
+    if result.returncode != 0:
+        print(result.stdout[-2000:])
+        print(result.stderr[-2000:])
+        raise RuntimeError(f"generate_index.py failed at {revision}")
+    return scripts_dir
+
+
+def format_value(value, width=60):
+    text = json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+
+def print_report(report, label_a, label_b):
+    for name, entry in report.items():
+        if 'missing' in entry:
+            print(f"{name}: missing {', '.join(entry['missing'])}")
+            continue
+        rows_a, rows_b = entry['rows']
+        status = 'identical' if not (entry['only_a'] or entry['only_b'] or entry['changed']) else 'DIFFERENT'
+        print(f"{name}: {status} ({rows_a} vs {rows_b} rows, {entry['changed']} changed)")
+        for side, nos in ((label_a, entry['only_a']), (label_b, entry['only_b'])):
+            if nos:
+                shown = ', '.join(nos[:10]) + (f" ... (+{len(nos) - 10})" if len(nos) > 10 else '')
+                print(f"  only in {side}: {len(nos)}: {shown}")
+        for field, info in entry['fields'].items():
+            print(f"  {field}: {info['count']} cards")
+            for example in info['examples']:
+                print(f"    {example['no']} {example['path']}: {format_value(example['a'])} -> {format_value(example['b'])}")
+
+
+def is_identical(report):
+    return all('missing' not in entry and not (entry['only_a'] or entry['only_b'] or entry['changed'])
+               for entry in report.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keyed structural diff of the outputs of two pipelines')
+    parser.add_argument('a', help='Output directory or git revision (built on the current inputs)')
+    parser.add_argument('b', help='Output directory or git revision (built on the current inputs)')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help='Relative and absolute tolerance of numbers')
+    parser.add_argument('--ignore', action='append', default=[], help='Field (prefix) to skip, e.g. statsTrend')
+    parser.add_argument('--examples', type=int, default=EXAMPLES, help='Examples shown per changed field')
+    parser.add_argument('--build-args', default='', help='Arguments of generate_index.py for revisions')
+    parser.add_argument('--keep', action='store_true', help='Keep the build directories of revisions')
+    parser.add_argument('--report', help='Also write the report as JSON')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='diff_outputs_')
+    try:
+        dirs = []
+        for idx, spec in enumerate([args.a, args.b]):
+            if os.path.isdir(spec):
+                dirs.append(spec)
+            elif is_revision(spec):
+                side_dir = os.path.join(workdir, 'ab'[idx])
+                os.makedirs(side_dir)
+                dirs.append(build_revision(spec, side_dir, args.build_args.split()))
+            else:
+                parser.error(f"{spec} is neither a directory nor a git revision")
+
+        report = diff_outputs(dirs[0], dirs[1], args.tolerance, args.ignore, args.examples)
+    finally:
+        if args.keep:
+            print(f"Build directories kept in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(report, args.a, args.b)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    sys.exit(0 if is_identical(report) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Monte Carlo draft simulator: how likely a card is to still be in its pack
+at each pick, from the ADP of the stats snapshots
+
+A draft deals each of the PLAYERS a pack of occupations and a pack of
+minor improvements, drawn from the cards of the format (the cards with
+stats in the snapshot). Every pick, each player takes one card of the
+pack in hand and passes the rest on; after the kept picks the leftovers
+are discarded. The pick and dealt counts of a format are read off its
+stats: the mean ADP of 1..picks is (picks + 1) / 2 and every kept card was
+dealt, so picks = 2 * mean ADP - 1 and dealt = picks * deals / drafted.
+
+Picks follow a Plackett-Luce model: a player takes card i of the pack
+with probability proportional to exp(u_i). Nothing else of the draft
+changes a pick, so the order in which a pack is emptied is one
+Plackett-Luce ranking of its cards, sampled at once by sorting u plus
+Gumbel noise. The utilities u start at -ADP and are adjusted until the
+simulated mean pick of every card matches its ADP. Whole batches of drafts
+are then dealt and ranked as NumPy arrays.
+
+The simulation takes a few seconds, so the document records a digest of
+its inputs (the ADP and deal counts, the card types, the settings and this
+module's source); build_wheel_probabilities callers can reuse a document
+whose digest still matches.
+
+wheel_probabilities.json, per snapshot and card no:
+    available   chance the card is still in its pack at pick 1..picks,
+                for a pack it was dealt in
+    wheel       chance a card passed at pick 1..picks - PLAYERS comes back
+                PLAYERS picks later (the pack went round the table)
+
+Usage:
+    python draft_simulator.py [--drafts 20000] [--seed 0] [--cards card_all.json] [--pk pk.json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+OUTPUT_FILE = 'wheel_probabilities.json'
+
+# The stats TSVs are 4-player games
+PLAYERS = 4
+SNAPSHOTS = ['default', 'nb']
+
+# Card types drafted as separate packs (Database 'Type' prefixes)
+PACK_TYPES = {
+    'occupation': ('Occupation',),
+    'minor': ('Minor Improvement', 'Minor/Major Improvement')
+}
+
+DRAFTS = 20000
+BATCH_SIZE = 5000
+SEED = 0
+
+# Calibration of the utilities against ADP
+FIT_DRAFTS = 4000
+FIT_ITERATIONS = 30
+FIT_STEP = 0.8
+
+
+def pack_type(card_type):
+    for name, prefixes in PACK_TYPES.items():
+        if card_type.startswith(prefixes):
+            return name
+    return None
+
+
+def draft_format(cards, snapshot):
+    """Return (picks, dealt) of a snapshot from the ADP and the deal/draft counts of its cards"""
+    drafted = deals = adp_sum = 0
+    for card in cards:
+        stats = card.get('stats', {}).get(snapshot) or {}
+        if stats.get('adp') is not None and stats.get('drafted'):
+            drafted += stats['drafted']
+            deals += stats.get('deals') or 0
+            adp_sum += stats['adp'] * stats['drafted']
+    if not drafted:
+        return None
+    picks = round(2 * adp_sum / drafted - 1)
+    return picks, max(round(picks * deals / drafted), picks)
+
+
+def format_pools(cards, pk_data, snapshot):
+    """Return {pack type: (nos, ADPs)} of the cards with an ADP in a snapshot"""
+    type_map = {item['no']: item.get('type', '') for item in pk_data}
+    pools = {name: ([], []) for name in PACK_TYPES}
+    for card in cards:
+        adp = (card.get('stats', {}).get(snapshot) or {}).get('adp')
+        name = pack_type(type_map.get(card['no'], ''))
+        if adp is None or name is None:
+            continue
+        pools[name][0].append(card['no'])
+        pools[name][1].append(adp)
+    return {name: (nos, np.array(adps, dtype=float)) for name, (nos, adps) in pools.items() if nos}
+
+
+def deal(rng, drafts, pool_size, players, dealt):
+    """Deal packs without replacement: (drafts, players, dealt) card indexes of the pool"""
+    keys = rng.random((drafts, pool_size))
+    hands = np.argpartition(keys, players * dealt - 1, axis=1)[:, :players * dealt]
+    return hands.reshape(drafts, players, dealt)
+
+
+def pick_positions(rng, utilities, hands):
+    """Pick (1-based) at which each dealt card leaves its pack, same shape as hands"""
+    noisy = utilities[hands] + rng.gumbel(size=hands.shape)
+    order = np.argsort(-noisy, axis=-1)
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(1, hands.shape[-1] + 1), axis=-1)
+    return positions
+
+
+def simulate(rng, utilities, players, dealt, picks, drafts, batch_size=BATCH_SIZE):
+    """Run drafts in batches
+    Returns (deals per card, kept per card, sum of kept picks per card,
+    (cards, picks + 1) counts of the pick each dealt card left at, picks + 1
+    meaning discarded).
+    """
+    size = len(utilities)
+    left_at = np.zeros((size, picks + 1), dtype=np.int64)
+    for start in range(0, drafts, batch_size):
+        count = min(batch_size, drafts - start)
+        hands = deal(rng, count, size, players, dealt)
+        positions = np.minimum(pick_positions(rng, utilities, hands), picks + 1)
+        left_at += np.bincount((hands * (picks + 1) + positions - 1).ravel(),
+                               minlength=size * (picks + 1)).reshape(size, picks + 1)
+
+    deals = left_at.sum(axis=1)
+    kept = left_at[:, :picks].sum(axis=1)
+    pick_sum = left_at[:, :picks] @ np.arange(1, picks + 1)
+    return deals, kept, pick_sum, left_at
+
+
+def fit_utilities(adps, players, dealt, picks, seed=SEED, drafts=FIT_DRAFTS,
+                  iterations=FIT_ITERATIONS, step=FIT_STEP):
+    """Utilities whose simulated mean pick matches the ADP of each card
+    Every iteration replays the same drafts (common random numbers), so the
+    update only follows the utilities.
+    """
+    utilities = -adps.copy()
+    for _ in range(iterations):
+        _, kept, pick_sum, _ = simulate(np.random.default_rng(seed), utilities, players, dealt, picks, drafts)
+        simulated = np.where(kept > 0, pick_sum / np.maximum(kept, 1), picks)
+        utilities += step * (simulated - adps)
+        utilities -= utilities.mean()
+    error = np.abs(simulated - adps).mean()
+    return utilities, error
+
+
+def availability(left_at, picks, players):
+    """Return (available, wheel) per card from the counts of simulate"""
+    deals = np.maximum(left_at.sum(axis=1, keepdims=True), 1)
+    # Still in the pack at pick n: not taken at picks 1..n-1
+    taken_before = np.cumsum(left_at[:, :picks], axis=1) - left_at[:, :picks]
+    available = 1 - taken_before / deals
+    # Passed at pick n (still there at n + 1) and back at n + players
+    survived = available[:, 1:max(picks - players, 0) + 1]
+    back = available[:, players:]
+    wheel = np.divide(back, survived, out=np.zeros_like(back), where=survived > 0)
+    return available, wheel
+
+
+def inputs_digest(cards, pk_data, drafts=DRAFTS, seed=SEED, players=PLAYERS, snapshots=SNAPSHOTS):
+    """Digest of everything build_wheel_probabilities reads"""
+    stats = [[card['no']] + [[(card.get('stats', {}).get(snapshot) or {}).get(field)
+                              for field in ('adp', 'deals', 'drafted')] for snapshot in snapshots]
+             for card in cards]
+    types = [[item['no'], item.get('type', '')] for item in pk_data]
+    with open(os.path.abspath(__file__), 'rb') as f:
+        source = hashlib.sha256(f.read()).hexdigest()
+    payload = json.dumps([stats, types, drafts, seed, players, snapshots, source], separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def build_wheel_probabilities(cards, pk_data, drafts=DRAFTS, seed=SEED, players=PLAYERS, snapshots=SNAPSHOTS):
+    """Return the wheel_probabilities.json document"""
+    result = {'players': players, 'inputs': inputs_digest(cards, pk_data, drafts, seed, players, snapshots),
+              'formats': {}, 'cards': {}}
+    for snapshot in snapshots:
+        shape = draft_format(cards, snapshot)
+        if not shape:
+            continue
+        picks, dealt = shape
+        result['formats'][snapshot] = {'picks': picks, 'dealt': dealt, 'drafts': drafts, 'adpError': {}}
+        result['cards'][snapshot] = {}
+
+        for name, (nos, adps) in format_pools(cards, pk_data, snapshot).items():
+            if len(nos) < players * dealt:
+                print(f"Warning: {len(nos)} {name} cards in {snapshot} stats, too few for {players} packs of {dealt}")
+                continue
+            utilities, error = fit_utilities(adps, players, dealt, picks, seed)
+            _, _, _, left_at = simulate(np.random.default_rng(seed + 1), utilities, players, dealt, picks, drafts)
+            available, wheel = availability(left_at, picks, players)
+            result['formats'][snapshot]['adpError'][name] = round(float(error), 3)
+            for idx, no in enumerate(nos):
+                result['cards'][snapshot][no] = {
+                    'available': np.round(available[idx], 3).tolist(),
+                    'wheel': np.round(wheel[idx], 3).tolist()
+                }
+        result['cards'][snapshot] = dict(sorted(result['cards'][snapshot].items()))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate drafts and write wheel_probabilities.json')
+    parser.add_argument('--cards', default=os.path.join(SCRIPT_DIR, 'card_all.json'))
+    parser.add_argument('--pk', default=os.path.join(SCRIPT_DIR, 'pk.json'), help='Card types (built pk.json)')
+    parser.add_argument('--output', default=os.path.join(SCRIPT_DIR, OUTPUT_FILE))
+    parser.add_argument('--drafts', type=int, default=DRAFTS)
+    parser.add_argument('--seed', type=int, default=SEED)
+    args = parser.parse_args()
+
+    with open(args.cards, 'r', encoding='utf-8') as f:
+        cards = json.load(f)
+    with open(args.pk, 'r', encoding='utf-8') as f:
+        pk_data = json.load(f)
+
+    start = time.time()
+    result = build_wheel_probabilities(cards, pk_data, args.drafts, args.seed)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(result, ensure_ascii=False, separators=(',', ':')))
+
+    for snapshot, spec in result['formats'].items():
+        print(f"{snapshot}: {spec['drafts']} drafts of {result['players']} packs of {spec['dealt']}, "
+              f"{spec['picks']} picks, {len(result['cards'][snapshot])} cards, "
+              f"mean |ADP error| {spec['adpError']}")
+    print(f"Wrote {args.output} in {time.time() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Aggregate card statistics from an archive of draft/game logs
+
+Streams every *.jsonl / *.jsonl.gz file of a directory (one game per line),
+keeps the games matching the filters and computes, per card, the columns
+of 4p_de.tsv / 4p_nb.tsv so the output can replace them or be loaded with
+generate_index.parse_tsv_stats. Files are aggregated in parallel worker
+processes; each returns a partial aggregate and the partials are summed.
+
+Log schema (one JSON object per line):
+    {
+      "game_id": "123456",
+      "date": "2025-01-31",
+      "players": 4,
+      "seats": [
+        {
+          "rating": 512,               optional, used by the rating filters
+          "rating_delta": 4.5,         optional, Elo change of the game
+          "winner": true,
+          "dealt": ["Lover", ...],     cards of the packs dealt to this seat
+          "drafted": [{"card": "Lover", "pick": 1}, ...],
+          "played": [{"card": "Lover", "round": 3}, ...]
+        }
+      ]
+    }
+
+Columns:
+    Deals     times the card was dealt
+    Drafted   times the card was drafted
+    Plays     times the card was played
+    W-Hand    times the card was drafted by the winner
+    W-Play    times the card was played by the winner
+    ADP       average pick number when drafted
+    APR       average round when played
+    PWR       wins with the card played per deal, on the scale of the
+              spreadsheets: 100 / 7 * W-Play / Deals (4p_de.tsv and
+              4p_nb.tsv follow it to within rounding)
+    Elo/Play  average rating_delta of the player over the plays of the card
+    PWR-Z     W-Play against an average card, as a z-score:
+              (W-Play - E) / sqrt(sum of 1/n * (1 - 1/n) over plays), with
+              E the sum of 1/n over plays and n the players of each game;
+              it grows with sqrt(Plays), so only compare cards of similar
+              play counts
+
+Usage:
+    python game_logs.py game_logs/ --output 4p_logs.tsv [--players 4]
+        [--min-rating 300] [--max-rating 600] [--since 2025-01-01] [--until 2025-06-30] [--jobs 4]
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Per-card counters of a partial aggregate, in this order
+COUNTERS = [
+    'deals', 'drafted', 'pick_sum', 'plays', 'round_sum', 'w_hand', 'w_play',
+    'expected_wins', 'expected_variance', 'elo_sum', 'elo_plays'
+]
+
+(DEALS, DRAFTED, PICK_SUM, PLAYS, ROUND_SUM, W_HAND, W_PLAY,
+ EXPECTED_WINS, EXPECTED_VARIANCE, ELO_SUM, ELO_PLAYS) = range(len(COUNTERS))
+
+TSV_HEADER = ['Rank', 'Card Name', 'PWR', 'ADP', 'APR', 'Deals', 'Drafted', 'Plays', 'W-Hand', 'W-Play', 'Elo/Play',
+              'PWR-Z']
+
+# PWR of the spreadsheets per win-with-play per deal
+PWR_SCALE = 100 / 7
+
+
+def log_files(path):
+    """Return the log files of a directory (or the file itself), sorted"""
+    if os.path.isfile(path):
+        return [path]
+    return sorted(glob.glob(os.path.join(path, '*.jsonl')) + glob.glob(os.path.join(path, '*.jsonl.gz')))
+
+
+def iter_games(filepath):
+    """Stream the games of one log file, skipping invalid lines"""
+    opener = gzip.open if filepath.endswith('.gz') else open
+    with opener(filepath, 'rt', encoding='utf-8') as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                game = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"Warning: Invalid JSON on line {line_num} of {filepath}: {e}")
+                continue
+            if isinstance(game, dict) and game.get('seats'):
+                yield game
+
+
+def game_matches(game, filters):
+    """Check a game against {'players', 'min_rating', 'max_rating', 'since', 'until'}
+    The rating of a game is the mean rating of its seats.
+    """
+    players = game.get('players') or len(game['seats'])
+    if filters.get('players') and players != filters['players']:
+        return False
+
+    date = game.get('date', '')
+    if filters.get('since') and (not date or date < filters['since']):
+        return False
+    if filters.get('until') and (not date or date > filters['until']):
+        return False
+
+    if filters.get('min_rating') is not None or filters.get('max_rating') is not None:
+        ratings = [seat['rating'] for seat in game['seats'] if isinstance(seat.get('rating'), (int, float))]
+        if not ratings:
+            return False
+        rating = sum(ratings) / len(ratings)
+        if filters.get('min_rating') is not None and rating < filters['min_rating']:
+            return False
+        if filters.get('max_rating') is not None and rating > filters['max_rating']:
+            return False
+
+    return True
+
+
+def card_name(entry):
+    """Card name of a drafted/played entry (a dict with 'card', or a bare name)"""
+    return entry.get('card', '') if isinstance(entry, dict) else entry
+
+
+def aggregate_file(filepath, filters):
+    """Aggregate one log file; returns (games, {card name: list of COUNTERS})"""
+    totals = {}
+    games = 0
+
+    def counters(name):
+        if name not in totals:
+            totals[name] = [0] * len(COUNTERS)
+        return totals[name]
+
+    for game in iter_games(filepath):
+        if not game_matches(game, filters):
+            continue
+        games += 1
+        players = game.get('players') or len(game['seats'])
+        baseline = 1 / players
+
+        for seat in game['seats']:
+            winner = bool(seat.get('winner'))
+            delta = seat.get('rating_delta')
+
+            for name in seat.get('dealt', []):
+                counters(card_name(name))[DEALS] += 1
+
+            for entry in seat.get('drafted', []):
+                c = counters(card_name(entry))
+                c[DRAFTED] += 1
+                if isinstance(entry, dict) and isinstance(entry.get('pick'), (int, float)):
+                    c[PICK_SUM] += entry['pick']
+                if winner:
+                    c[W_HAND] += 1
+
+            for entry in seat.get('played', []):
+                c = counters(card_name(entry))
+                c[PLAYS] += 1
+                if isinstance(entry, dict) and isinstance(entry.get('round'), (int, float)):
+                    c[ROUND_SUM] += entry['round']
+                if winner:
+                    c[W_PLAY] += 1
+                c[EXPECTED_WINS] += baseline
+                c[EXPECTED_VARIANCE] += baseline * (1 - baseline)
+                if isinstance(delta, (int, float)):
+                    c[ELO_SUM] += delta
+                    c[ELO_PLAYS] += 1
+
+    totals.pop('', None)
+    return games, totals
+
+
+def merge_partials(partials):
+    """Sum (games, totals) partial aggregates"""
+    games = 0
+    merged = {}
+    for part_games, totals in partials:
+        games += part_games
+        for name, values in totals.items():
+            if name in merged:
+                merged[name] = [a + b for a, b in zip(merged[name], values)]
+            else:
+                merged[name] = list(values)
+    return games, merged
+
+
+def aggregate_logs(path, filters=None, jobs=None):
+    """Aggregate every log file under path; returns (games, {card name: COUNTERS})"""
+    files = log_files(path)
+    filters = filters or {}
+    if jobs == 1 or len(files) <= 1:
+        return merge_partials(aggregate_file(filepath, filters) for filepath in files)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return merge_partials(executor.map(aggregate_file, files, [filters] * len(files)))
+
+
+def stats_rows(totals):
+    """Turn aggregated counters into stats TSV rows (dicts keyed by TSV_HEADER), best PWR first"""
+    rows = []
+    for name, values in totals.items():
+        c = dict(zip(COUNTERS, values))
+        drafted, plays = c['drafted'], c['plays']
+        z = (c['w_play'] - c['expected_wins']) / math.sqrt(c['expected_variance']) if c['expected_variance'] else None
+        rows.append({
+            'Card Name': name,
+            'PWR': PWR_SCALE * c['w_play'] / c['deals'] if c['deals'] else None,
+            'ADP': c['pick_sum'] / drafted if drafted else None,
+            'APR': c['round_sum'] / plays if plays else None,
+            'Deals': c['deals'],
+            'Drafted': drafted,
+            'Plays': plays,
+            'W-Hand': c['w_hand'],
+            'W-Play': c['w_play'],
+            'Elo/Play': c['elo_sum'] / c['elo_plays'] if c['elo_plays'] else None,
+            'PWR-Z': z
+        })
+
+    rows.sort(key=lambda row: (row['PWR'] is None, -(row['PWR'] or 0), row['Card Name']))
+    for rank, row in enumerate(rows, 1):
+        row['Rank'] = rank
+    return rows
+
+
+def write_stats_tsv(rows, filepath):
+    """Write rows in the layout of 4p_de.tsv (right-aligned card names, 2 decimals)"""
+    width = max([len(row['Card Name']) for row in rows] + [len('Card Name')])
+
+    def cell(value):
+        if value is None:
+            return ''
+        return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+    with open(filepath, 'w', encoding='utf-8', newline='') as f:
+        f.write('\t'.join(col.rjust(width) if col == 'Card Name' else col for col in TSV_HEADER) + '\n')
+        for row in rows:
+            f.write('\t'.join(
+                row[col].rjust(width) if col == 'Card Name' else cell(row[col]) for col in TSV_HEADER
+            ) + '\n')
+
+
+def add_filter_arguments(parser):
+    parser.add_argument('--players', type=int, help='Only games with this many players')
+    parser.add_argument('--min-rating', type=float, help='Only games with a mean seat rating at least this')
+    parser.add_argument('--max-rating', type=float, help='Only games with a mean seat rating at most this')
+    parser.add_argument('--since', help='Only games on or after this date (YYYY-MM-DD)')
+    parser.add_argument('--until', help='Only games on or before this date (YYYY-MM-DD)')
+
+
+def filters_from_args(args):
+    return {
+        'players': args.players,
+        'min_rating': args.min_rating,
+        'max_rating': args.max_rating,
+        'since': args.since,
+        'until': args.until
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute card stats TSVs from game logs')
+    parser.add_argument('logs', help='Log directory (or a single .jsonl/.jsonl.gz file)')
+    parser.add_argument('--output', required=True, help='TSV file to write')
+    parser.add_argument('--jobs', type=int, help='Worker processes (default: CPU count, 1 = serial)')
+    add_filter_arguments(parser)
+    args = parser.parse_args()
+
+    games, totals = aggregate_logs(args.logs, filters_from_args(args), args.jobs)
+    rows = stats_rows(totals)
+    write_stats_tsv(rows, args.output)
+    print(f"Aggregated {games} games, {len(rows)} cards -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
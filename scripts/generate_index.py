@@ -2,13 +2,251 @@
 # -*- coding: utf-8 -*-
 """
 Generate index.csv from multiple data sources
+
+Every source is declared in SOURCES below. The pipeline loads all source
+files in parallel worker processes, then applies the joins in dependency
+order (independent joins run concurrently), filters index.csv and writes
+the outputs.
+
+Source files are read relative to the input root and outputs written under
+the output root (both default to this directory; see --input-root and
+--output-root), so the build runs from any working directory.
 """
 
+import argparse
 import csv
+import hashlib
+import io
 import json
 import os
-import shutil
+import pickle
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+import card_aliases
+import card_bundles
+import draft_simulator
+import game_logs
+import similar_cards
+import source_cache
+import stats_history
+import sync_artifacts
+import synergy
+import text_index
+import translation_memory
+import validate_sources
+import video_clips
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Where relative output paths are written (see set_roots)
+OUTPUT_DIR = SCRIPT_DIR
+
+# Columns of index_raw.csv, index.csv and index_missing.csv
+INDEX_COLUMNS = ['no', 'cnName', 'enName', 'baituTier', 'enTier', 'chenTier', 'jpName', 'comment_jpwiki_cn', 'effect', 'baituDesc', 'enDesc', 'chenDesc']
+
+# Tier and desc columns; a row with all of them empty is filtered out of index.csv
+RATING_COLUMNS = ['baituTier', 'enTier', 'chenTier', 'baituDesc', 'enDesc', 'chenDesc']
+
+# The base source every other source joins onto (one record per card no)
+BASE_SOURCE = {
+    'name': 'database',
+    'file': ['Agricola Database - Database.csv', 'Agricola Database - Database (in progress).csv'],
+    'format': 'csv',
+    'decks': ['A', 'B', 'C', 'D', 'E']
+}
+
+# Declarative registry of the sources joined onto the base records.
+#
+# Each source declares:
+#   name      unique id
+#   file      file name, relative to the scripts directory
+#   format    csv, tsv_stats, json or jsonl
+#   key       (record field, source field) the join matches on
+#   fields    {record field: source field} copied onto matched records;
+#             'stats.<snapshot>' fields end up under card['stats']
+#   priority  joins writing the same field run in ascending priority, so
+#             the highest priority wins
+# and optionally:
+#   stage         'merge' (default) joins before index.csv is filtered,
+#                 'index' joins the filtered rows only
+#   fallback_key  (record field, source field) used for records and source
+#                 rows that did not match on key
+#   convert       {record field: name in CONVERTERS} applied to the value
+#   fill_only     record fields only set when the record value is empty
+#   require       source fields that must be non-empty for a row to join
+#   strip         strip source values (default True)
+#   keep          matched records are kept in index.csv even without ratings
+#   optional      a missing or unreadable file is a warning, not an error
+SOURCES = [
+    {
+        'name': 'cards',
+        'file': 'cards.json',
+        'format': 'json',
+        'key': ('no', 'no'),
+        'fields': {'cnName': 'name', 'baituTier': 'tier', 'baituDesc': 'desc'},
+        'strip': False,
+        'priority': 10
+    },
+    {
+        # e.csv overrides the cnName of cards.json
+        'name': 'e_csv',
+        'file': 'e.csv',
+        'format': 'csv',
+        'key': ('no', 'no'),
+        'fields': {'cnName': 'name'},
+        'require': ['name'],
+        'priority': 20
+    },
+    {
+        'name': 'en',
+        'file': 'en.json',
+        'format': 'json',
+        'key': ('enName', 'card_title'),
+        'fields': {'enDesc': 'insight', 'enTier': 'rating'},
+        'convert': {'enTier': 'rating_to_tier'},
+        'strip': False,
+        'priority': 30
+    },
+    {
+        'name': 'even_more_set',
+        'file': 'even_more_set_minor_improvements.json',
+        'format': 'json',
+        'key': ('no', 'no'),
+        'fallback_key': ('cnName', 'name'),
+        'fields': {'chenTier': 'tier', 'chenDesc': 'desc', 'cnName': 'name'},
+        'fill_only': ['cnName'],
+        'keep': True,
+        'priority': 40
+    },
+    {
+        'name': 'jp',
+        'file': 'cards_gamewiki_jp_merged.jsonl',
+        'format': 'jsonl',
+        'key': ('no', 'card_id'),
+        'fields': {'jpName': 'name_jp', 'comment_jpwiki_cn': 'comment_jpwiki_cn'},
+        'optional': True,
+        'priority': 50
+    },
+    {
+        # set_o.json only rates cards that made it into index.csv
+        'name': 'set_o',
+        'file': 'set_o.json',
+        'format': 'json',
+        'stage': 'index',
+        'key': ('no', 'no'),
+        'fields': {'chenTier': 'tier', 'chenDesc': 'desc'},
+        'priority': 60
+    },
+    {
+        'name': 'stats_default',
+        'file': '4p_de.tsv',
+        'format': 'tsv_stats',
+        'key': ('enName', 'Card Name'),
+        'fields': {'stats.default': 'stats'},
+        'keep': True,
+        'priority': 70
+    },
+    {
+        'name': 'stats_nb',
+        'file': '4p_nb.tsv',
+        'format': 'tsv_stats',
+        'key': ('enName', 'Card Name'),
+        'fields': {'stats.nb': 'stats'},
+        'priority': 71
+    },
+    {
+        'name': 'cards_export',
+        'file': 'cards_export.json',
+        'format': 'json',
+        'key': ('no', 'id'),
+        'fields': {'enDesc_trans2zh': 'enDesc_trans2zh', 'jpwiki_score': 'jpwiki_score'},
+        'strip': False,
+        'optional': True,
+        'priority': 80
+    }
+]
+
+# Inputs of the stages outside the registry (read again on every build)
+STAGE_INPUTS = ([video['srt'] for video in video_clips.VIDEOS]
+                + [card_aliases.BGA_NAMES_FILE, translation_memory.MEMORY_FILE])
+
+# Last (digest of the inputs, result) of each derived stage: a rebuild in the
+# same process (--watch, serve_cards.py --rebuild) skips the stages whose
+# inputs did not change
+STAGE_RESULTS = {}
+
+def file_stamps(filepaths):
+    """(path, size, mtime) of files, None for missing ones"""
+    stamps = []
+    for filepath in filepaths:
+        try:
+            stat = os.stat(filepath)
+            stamps.append((filepath, stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            stamps.append((filepath, None))
+    return stamps
+
+def run_stage(name, func, *args, key=None, files=()):
+    """Run func(*args) unless this stage already ran on the same inputs
+    key is what the result depends on (default: args) and files the input
+    files the stage reads itself (compared by content). Returns the result,
+    the previous one when the stage is skipped.
+    """
+    file_digests = [source_cache.file_digest(f) if os.path.exists(f) else None for f in files]
+    digest = hashlib.sha256(pickle.dumps((OUTPUT_DIR, args if key is None else key, file_digests))).hexdigest()
+    previous = STAGE_RESULTS.get(name)
+    if previous and previous[0] == digest:
+        print(f"Skipped {name}: inputs unchanged")
+        return previous[1]
+    result = func(*args)
+    STAGE_RESULTS[name] = (digest, result)
+    return result
+
+def game_log_files():
+    return game_logs.log_files(GAME_LOG_DIR) if os.path.isdir(GAME_LOG_DIR) else []
+
+def stage_input_files():
+    """Input files read by the stages themselves, including the game logs"""
+    return STAGE_INPUTS + game_log_files()
+
+def source_files(spec):
+    """Return the list of files of a source"""
+    return spec['file'] if isinstance(spec['file'], list) else [spec['file']]
+
+def all_source_files():
+    """Return every input file of the pipeline"""
+    files = []
+    for spec in [BASE_SOURCE] + SOURCES:
+        files += source_files(spec)
+    return files + stage_input_files()
+
+def check_registry(specs):
+    """Raise ValueError for an inconsistent source registry"""
+    names = set()
+    priorities = set()
+    for spec in specs:
+        for field in ['name', 'file', 'format', 'key', 'fields', 'priority']:
+            if field not in spec:
+                raise ValueError(f"Source {spec.get('name', '?')} is missing '{field}'")
+        if spec['name'] in names:
+            raise ValueError(f"Duplicate source name: {spec['name']}")
+        if spec['priority'] in priorities:
+            raise ValueError(f"Duplicate priority {spec['priority']} (source {spec['name']})")
+        if spec['format'] not in READERS:
+            raise ValueError(f"Unknown format '{spec['format']}' (source {spec['name']})")
+        if spec.get('stage', 'merge') not in ('merge', 'index'):
+            raise ValueError(f"Unknown stage '{spec['stage']}' (source {spec['name']})")
+        if spec.get('stage') == 'index' and spec.get('keep'):
+            raise ValueError(f"Source {spec['name']} joins after filtering and cannot keep rows")
+        for converter in spec.get('convert', {}).values():
+            if converter not in CONVERTERS:
+                raise ValueError(f"Unknown converter '{converter}' (source {spec['name']})")
+        names.add(spec['name'])
+        priorities.add(spec['priority'])
 
 def read_csv_file(filepath):
     """Read CSV file and return list of dictionaries"""
@@ -19,10 +257,62 @@ def read_csv_file(filepath):
             data.append(row)
     return data
 
-def read_json_file(filepath):
-    """Read JSON file"""
+def read_jsonl_file(filepath):
+    """Read JSON Lines file, skipping invalid lines"""
+    data = []
     with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                print(f"Warning: Invalid JSON on line {line_num} of {filepath}: {e}")
+    return data
+
+def read_tsv_stats_file(filepath):
+    """Read a stats TSV as rows of {'Card Name': name, 'stats': stats}"""
+    return [{'Card Name': name, 'stats': stats} for name, stats in parse_tsv_stats(filepath).items()]
+
+def set_roots(input_root=SCRIPT_DIR, output_root=None):
+    """Read the sources from input_root and write the outputs under output_root
+    (default: input_root). The sources are opened relative to the working
+    directory, also in the loader processes, so this changes into input_root.
+    """
+    global OUTPUT_DIR
+    OUTPUT_DIR = os.path.abspath(output_root or input_root)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    os.chdir(input_root)
+
+def output_path(filepath):
+    return os.path.join(OUTPUT_DIR, filepath)
+
+def write_output(filepath, content, newline=None):
+    """Write text to filepath (relative to the output root) unless the file
+    already holds exactly that content
+    Skipping unchanged outputs keeps their mtime, so watchers downstream
+    (dev servers, extension reloaders) only see files that really changed.
+    Returns True if the file was written.
+    """
+    filepath = output_path(filepath)
+    try:
+        with open(filepath, 'r', encoding='utf-8', newline=newline) as f:
+            if f.read() == content:
+                return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    with open(filepath, 'w', encoding='utf-8', newline=newline) as f:
+        f.write(content)
+    return True
+
+def write_csv_output(filepath, rows):
+    """Write index-style rows as CSV through write_output"""
+    buffer = io.StringIO(newline='')
+    writer = csv.DictWriter(buffer, fieldnames=INDEX_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return write_output(filepath, buffer.getvalue(), newline='')
 
 def create_no(deck, number):
     """Create no from Deck and Number columns
@@ -44,41 +334,320 @@ def create_no(deck, number):
     else:
         return number_padded
 
-def step1_create_pk():
-    """Step 1: Create pk.json from CSV files"""
-    print("Step 1: Creating pk.json from CSV files...")
+def convert_rating_to_tier(rating):
+    """Convert rating number to tier letter
+    1 -> E, 2 -> D, 3 -> C, 4 -> B, 5 -> A, 0 or other -> empty string
+    """
+    rating_map = {
+        1: 'E',
+        2: 'D',
+        3: 'C',
+        4: 'B',
+        5: 'A'
+    }
 
-    # Read both CSV files
-    data1 = read_csv_file('Agricola Database - Database.csv')
-    data2 = read_csv_file('Agricola Database - Database (in progress).csv')
+    try:
+        rating_int = int(rating)
+        if rating_int == 0:
+            return ''
+        return rating_map.get(rating_int, '')
+    except (ValueError, TypeError):
+        return ''
 
-    pk_data = []
-    seen = set()
+# Each rater's scale mapped onto a common 0-100 score (best tier = 100)
+TIER_SCALES = {
+    'baituTier': ['T0', 'T1', 'T2', 'T3', 'T4'],
+    'enTier': ['A', 'B', 'C', 'D', 'E'],
+    'chenTier': ['S', 'A', 'B', 'C', 'D', 'E', 'F']
+}
+
+def normalize_tier(field, tier):
+    """Map a tier string of the given rater field to 0-100, or None if unrated"""
+    scale = TIER_SCALES[field]
+    tier = str(tier).strip().upper()
+    if tier not in scale:
+        return None
+    return 100 * (len(scale) - 1 - scale.index(tier)) / (len(scale) - 1)
+
+def normalize_jpwiki_score(score):
+    """Map a jpwiki_score (0-10, '-' when unrated) to 0-100, or None if unrated"""
+    try:
+        value = float(score)
+    except (ValueError, TypeError):
+        return None
+    if not 0 <= value <= 10:
+        return None
+    return value * 10
+
+def compute_tier_consensus(cards):
+    """Add unified tier fields to every card rated by at least one source
+    tierScore: mean normalized score (0-100)
+    tierRank: consensus rank by tierScore, 1 is best, ties share a rank
+    tierRaters: number of sources that rated the card
+    tierSpread: max - min normalized score across raters (0 with one rater)
+    tierVariance: population variance of the normalized scores
+    """
+    rated = []
+    for card in cards:
+        scores = [normalize_tier(field, card.get(field, '')) for field in TIER_SCALES]
+        scores.append(normalize_jpwiki_score(card.get('jpwiki_score')))
+        scores = [score for score in scores if score is not None]
+        if not scores:
+            continue
 
-    # Process first CSV
-    for row in data1:
-        deck = row.get('Deck', '').strip()
-        number = row.get('Number', '').strip()
-        name = row.get('Name', '').strip()
+        mean = sum(scores) / len(scores)
+        card['tierScore'] = round(mean)
+        card['tierRaters'] = len(scores)
+        card['tierSpread'] = round(max(scores) - min(scores))
+        card['tierVariance'] = round(sum((score - mean) ** 2 for score in scores) / len(scores))
+        rated.append((mean, card))
+
+    rated.sort(key=lambda x: -x[0])
+    rank = 0
+    for i, (mean, card) in enumerate(rated):
+        if i == 0 or mean != rated[i - 1][0]:
+            rank = i + 1
+        card['tierRank'] = rank
+
+    return len(rated)
+
+# Stats TSV columns kept per card: rates as floats, counts as ints
+TSV_RATE_COLUMNS = {'PWR': 'pwr', 'ADP': 'adp', 'APR': 'apr', 'Elo/Play': 'eloPerPlay'}
+TSV_COUNT_COLUMNS = {'Deals': 'deals', 'Drafted': 'drafted', 'Plays': 'plays', 'W-Hand': 'winsHand', 'W-Play': 'winsPlay'}
+
+# Confidence intervals: z for 95%, pseudo-games of the win rate prior,
+# and the number of drafts under which a card is flagged as low sample
+INTERVAL_Z = 1.96
+WIN_RATE_PRIOR_GAMES = 20
+LOW_SAMPLE_DRAFTED = 50
+
+def parse_stat_number(value, cast):
+    try:
+        return cast(value.strip()) if value and value.strip() else None
+    except (ValueError, TypeError):
+        return None
 
-        if not number or not name:
-            continue
+def parse_tsv_stats(filepath):
+    """Parse TSV file and extract statistics
+    Keeps pwr, adp, apr, Elo/Play and the raw counts, plus drawPlayRate and
+    the confidence intervals from compute_stat_intervals.
+    Returns a dictionary mapping Card Name to stats
+    """
+    stats_map = {}
 
-        # Remove rows where Deck is not in ABCDE or Deck is empty
-        if not deck or deck not in ['A', 'B', 'C', 'D', 'E']:
+    with open(filepath, 'r', encoding='utf-8') as f:
+        # TSV files use tab separator
+        reader = csv.DictReader(f, delimiter='\t')
+
+        # Find the actual column names (they may have leading/trailing spaces)
+        card_name_col = None
+        columns = {}
+        for col in reader.fieldnames or []:
+            col_stripped = col.strip()
+            if 'Card Name' in col_stripped:
+                card_name_col = col
+            elif col_stripped in TSV_RATE_COLUMNS:
+                columns[TSV_RATE_COLUMNS[col_stripped]] = (col, float)
+            elif col_stripped in TSV_COUNT_COLUMNS:
+                columns[TSV_COUNT_COLUMNS[col_stripped]] = (col, int)
+
+        if not card_name_col:
+            print(f"Warning: Could not find 'Card Name' column in {filepath}")
+            return stats_map
+
+        for row in reader:
+            card_name = row.get(card_name_col, '').strip()
+            if not card_name:
+                continue
+
+            stats = {'pwr': None, 'adp': None, 'apr': None}
+            for key, (col, cast) in columns.items():
+                stats[key] = parse_stat_number(row.get(col, ''), cast)
+            stats_map[card_name] = stats
+
+    compute_stat_intervals(stats_map)
+    return stats_map
+
+def wilson_interval(successes, trials, z=INTERVAL_Z):
+    """Wilson score interval of successes / trials (arrays; NaN where trials is 0)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = successes / trials
+        denominator = 1 + z * z / trials
+        center = (p + z * z / (2 * trials)) / denominator
+        half = z * np.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return center - half, center + half
+
+def shrunk_interval(successes, trials, prior_mean, prior_games=WIN_RATE_PRIOR_GAMES, z=INTERVAL_Z):
+    """Beta-binomial posterior mean and normal-approximation interval,
+    shrinking small samples towards prior_mean
+    """
+    alpha = successes + prior_games * prior_mean
+    beta = trials - successes + prior_games * (1 - prior_mean)
+    mean = alpha / (alpha + beta)
+    half = z * np.sqrt(mean * (1 - mean) / (alpha + beta + 1))
+    return mean, np.clip(mean - half, 0, 1), np.clip(mean + half, 0, 1)
+
+def compute_stat_intervals(stats_map):
+    """Add drawPlayRate and its Wilson interval, prior-shrunk win rates (in hand
+    and when played) with intervals, and a lowSample flag, vectorized over cards
+    """
+    if not stats_map:
+        return
+
+    def column(key):
+        return np.array([stats.get(key) or 0 for stats in stats_map.values()], dtype=float)
+
+    drafted = column('drafted')
+    plays = np.minimum(column('plays'), drafted)
+    wins_hand = np.minimum(column('winsHand'), drafted)
+    wins_play = np.minimum(column('winsPlay'), plays)
+
+    play_low, play_high = wilson_interval(plays, drafted)
+
+    # The prior is the pooled win rate of all cards in the same file
+    hand_prior = wins_hand.sum() / drafted.sum() if drafted.sum() else 0.5
+    play_prior = wins_play.sum() / plays.sum() if plays.sum() else 0.5
+    hand_rate, hand_low, hand_high = shrunk_interval(wins_hand, drafted, hand_prior)
+    play_rate, play_low_win, play_high_win = shrunk_interval(wins_play, plays, play_prior)
+
+    def value(array, idx):
+        return None if np.isnan(array[idx]) else round(float(array[idx]), 4)
+
+    for idx, stats in enumerate(stats_map.values()):
+        has_drafted = drafted[idx] > 0
+        # Calculate drawPlayRate = Plays / Drafted
+        stats['drawPlayRate'] = (stats.get('plays') or 0) / stats['drafted'] if has_drafted else None
+        stats['drawPlayRateLow'] = value(play_low, idx)
+        stats['drawPlayRateHigh'] = value(play_high, idx)
+        stats['winRateHand'] = value(hand_rate, idx) if has_drafted else None
+        stats['winRateHandLow'] = value(hand_low, idx) if has_drafted else None
+        stats['winRateHandHigh'] = value(hand_high, idx) if has_drafted else None
+        stats['winRatePlay'] = value(play_rate, idx) if plays[idx] > 0 else None
+        stats['winRatePlayLow'] = value(play_low_win, idx) if plays[idx] > 0 else None
+        stats['winRatePlayHigh'] = value(play_high_win, idx) if plays[idx] > 0 else None
+        stats['lowSample'] = bool(drafted[idx] < LOW_SAMPLE_DRAFTED)
+
+READERS = {
+    'csv': read_csv_file,
+    'tsv_stats': read_tsv_stats_file,
+    'json': source_cache.read_json,
+    'jsonl': read_jsonl_file
+}
+
+CONVERTERS = {
+    'rating_to_tier': convert_rating_to_tier
+}
+
+def source_value(row, field, strip):
+    value = row.get(field, '')
+    return value.strip() if strip and isinstance(value, str) else value
+
+def source_key(row, field):
+    value = row.get(field, '')
+    return value.strip() if isinstance(value, str) else ''
+
+def project_source_rows(rows, spec):
+    """Reduce source rows to [{'key', 'fallback', 'values'}] with record field names"""
+    strip = spec.get('strip', True)
+    key_field = spec['key'][1]
+    fallback_field = spec['fallback_key'][1] if 'fallback_key' in spec else None
+    converters = {field: CONVERTERS[name] for field, name in spec.get('convert', {}).items()}
+
+    projected = []
+    for row in rows:
+        if not isinstance(row, dict):
             continue
+        if any(not source_key(row, field) for field in spec.get('require', [])):
+            continue
+        key = source_key(row, key_field)
+        fallback = source_key(row, fallback_field) if fallback_field else ''
+        if not key and not fallback:
+            continue
+        values = {}
+        for record_field, field in spec['fields'].items():
+            value = source_value(row, field, strip)
+            if record_field in converters:
+                value = converters[record_field](value)
+            values[record_field] = value
+        projected.append({'key': key, 'fallback': fallback, 'values': values})
+    return projected
+
+def load_base_rows(filepath):
+    """Keep the Database columns the base records are built from"""
+    return [
+        {field: row.get(field, '') for field in ['Deck', 'Number', 'Name', 'Type', 'Text']}
+        for row in read_csv_file(filepath)
+    ]
 
-        no = create_no(deck, number)
-        if no and no not in seen:
-            pk_data.append({
-                'no': no,
-                'enName': name,
-                'effect': row.get('Text', '').strip()
-            })
-            seen.add(no)
+def load_source(name, use_cache=True, base_dir='.'):
+    """Load one source by name and return its projected rows
+    Runs in a worker process, so it only takes picklable arguments.
+    """
+    if name == BASE_SOURCE['name']:
+        rows = []
+        for filepath in source_files(BASE_SOURCE):
+            rows += source_cache.load_cached(os.path.join(base_dir, filepath), load_base_rows, use_cache=use_cache)
+        return rows
+
+    spec = next(spec for spec in SOURCES if spec['name'] == name)
+    reader = READERS[spec['format']]
+
+    def parse(filepath):
+        return project_source_rows(reader(filepath), spec)
+
+    fingerprint = '|'.join([
+        source_cache.function_digest(reader),
+        source_cache.function_digest(project_source_rows),
+        repr(sorted(spec.items()))
+    ])
+    return source_cache.load_cached(os.path.join(base_dir, spec['file']), parse, name=spec['name'],
+                                    fingerprint=fingerprint, use_cache=use_cache)
+
+def load_sources(jobs=None, use_cache=True):
+    """Load the base source and every registered source in parallel
+    Returns {name: rows}; optional sources that fail to load map to None.
+    """
+    names = [BASE_SOURCE['name']] + [spec['name'] for spec in SOURCES]
+    print(f"Loading {len(names)} sources...")
 
-    # Process second CSV
-    for row in data2:
+    if jobs == 1:
+        results = {}
+        for name in names:
+            try:
+                results[name] = load_source(name, use_cache)
+            except Exception as e:
+                results[name] = e
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {name: executor.submit(load_source, name, use_cache) for name in names}
+            results = {}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    results[name] = e
+
+    loaded = {}
+    for spec in [BASE_SOURCE] + SOURCES:
+        result = results[spec['name']]
+        if isinstance(result, Exception):
+            if not spec.get('optional'):
+                raise result
+            print(f"Warning: Error reading {spec['file']}: {result}, skipping {spec['name']}")
+            loaded[spec['name']] = None
+        else:
+            loaded[spec['name']] = result
+            print(f"  Loaded {len(result)} rows from {', '.join(source_files(spec))}")
+    return loaded
+
+def build_base_records(rows):
+    """Create pk.json records from the Database rows (first row of each no wins)"""
+    print("Creating pk.json from CSV files...")
+
+    pk_data = []
+    seen = set()
+
+    for row in rows:
         deck = row.get('Deck', '').strip()
         number = row.get('Number', '').strip()
         name = row.get('Name', '').strip()
@@ -87,7 +656,7 @@ def step1_create_pk():
             continue
 
         # Remove rows where Deck is not in ABCDE or Deck is empty
-        if not deck or deck not in ['A', 'B', 'C', 'D', 'E']:
+        if not deck or deck not in BASE_SOURCE['decks']:
             continue
 
         no = create_no(deck, number)
@@ -95,632 +664,681 @@ def step1_create_pk():
             pk_data.append({
                 'no': no,
                 'enName': name,
+                'type': row.get('Type', '').strip(),
                 'effect': row.get('Text', '').strip()
             })
             seen.add(no)
 
     # Save pk.json
-    with open('pk.json', 'w', encoding='utf-8') as f:
-        json.dump(pk_data, f, ensure_ascii=False, indent=2)
+    write_output('pk.json', json.dumps(pk_data, ensure_ascii=False, indent=2))
 
     print(f"Created pk.json with {len(pk_data)} entries")
     return pk_data
 
-def step2_match_cards_json(pk_data):
-    """Step 2: Match cards.json"""
-    print("Step 2: Matching cards.json...")
-
-    cards_data = read_json_file('cards.json')
-
-    # Create mapping from no to card data
-    cards_map = {}
-    for card in cards_data:
-        no = card.get('no', '').strip()
-        if no:
-            cards_map[no] = {
-                'cnName': card.get('name', ''),
-                'baituTier': card.get('tier', ''),
-                'baituDesc': card.get('desc', '')
-            }
-
-    # Match with pk_data
-    for item in pk_data:
-        no = item['no']
-        if no in cards_map:
-            item.update(cards_map[no])
-
-    print(f"Matched {len([x for x in pk_data if 'cnName' in x])} entries from cards.json")
-    return pk_data
-
-def step3_match_e_csv(pk_data):
-    """Step 3: Match e.csv"""
-    print("Step 3: Matching e.csv...")
-
-    e_data = read_csv_file('e.csv')
-
-    # Create mapping from no to name
-    e_map = {}
-    for row in e_data:
-        no = row.get('no', '').strip()
-        name = row.get('name', '').strip()
-        if no and name:
-            e_map[no] = name
-
-    # Match with pk_data (e.csv might override or supplement cnName)
-    matched_count = 0
-    for item in pk_data:
-        no = item['no']
-        if no in e_map:
-            item['cnName'] = e_map[no]
-            matched_count += 1
-
-    print(f"Matched {matched_count} entries from e.csv")
-    return pk_data
+def assign_values(record, values, fill_only):
+    for field, value in values.items():
+        if field in fill_only and str(record.get(field, '')).strip():
+            continue
+        record[field] = value
 
-def convert_rating_to_tier(rating):
-    """Convert rating number to tier letter
-    1 -> E, 2 -> D, 3 -> C, 4 -> B, 5 -> A, 0 or other -> empty string
+def apply_join(records, spec, rows):
+    """Join one source onto records in place
+    Duplicate keys in the source: the last row wins.
+    Returns the set of indexes of matched records.
     """
-    rating_map = {
-        1: 'E',
-        2: 'D',
-        3: 'C',
-        4: 'B',
-        5: 'A'
-    }
-
-    try:
-        rating_int = int(rating)
-        if rating_int == 0:
-            return ''
-        return rating_map.get(rating_int, '')
-    except (ValueError, TypeError):
-        return ''
-
-def step4_match_en_json(pk_data):
-    """Step 4: Match en.json"""
-    print("Step 4: Matching en.json...")
-
-    en_data = read_json_file('en.json')
-
-    # Create mapping from card_title to en data
-    en_map = {}
-    for item in en_data:
-        card_title = item.get('card_title', '').strip()
-        if card_title:
-            rating = item.get('rating', 0)
-            en_map[card_title] = {
-                'enDesc': item.get('insight', ''),
-                'enTier': convert_rating_to_tier(rating)
-            }
-
-    # Match with pk_data by enName
-    matched_count = 0
-    for item in pk_data:
-        en_name = item.get('enName', '').strip()
-        if en_name and en_name in en_map:
-            item.update(en_map[en_name])
-            matched_count += 1
+    record_key = spec['key'][0]
+    fill_only = set(spec.get('fill_only', []))
+
+    key_map = {row['key']: row['values'] for row in rows if row['key']}
+
+    matched = set()
+    matched_keys = set()
+    for idx, record in enumerate(records):
+        key = str(record.get(record_key, '')).strip()
+        if key and key in key_map:
+            assign_values(record, key_map[key], fill_only)
+            matched.add(idx)
+            matched_keys.add(key)
+
+    if 'fallback_key' in spec:
+        record_fallback = spec['fallback_key'][0]
+        fallback_map = {
+            row['fallback']: row['values'] for row in rows
+            if row['fallback'] and (not row['key'] or row['key'] not in matched_keys)
+        }
+        for idx, record in enumerate(records):
+            if idx in matched:
+                continue
+            key = str(record.get(record_fallback, '')).strip()
+            if key and key in fallback_map:
+                assign_values(record, fallback_map[key], fill_only)
+                matched.add(idx)
 
-    print(f"Matched {matched_count} entries from en.json")
-    return pk_data
+    return matched
 
-def step4_5_match_even_more_set(pk_data):
-    """Step 4.5: Match even_more_set_minor_improvements.json
-    First try to match by no, if not found, match by name to cnName
+def join_dependencies(specs):
+    """Build the join DAG: {name: set of names that must run first}
+    A join runs after every lower-priority join that writes a field it reads
+    or writes, or reads a field it writes.
     """
-    print("Step 4.5: Matching even_more_set_minor_improvements.json...")
-
-    even_more_data = read_json_file('even_more_set_minor_improvements.json')
-
-    # Track which items have even_more_set data
-    even_more_set_items = set()
-
-    # First pass: match by no
-    no_map = {}
-    for item in even_more_data:
-        no = item.get('no', '').strip()
-        if no:
-            # Store the data, keyed by no
-            no_map[no] = {
-                'name': item.get('name', '').strip(),
-                'chenTier': item.get('tier', '').strip(),
-                'chenDesc': item.get('desc', '').strip()
-            }
+    def reads(spec):
+        fields = {spec['key'][0]}
+        if 'fallback_key' in spec:
+            fields.add(spec['fallback_key'][0])
+        return fields | set(spec.get('fill_only', []))
+
+    deps = {}
+    for spec in specs:
+        writes = set(spec['fields'])
+        deps[spec['name']] = {
+            other['name'] for other in specs
+            if other['priority'] < spec['priority']
+            and (set(other['fields']) & (writes | reads(spec)) or reads(other) & writes)
+        }
+    return deps
+
+def run_dag(deps, task, jobs=None):
+    """Run task(name) for every node of deps once all its dependencies are done
+    Nodes whose dependencies are satisfied run concurrently.
+    Returns {name: result}.
+    """
+    results = {}
+    pending = dict(deps)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while pending:
+            ready = sorted(name for name, before in pending.items() if before <= results.keys())
+            if not ready:
+                raise ValueError(f"Dependency cycle between sources: {', '.join(sorted(pending))}")
+            for name, result in zip(ready, executor.map(task, ready)):
+                results[name] = result
+            for name in ready:
+                del pending[name]
+    return results
+
+def run_joins(records, specs, loaded, jobs=None):
+    """Apply the joins of specs to records in dependency order
+    Returns {name: set of matched record indexes}.
+    """
+    by_name = {spec['name']: spec for spec in specs if loaded.get(spec['name']) is not None}
 
-    matched_by_no = 0
-    cn_name_set_count = 0
-    for pk_item in pk_data:
-        no = pk_item.get('no', '').strip()
-        if no and no in no_map:
-            # Update chenTier and chenDesc (may override existing values)
-            pk_item['chenTier'] = no_map[no]['chenTier']
-            pk_item['chenDesc'] = no_map[no]['chenDesc']
-
-            # If current entry has no cnName, use the name from even_more_set
-            if not pk_item.get('cnName', '').strip():
-                pk_item['cnName'] = no_map[no]['name']
-                cn_name_set_count += 1
-
-            even_more_set_items.add(no)
-            matched_by_no += 1
-
-    # Second pass: match by name to cnName (for items not matched by no)
-    name_map = {}
-    for item in even_more_data:
-        name = item.get('name', '').strip()
-        no = item.get('no', '').strip()
-        # Only add to name_map if this item wasn't matched by no
-        if name and (not no or no not in even_more_set_items):
-            name_map[name] = {
-                'chenTier': item.get('tier', '').strip(),
-                'chenDesc': item.get('desc', '').strip()
-            }
+    def task(name):
+        return apply_join(records, by_name[name], loaded[name])
 
-    matched_by_name = 0
-    for pk_item in pk_data:
-        no = pk_item.get('no', '').strip()
-        # Only try name matching if not already matched by no
-        if no not in even_more_set_items:
-            cn_name = pk_item.get('cnName', '').strip()
-            if cn_name and cn_name in name_map:
-                # Update chenTier and chenDesc
-                pk_item['chenTier'] = name_map[cn_name]['chenTier']
-                pk_item['chenDesc'] = name_map[cn_name]['chenDesc']
-                even_more_set_items.add(no)
-                matched_by_name += 1
-
-    print(f"Matched {matched_by_no} entries by no, {matched_by_name} entries by name from even_more_set_minor_improvements.json")
-    if cn_name_set_count > 0:
-        print(f"  Set cnName for {cn_name_set_count} entries that had no cnName")
-
-    return pk_data, even_more_set_items
-
-def step5_match_jp_jsonl(pk_data):
-    print("Step 5: Matching cards_gamewiki_jp_merged.jsonl...")
-
-    jp_data = []
-    try:
-        with open('cards_gamewiki_jp_merged.jsonl', 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    json_obj = json.loads(line)
-                    jp_data.append(json_obj)
-                except json.JSONDecodeError as e:
-                    print(f"Warning: Invalid JSON on line {line_num}: {e}")
-                    continue
-    except FileNotFoundError:
-        print("Warning: cards_gamewiki_jp_merged.jsonl not found, skipping JP data matching")
-        return pk_data
-    except Exception as e:
-        print(f"Warning: Error reading cards_gamewiki_jp_merged.jsonl: {e}, skipping JP data matching")
-        return pk_data
-
-    jp_map = {}
-    for item in jp_data:
-        if isinstance(item, dict):
-            card_id = item.get('card_id', '').strip()
-            if card_id:
-                jp_map[card_id] = {
-                    'jpName': item.get('name_jp', '').strip(),
-                    'comment_jpwiki_cn': item.get('comment_jpwiki_cn', '').strip()
-                }
-
-    matched_count = 0
-    for pk_item in pk_data:
-        no = pk_item.get('no', '').strip()
-        if no and no in jp_map:
-            pk_item['jpName'] = jp_map[no]['jpName']
-            pk_item['comment_jpwiki_cn'] = jp_map[no]['comment_jpwiki_cn']
-            matched_count += 1
-
-    print(f"Matched {matched_count} entries from cards_gamewiki_jp_merged.jsonl")
-    return pk_data
+    matched = run_dag(join_dependencies(list(by_name.values())), task, jobs)
+    for spec in specs:
+        if spec['name'] in matched:
+            print(f"  Joined {len(matched[spec['name']])} entries from {spec['file']} on {spec['key'][0]}")
+    return matched
+
+def csv_value(value):
+    """Value as it reads back from a CSV file"""
+    return '' if value is None else str(value)
 
-def generate_index_csv(pk_data, even_more_set_items=None, stats_data=None):
-    """Generate index_raw.csv and filtered index.csv
+def generate_index_csv(records, keep):
+    """Generate index_raw.csv and return the rows kept for index.csv
     Args:
-        pk_data: List of card data
-        even_more_set_items: Set of 'no' values that have even_more_set data
-        stats_data: Dictionary with statistics data (for checking 4p_de matches)
+        records: List of merged card records
+        keep: Set of record indexes kept even without any tier or desc
+              (matched by a source with 'keep')
+    Returns a list of (row, record) pairs
     """
-    print("Step 5: Generating index_raw.csv...")
-
-    # Define columns
-    columns = ['no', 'cnName', 'enName', 'baituTier', 'enTier', 'chenTier', 'jpName', 'comment_jpwiki_cn', 'effect', 'baituDesc', 'enDesc', 'chenDesc']
+    print("Generating index_raw.csv...")
 
     # First, generate index_raw.csv with all data
-    all_rows = []
-    with open('index_raw.csv', 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=columns)
-        writer.writeheader()
-
-        for item in pk_data:
-            row = {
-                'no': item.get('no', ''),
-                'cnName': item.get('cnName', ''),
-                'enName': item.get('enName', ''),
-                'baituTier': item.get('baituTier', ''),
-                'enTier': item.get('enTier', ''),
-                'chenTier': item.get('chenTier', ''),  # From even_more_set_minor_improvements.json or set_o.json
-                'jpName': item.get('jpName', ''),
-                'comment_jpwiki_cn': item.get('comment_jpwiki_cn', ''),
-                'effect': item.get('effect', ''),
-                'baituDesc': item.get('baituDesc', ''),
-                'enDesc': item.get('enDesc', ''),
-                'chenDesc': item.get('chenDesc', '')  # From even_more_set_minor_improvements.json or set_o.json
-            }
-            all_rows.append(row)
-            writer.writerow(row)
+    all_rows = [{column: csv_value(item.get(column, '')) for column in INDEX_COLUMNS} for item in records]
+    write_csv_output('index_raw.csv', all_rows)
 
     print(f"Generated index_raw.csv with {len(all_rows)} rows")
 
     # Filter rows: remove rows where all tier and desc fields are empty
-    # BUT keep rows if they have even_more_set data or match 4p_de.tsv
-    print("Step 6: Filtering index.csv...")
-    filtered_rows = []
-
-    # Create a set of enNames that match 4p_de.tsv
-    matched_4p_de = set()
-    if stats_data and 'default' in stats_data:
-        matched_4p_de = set(stats_data['default'].keys())
-
-    for row in all_rows:
-        # Check if all tier and desc fields are empty
-        tier_fields = [row.get('baituTier', '').strip(),
-                      row.get('enTier', '').strip(),
-                      row.get('chenTier', '').strip()]
-        desc_fields = [row.get('baituDesc', '').strip(),
-                      row.get('enDesc', '').strip(),
-                      row.get('chenDesc', '').strip()]
-
-        # Check if row has even_more_set data
-        no = row.get('no', '').strip()
-        has_even_more_set = even_more_set_items and no in even_more_set_items
-
-        # Check if row matches 4p_de.tsv
-        en_name = row.get('enName', '').strip()
-        matches_4p_de = en_name in matched_4p_de
-
-        # Keep row if:
-        # 1. At least one tier or desc field is not empty, OR
-        # 2. Has even_more_set data, OR
-        # 3. Matches 4p_de.tsv
-        if any(tier_fields) or any(desc_fields) or has_even_more_set or matches_4p_de:
-            filtered_rows.append(row)
-
-    # Generate final index.csv
-    with open('index.csv', 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=columns)
-        writer.writeheader()
-        writer.writerows(filtered_rows)
-
-    print(f"Generated index.csv with {len(filtered_rows)} rows (removed {len(all_rows) - len(filtered_rows)} empty rows)")
-
-    return filtered_rows
-
-def step7_match_set_o_json():
-    """Step 7: Match set_o.json and update chenTier and chenDesc in index.csv"""
-    print("Step 7: Matching set_o.json...")
-
-    # Read set_o.json
-    set_o_data = read_json_file('set_o.json')
-
-    # Create mapping from name to tier and desc
-    set_o_map = {}
-    for item in set_o_data:
-        no = item.get('no', '').strip()
-        if no:
-            set_o_map[no] = {
-                'chenTier': item.get('tier', '').strip(),
-                'chenDesc': item.get('desc', '').strip()
-            }
-
-    # Read index.csv and update rows
-    columns = ['no', 'cnName', 'enName', 'baituTier', 'enTier', 'chenTier', 'jpName', 'comment_jpwiki_cn', 'effect', 'baituDesc', 'enDesc', 'chenDesc']
-    updated_rows = []
-    matched_count = 0
-
-    with open('index.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            no_1 = row.get('no', '').strip()
-            if no_1 and no_1 in set_o_map:
-                # Update chenTier and chenDesc
-                row['chenTier'] = set_o_map[no_1]['chenTier']
-                row['chenDesc'] = set_o_map[no_1]['chenDesc']
-                matched_count += 1
-            updated_rows.append(row)
-
-    # Write updated index.csv
-    with open('index.csv', 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=columns)
-        writer.writeheader()
-        writer.writerows(updated_rows)
-
-    print(f"Matched {matched_count} entries from set_o.json and updated index.csv")
-
-def parse_tsv_stats(filepath):
-    """Parse TSV file and extract statistics (pwr, adp, drawPlayRate)
-    Returns a dictionary mapping Card Name to stats
+    # BUT keep rows matched by a 'keep' source (even_more_set, 4p_de.tsv)
+    print("Filtering index.csv...")
+    filtered = []
+    for idx, row in enumerate(all_rows):
+        if any(row.get(column, '').strip() for column in RATING_COLUMNS) or idx in keep:
+            filtered.append((row, records[idx]))
+
+    print(f"Kept {len(filtered)} rows (removed {len(all_rows) - len(filtered)} empty rows)")
+    return filtered
+
+def write_index_csv(rows):
+    """Write the final index.csv"""
+    write_csv_output('index.csv', rows)
+
+    print(f"Generated index.csv with {len(rows)} rows")
+
+def generate_card_all_json(filtered, extras):
+    """Generate card_all.json from the index.csv rows and the fields of their records
+    that are not index columns (statistics, cards_export.json)
+    extras maps further card fields to {no: value} (video clips, stats trends, synergy,
+    memory translations)
     """
-    stats_map = {}
+    print("Generating card_all.json...")
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        # TSV files use tab separator
-        reader = csv.DictReader(f, delimiter='	')
+    extra_fields = []
+    for spec in SOURCES:
+        if spec.get('stage', 'merge') == 'merge':
+            extra_fields += [field for field in spec['fields']
+                             if field not in INDEX_COLUMNS and field not in extra_fields]
+    stats_fields = [field for field in extra_fields if field.startswith('stats.')]
+    other_fields = [field for field in extra_fields if not field.startswith('stats.')]
 
-        # Find the actual column names (they may have leading/trailing spaces)
-        fieldnames = reader.fieldnames
-        card_name_col = None
-        pwr_col = None
-        adp_col = None
-        apr_col = None
-        plays_col = None
-        drafted_col = None
-
-        if fieldnames is not None:
-            for col in fieldnames:
-                col_stripped = col.strip()
-                if 'Card Name' in col_stripped or col_stripped == 'Card Name':
-                    card_name_col = col
-                elif col_stripped == 'PWR':
-                    pwr_col = col
-                elif col_stripped == 'ADP':
-                    adp_col = col
-                elif col_stripped == 'APR':
-                    apr_col = col
-                elif col_stripped == 'Plays':
-                    plays_col = col
-                elif col_stripped == 'Drafted':
-                    drafted_col = col
+    cards = []
+    matched = defaultdict(int)
+
+    for row, record in filtered:
+        card = {
+            'no': row.get('no', ''),
+            'cnName': row.get('cnName', ''),
+            'enName': row.get('enName', ''),
+            'desc': row.get('effect', ''),
+            'baituTier': row.get('baituTier', ''),
+            'enTier': row.get('enTier', ''),
+            'chenTier': row.get('chenTier', ''),
+            'jpName': row.get('jpName', ''),
+            'comment_jpwiki_cn': row.get('comment_jpwiki_cn', ''),
+            'baituDesc': row.get('baituDesc', ''),
+            'enDesc': row.get('enDesc', ''),
+            'chenDesc': row.get('chenDesc', '')
+        }
+
+        # Only add stats if we have at least one snapshot
+        stats = {field[len('stats.'):]: record[field] for field in stats_fields if field in record}
+        if stats:
+            card['stats'] = stats
+
+        for field in stats_fields + other_fields:
+            if field in record:
+                matched[field] += 1
+        for field in other_fields:
+            if field in record:
+                card[field] = record[field]
+
+        for field, values in extras.items():
+            if card['no'] in values:
+                card[field] = values[card['no']]
+
+        cards.append(card)
+
+    rated_count = compute_tier_consensus(cards)
+
+    write_output('card_all.json', json.dumps(cards, ensure_ascii=False, indent=2))
 
-        if not card_name_col:
-            print(f"Warning: Could not find 'Card Name' column in {filepath}")
-            return stats_map
+    print(f"Generated card_all.json with {len(cards)} entries")
+    for field in stats_fields + other_fields:
+        print(f"  {matched[field]} entries with {field}")
+    for field in extras:
+        print(f"  {sum(1 for card in cards if field in card)} entries with {field}")
+    print(f"Computed tier consensus for {rated_count} rated entries")
+
+    return cards
+
+def stats_history_dir():
+    return output_path(os.path.basename(stats_history.HISTORY_DIR))
+
+def stats_snapshots():
+    """Snapshot names of the stats sources ('default', 'nb')"""
+    return [field[len('stats.'):] for spec in SOURCES if spec['format'] == 'tsv_stats' for field in spec['fields']]
+
+def stats_history_files():
+    return [os.path.join(stats_history.stream_dir(snapshot, stats_history_dir()), stats_history.SNAPSHOTS_FILE)
+            for snapshot in stats_snapshots()]
+
+def generate_stats_trends(records):
+    """Read the stats history (stats_history/) for the trend of each card
+    Returns {no: {snapshot: trend}}, the change of each metric since the
+    previous snapshot. The build never appends to the history: new stats
+    files are ingested explicitly with stats_history.py ingest.
+    """
+    print("Reading stats history...")
 
-        for row in reader:
-            card_name = row.get(card_name_col, '').strip()
-            if not card_name:
-                continue
+    trends = defaultdict(dict)
+    for snapshot in stats_snapshots():
+        history = stats_history.StatsHistory(snapshot, stats_history_dir())
+        by_name = history.trends()
+        for record in records:
+            if record['enName'] in by_name:
+                trends[record['no']][snapshot] = by_name[record['enName']]
+        print(f"  {snapshot}: {len(history.snapshots)} snapshots, trends for {len(by_name)} cards")
 
-            # Extract PWR and ADP
-            try:
-                pwr_val = row.get(pwr_col, '') if pwr_col else ''
-                pwr = float(pwr_val.strip()) if pwr_val and pwr_val.strip() else None
-            except (ValueError, TypeError):
-                pwr = None
+    return dict(trends)
 
-            try:
-                adp_val = row.get(adp_col, '') if adp_col else ''
-                adp = float(adp_val.strip()) if adp_val and adp_val.strip() else None
-            except (ValueError, TypeError):
-                adp = None
+# Local archive of game logs (see game_logs.py), read by the synergy stage
+GAME_LOG_DIR = 'game_logs'
 
-            try:
-                apr_val = row.get(apr_col, '') if apr_col else ''
-                apr = float(apr_val.strip()) if apr_val and apr_val.strip() else None
-            except (ValueError, TypeError):
-                apr = None
+def generate_synergy(records):
+    """Generate synergy.json, the best co-play partners of each card, from the
+    game logs in GAME_LOG_DIR (skipped when there are none)
+    """
+    if not os.path.isdir(GAME_LOG_DIR) or not game_logs.log_files(GAME_LOG_DIR):
+        print(f"No game logs in {GAME_LOG_DIR}/, skipping {synergy.OUTPUT_FILE}")
+        return {}
 
-            # Calculate drawPlayRate = Plays / Drafted
-            try:
-                plays_val = row.get(plays_col, '') if plays_col else ''
-                drafted_val = row.get(drafted_col, '') if drafted_col else ''
-                plays = float(plays_val.strip()) if plays_val and plays_val.strip() else 0
-                drafted = float(drafted_val.strip()) if drafted_val and drafted_val.strip() else 0
-                draw_play_rate = plays / drafted if drafted > 0 else None
-            except (ValueError, TypeError, ZeroDivisionError):
-                draw_play_rate = None
-
-            stats_map[card_name] = {
-                'pwr': pwr,
-                'adp': adp,
-                'apr': apr,
-                'drawPlayRate': draw_play_rate
-            }
+    print(f"Generating {synergy.OUTPUT_FILE}...")
 
-    return stats_map
+    partners = synergy.build_synergy(GAME_LOG_DIR, records)
+    write_output(synergy.OUTPUT_FILE, json.dumps(partners, ensure_ascii=False, separators=(',', ':')))
 
-def step8_load_statistics():
-    """Step 8: Load statistics from TSV files"""
-    print("Step 8: Loading statistics from TSV files...")
+    print(f"Generated {synergy.OUTPUT_FILE} with partners for {len(partners)} cards")
+    return partners
 
-    # Parse both TSV files
-    de_stats = parse_tsv_stats('4p_de.tsv')
-    nb_stats = parse_tsv_stats('4p_nb.tsv')
+def generate_video_clips(records):
+    """Generate video_clips.json, the review video moments of each card no"""
+    print(f"Generating {video_clips.OUTPUT_FILE}...")
 
-    print(f"Loaded {len(de_stats)} entries from 4p_de.tsv")
-    print(f"Loaded {len(nb_stats)} entries from 4p_nb.tsv")
+    clips = video_clips.build_video_clips(records)
+    write_output(video_clips.OUTPUT_FILE, json.dumps(clips, ensure_ascii=False, separators=(',', ':')))
 
-    return {
-        'default': de_stats,  # 4p_de corresponds to default
-        'nb': nb_stats        # 4p_nb corresponds to nb
-    }
+    print(f"Generated {video_clips.OUTPUT_FILE} with clips for {len(clips)} cards")
+    return clips
 
-def step9_generate_card_all_json(stats_data):
-    """Step 9: Generate card_all.json from index.csv with statistics and cards_export.json"""
-    print("Step 9: Generating card_all.json from index.csv...")
+def generate_translations(records):
+    """Generate translations_zh.json, the enDesc translations assembled from the
+    sentences of translation_memory.jsonl for cards without a current enDesc_trans2zh
+    (none in cards_export.json, or one made from an earlier enDesc)
+    """
+    print(f"Generating {translation_memory.OUTPUT_FILE}...")
+
+    memory = translation_memory.TranslationMemory(translation_memory.MEMORY_FILE)
+    sources = translation_memory.export_sources(translation_memory.read_export(translation_memory.EXPORT_FILE))
+    translations, pending = translation_memory.build_translations(records, memory, sources)
+    write_output(translation_memory.OUTPUT_FILE, json.dumps(translations, ensure_ascii=False, indent=2))
+
+    print(f"Generated {translation_memory.OUTPUT_FILE} with {len(translations)} translations "
+          f"from {len(memory.entries)} memorized sentences")
+    stale = translation_memory.stale_records(records, sources)
+    if stale:
+        print(f"  {len(stale)} exported translations made from an earlier enDesc: {', '.join(stale[:10])}")
+    if pending:
+        print(f"  {len(pending)} sentences not translated yet (python translation_memory.py translate)")
+    return {no: translation['text'] for no, translation in translations.items()}
+
+def generate_card_aliases(cards):
+    """Generate card_aliases.json, every normalized card name (BGA names from
+    bga卡牌名.xlsx, cnName, enName, jpName) mapped to its no
+    """
+    print(f"Generating {card_aliases.OUTPUT_FILE}...")
 
-    # Load cards_export.json for merging enDesc_trans2zh and jpwiki_score
-    cards_export_map = {}
+    bga_names = []
     try:
-        cards_export_data = read_json_file('cards_export.json')
-        for item in cards_export_data:
-            card_id = item.get('id', '').strip()
-            if card_id:
-                cards_export_map[card_id] = {
-                    'enDesc_trans2zh': item.get('enDesc_trans2zh', ''),
-                    'jpwiki_score': item.get('jpwiki_score', '')
-                }
-        print(f"Loaded {len(cards_export_map)} entries from cards_export.json")
-    except FileNotFoundError:
-        print("Warning: cards_export.json not found, skipping merge")
-    except Exception as e:
-        print(f"Warning: Error loading cards_export.json: {e}, skipping merge")
+        bga_names = source_cache.load_cached(card_aliases.BGA_NAMES_FILE, card_aliases.parse_bga_names)
+    except ImportError as e:
+        print(f"Warning: Cannot read {card_aliases.BGA_NAMES_FILE} ({e}), using card names only")
+    except (OSError, ValueError) as e:
+        print(f"Warning: Error reading {card_aliases.BGA_NAMES_FILE}: {e}, using card names only")
 
-    cards = []
-    matched_default = 0
-    matched_nb = 0
-    matched_cards_export = 0
+    aliases, conflicts = card_aliases.build_aliases(cards, bga_names)
+    write_output(card_aliases.OUTPUT_FILE, json.dumps(aliases, ensure_ascii=False, separators=(',', ':')))
 
-    with open('index.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            card = {
-                'no': row.get('no', ''),
-                'cnName': row.get('cnName', ''),
-                'enName': row.get('enName', ''),
-                'desc': row.get('effect', ''),
-                'baituTier': row.get('baituTier', ''),
-                'enTier': row.get('enTier', ''),
-                'chenTier': row.get('chenTier', ''),
-                'jpName': row.get('jpName', ''),
-                'comment_jpwiki_cn': row.get('comment_jpwiki_cn', ''),
-                'baituDesc': row.get('baituDesc', ''),
-                'enDesc': row.get('enDesc', ''),
-                'chenDesc': row.get('chenDesc', '')
-            }
+    print(f"Generated {card_aliases.OUTPUT_FILE} with {len(aliases)} aliases "
+          f"({len(bga_names)} BGA names, {conflicts} names shared by several cards)")
 
-            # Match statistics by enName
-            en_name = row.get('enName', '').strip()
-            stats = {}
+def generate_card_bundles(cards):
+    """Generate the bundles/ projections of card_all.json, one per target and
+    UI locale, and their manifest card_bundles.json
+    """
+    print("Generating card bundles...")
 
-            if en_name:
-                # Match default stats (from 4p_de)
-                if en_name in stats_data['default']:
-                    stats['default'] = stats_data['default'][en_name]
-                    matched_default += 1
+    bundles, manifest = card_bundles.build_bundles(cards)
+    for (target, locale), content in bundles.items():
+        os.makedirs(output_path(os.path.join(card_bundles.BUNDLE_DIR, target)), exist_ok=True)
+        write_output(os.path.join(card_bundles.BUNDLE_DIR, target, card_bundles.bundle_file(locale)), content)
+    write_output(os.path.join(card_bundles.BUNDLE_DIR, card_bundles.MANIFEST_FILE),
+                 json.dumps(manifest, ensure_ascii=False, indent=2))
+    # The clients' cards.json leaves the stats counts and intervals to card_stats.json
+    write_output(os.path.join(card_bundles.BUNDLE_DIR, card_bundles.FALLBACK_FILE),
+                 json.dumps(card_bundles.fallback_cards(cards), ensure_ascii=False, indent=2))
+    write_output(os.path.join(card_bundles.BUNDLE_DIR, card_bundles.STATS_DETAIL_FILE),
+                 card_bundles.dump_bundle(card_bundles.stats_detail(cards)))
 
-                # Match nb stats (from 4p_nb)
-                if en_name in stats_data['nb']:
-                    stats['nb'] = stats_data['nb'][en_name]
-                    matched_nb += 1
+    full_size = len(card_bundles.dump_bundle(cards).encode('utf-8'))
+    print(f"Generated {len(bundles)} card bundles:")
+    for target, entry in manifest.items():
+        for locale, bundle in entry['bundles'].items():
+            print(f"  {target} {locale}: {bundle['bytes']} bytes ({bundle['bytes'] / full_size:.0%} of all fields)")
 
-            # Only add stats if we have at least one match
-            if stats:
-                card['stats'] = stats
+def generate_text_index(cards):
+    """Generate card_text_index.json, the full-text index over the card text fields"""
+    print(f"Generating {text_index.INDEX_FILE}...")
 
-            # Match cards_export.json by no (id)
-            no = row.get('no', '').strip()
-            if no and no in cards_export_map:
-                card['enDesc_trans2zh'] = cards_export_map[no]['enDesc_trans2zh']
-                card['jpwiki_score'] = cards_export_map[no]['jpwiki_score']
-                matched_cards_export += 1
+    index = text_index.build_text_index(cards)
+    write_output(text_index.INDEX_FILE, json.dumps(index, ensure_ascii=False, separators=(',', ':')))
 
-            cards.append(card)
+    term_count = sum(len(field['terms']) for field in index['fields'].values())
+    print(f"Generated {text_index.INDEX_FILE}: {term_count} terms over {len(index['fields'])} fields")
 
-    with open('card_all.json', 'w', encoding='utf-8') as f:
-        json.dump(cards, f, ensure_ascii=False, indent=2)
+def generate_similar_cards(records):
+    """Generate similar_cards.json, the nearest neighbours of each card by effect text"""
+    print(f"Generating {similar_cards.OUTPUT_FILE}...")
 
-    print(f"Generated card_all.json with {len(cards)} entries")
-    print(f"Matched {matched_default} entries with default stats (4p_de)")
-    print(f"Matched {matched_nb} entries with nb stats (4p_nb)")
-    print(f"Matched {matched_cards_export} entries with cards_export.json")
+    similar = similar_cards.build_similar_cards(records)
+    write_output(similar_cards.OUTPUT_FILE, json.dumps(similar, ensure_ascii=False, separators=(',', ':')))
 
-def step10_generate_index_missing():
-    """Step 10: Generate index_missing.csv with rows where cnName is empty"""
-    print("Step 10: Generating index_missing.csv...")
+    print(f"Generated {similar_cards.OUTPUT_FILE} with neighbours for {len(similar)} cards")
 
-    missing_rows = []
-    columns = ['no', 'cnName', 'enName', 'baituTier', 'enTier', 'chenTier', 'jpName', 'comment_jpwiki_cn', 'effect', 'baituDesc', 'enDesc', 'chenDesc']
+def generate_index_missing(rows):
+    """Generate index_missing.csv with rows where cnName is empty"""
+    print("Generating index_missing.csv...")
 
-    with open('index.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            cn_name = row.get('cnName', '').strip()
-            if not cn_name:
-                missing_rows.append(row)
+    missing_rows = [row for row in rows if not row.get('cnName', '').strip()]
 
-    with open('index_missing.csv', 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=columns)
-        writer.writeheader()
-        writer.writerows(missing_rows)
+    write_csv_output('index_missing.csv', missing_rows)
 
     print(f"Generated index_missing.csv with {len(missing_rows)} rows (cnName is empty)")
 
-def step11_sync_card_all_json():
-    """Step 11: Sync card_all.json to plugin-v1, plugin-v2, and web directories"""
-    print("Step 11: Syncing card_all.json to target directories...")
+# Metrics ranked by generate_card_rankings, with True when a higher value is better
+RANKING_METRICS = [
+    ('pwr', True),
+    ('adp', False),
+    ('apr', False),
+    ('drawPlayRate', True)
+]
+
+def rank_group(entries, higher_is_better):
+    """Rank (no, value) entries best first
+    Returns (list of no in rank order, {no: percentile}) where percentile is an
+    integer 0-100 and 100 is the best card of the group. Ties share a percentile.
+    """
+    ordered = sorted(entries, key=lambda x: (-x[1] if higher_is_better else x[1], x[0]))
+    total = len(ordered)
+    percentiles = {}
+    rank = 0
+    for i, (no, value) in enumerate(ordered):
+        if i > 0 and value != ordered[i - 1][1]:
+            rank = i
+        percentiles[no] = round(100 * (total - 1 - rank) / (total - 1)) if total > 1 else 100
+    return [no for no, _ in ordered], percentiles
+
+def generate_card_rankings(cards, pk_data):
+    """Generate card_rankings.json with percentile ranks and rank lists
+    For each stats snapshot and metric, cards are ranked over all cards, per deck
+    and per card type (from the Database CSV).
+    """
+    print("Generating card_rankings.json...")
 
-    # Get the script directory and project root
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
+    type_map = {item['no']: item.get('type', '') for item in pk_data}
 
-    # Source file path
-    source_file = os.path.join(script_dir, 'card_all.json')
+    rankings = {
+        'metrics': [metric for metric, _ in RANKING_METRICS],
+        'snapshots': {}
+    }
 
-    # Target file paths
-    targets = [
-        os.path.join(project_root, 'plugin-v1', 'cards.json'),
-        os.path.join(project_root, 'plugin-v2', 'assets', 'cards.json'),
-        os.path.join(project_root, 'web', 'public', 'cards.json')
-    ]
+    for snapshot in ['default', 'nb']:
+        # group name -> metric -> [(no, value)]
+        groups = defaultdict(lambda: defaultdict(list))
+        # no -> {'all': 'all', 'deck': 'deck:A', 'type': 'type:Occupation'}
+        card_groups = {}
 
-    # Check if source file exists
-    if not os.path.exists(source_file):
-        print(f"Error: Source file {source_file} does not exist!")
-        return
+        for card in cards:
+            stats = card.get('stats', {}).get(snapshot)
+            if not stats:
+                continue
+            no = card['no']
+            card_type = type_map.get(no, '')
+            card_groups[no] = {
+                'all': 'all',
+                'deck': f"deck:{no.rstrip('0123456789')}",
+                'type': f"type:{card_type}" if card_type else None
+            }
+            for metric, _ in RANKING_METRICS:
+                value = stats.get(metric)
+                if value is None:
+                    continue
+                for group in card_groups[no].values():
+                    if group:
+                        groups[group][metric].append((no, value))
+
+        lists = {}
+        group_percentiles = {}
+        for group, metrics in groups.items():
+            lists[group] = {}
+            group_percentiles[group] = {}
+            for metric, higher_is_better in RANKING_METRICS:
+                ordered, percentiles = rank_group(metrics.get(metric, []), higher_is_better)
+                lists[group][metric] = ordered
+                group_percentiles[group][metric] = percentiles
+
+        # Per card: scope -> one percentile per metric (None when the card has no value)
+        percentiles = {}
+        for no, scopes in card_groups.items():
+            percentiles[no] = {
+                scope: [group_percentiles[group][metric].get(no) for metric, _ in RANKING_METRICS]
+                for scope, group in scopes.items() if group
+            }
 
-    # Copy to each target location
-    copied_count = 0
-    for target in targets:
-        try:
-            # Create target directory if it doesn't exist
-            target_dir = os.path.dirname(target)
-            os.makedirs(target_dir, exist_ok=True)
-
-            # Copy the file
-            shutil.copy2(source_file, target)
-            copied_count += 1
-            print(f"  Copied to: {target}")
-        except Exception as e:
-            print(f"  Error copying to {target}: {e}")
+        rankings['snapshots'][snapshot] = {
+            'rankings': lists,
+            'percentiles': percentiles
+        }
+        print(f"Ranked {len(percentiles)} cards in {len(lists)} groups for {snapshot} stats")
 
-    print(f"Successfully synced card_all.json to {copied_count}/{len(targets)} locations")
+    write_output('card_rankings.json', json.dumps(rankings, ensure_ascii=False, separators=(',', ':')))
 
-def main():
-    # Step 1: Create pk.json
-    pk_data = step1_create_pk()
+    print("Generated card_rankings.json")
+    return rankings
 
-    # Step 2: Match cards.json
-    pk_data = step2_match_cards_json(pk_data)
+def generate_wheel_probabilities(cards, pk_data):
+    """Generate wheel_probabilities.json, the simulated availability of each card per pick"""
+    print(f"Generating {draft_simulator.OUTPUT_FILE}...")
 
-    # Step 3: Match e.csv
-    pk_data = step3_match_e_csv(pk_data)
+    # The simulation takes seconds; keep the previous output while the ADP
+    # inputs it was simulated from are unchanged
+    digest = draft_simulator.inputs_digest(cards, pk_data)
+    try:
+        with open(output_path(draft_simulator.OUTPUT_FILE), 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    except (FileNotFoundError, ValueError):
+        previous = {}
+    if previous.get('inputs') == digest:
+        print(f"Kept {draft_simulator.OUTPUT_FILE}: stats snapshots unchanged")
+        return
 
-    # Step 4: Match en.json
-    pk_data = step4_match_en_json(pk_data)
+    result = draft_simulator.build_wheel_probabilities(cards, pk_data)
+    write_output(draft_simulator.OUTPUT_FILE, json.dumps(result, ensure_ascii=False, separators=(',', ':')))
 
-    # Step 4.5: Match even_more_set_minor_improvements.json
-    pk_data, even_more_set_items = step4_5_match_even_more_set(pk_data)
+    for snapshot, spec in result['formats'].items():
+        print(f"Simulated {spec['drafts']} drafts of {snapshot} stats ({spec['dealt']} dealt, {spec['picks']} picks) "
+              f"for {len(result['cards'][snapshot])} cards")
+    print(f"Generated {draft_simulator.OUTPUT_FILE}")
 
-    pk_data = step5_match_jp_jsonl(pk_data)
+def build_parser(add_help=True, roots=True):
+    """Options of generate_index.py
+    cli.py uses the parser as the parent of its build subcommand
+    (add_help=False, and roots=False since the roots are global options there).
+    """
+    parser = argparse.ArgumentParser(description='Generate index.csv and card_all.json from the data sources',
+                                     add_help=add_help)
+    parser.add_argument('--strict', action='store_true',
+                        help='Stop before building if source validation finds any error')
+    parser.add_argument('--fail-on', choices=validate_sources.SEVERITIES,
+                        help='Stop before building if source validation finds an issue at this severity or above')
+    parser.add_argument('--no-cache', action='store_true', help='Parse every source from scratch')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Worker processes for loading sources (default: all cores, 1 runs serially)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running, and rebuild whenever a source file changes')
+    parser.add_argument('--interval', type=float, default=0.3, help='Polling interval of --watch in seconds')
+    if roots:
+        parser.add_argument('--input-root', default=SCRIPT_DIR, help='Directory of the source files (default: scripts/)')
+        parser.add_argument('--output-root', help='Directory the outputs are written to (default: the input root)')
+    return parser
+
+def run_pipeline(jobs=None, use_cache=True):
+    """Load, join and write every output"""
+    check_registry(SOURCES)
+
+    # Load every source in parallel
+    loaded = load_sources(jobs, use_cache)
+    return build_outputs(loaded, jobs)
+
+def join_sources(loaded, jobs=None):
+    """Join the loaded sources onto the base records and write index_raw.csv
+    and index.csv
+    Returns (base records, [(index.csv row, record)] of the kept records).
+    """
+    # Base records from the Database CSVs (pk.json)
+    pk_data = build_base_records(loaded[BASE_SOURCE['name']])
+
+    # Joins before filtering, in dependency order
+    print("Joining sources...")
+    merge_specs = [spec for spec in SOURCES if spec.get('stage', 'merge') == 'merge']
+    matched = run_joins(pk_data, merge_specs, loaded, jobs)
+
+    keep = set()
+    for spec in merge_specs:
+        if spec.get('keep') and spec['name'] in matched:
+            keep |= matched[spec['name']]
+
+    # index_raw.csv and the filtered rows of index.csv
+    filtered = generate_index_csv(pk_data, keep)
+
+    # Joins on the filtered rows only
+    index_specs = [spec for spec in SOURCES if spec.get('stage') == 'index']
+    rows = [row for row, _ in filtered]
+    run_joins(rows, index_specs, loaded, jobs)
+    write_index_csv(rows)
+    return pk_data, filtered
+
+def build_outputs(loaded, jobs=None):
+    """Join the loaded sources and write every output"""
+    pk_data, filtered = join_sources(loaded, jobs)
+    rows = [row for row, _ in filtered]
+
+    # Each derived stage only runs again when what it reads changed
+    names = [(record['no'], record.get('cnName'), record.get('enName')) for record in pk_data]
+    translated = [record for _, record in filtered]
+    extras = {
+        'videoClips': run_stage(
+            'video_clips', generate_video_clips, pk_data, key=names,
+            files=[path for video in video_clips.VIDEOS for path in (video['srt'], video['reviews'])]
+        ),
+        'statsTrend': run_stage('stats_trends', generate_stats_trends, pk_data, key=names,
+                                files=stats_history_files()),
+        'synergy': run_stage('synergy', generate_synergy, pk_data,
+                             key=(names, file_stamps(game_log_files()))),
+        # Fallback for the cards without a current enDesc_trans2zh in cards_export.json
+        'enDesc_trans2zh': run_stage(
+            'translations', generate_translations, translated,
+            key=[(record['no'], record.get('enDesc'), record.get('enDesc_trans2zh')) for record in translated],
+            files=[translation_memory.MEMORY_FILE, translation_memory.EXPORT_FILE]
+        )
+    }
+    cards = generate_card_all_json(filtered, extras)
+    stats = ([(card['no'], card.get('stats')) for card in cards],
+             [(record['no'], record.get('type')) for record in pk_data])
+    run_stage('card_aliases', generate_card_aliases, cards,
+              key=[[card.get(field) for field in ['no', 'cnName', 'enName', 'jpName']] for card in cards],
+              files=[card_aliases.BGA_NAMES_FILE])
+    run_stage('card_bundles', generate_card_bundles, cards)
+    run_stage('text_index', generate_text_index, cards,
+              key=[[card.get(field) for field in ['no'] + text_index.TEXT_FIELDS] for card in cards])
+    # Neighbours only among the cards the clients get
+    card_nos = {card['no'] for card in cards}
+    shipped = [record for record in pk_data if record['no'] in card_nos]
+    run_stage('similar_cards', generate_similar_cards, shipped,
+              key=[(record['no'], record.get('effect')) for record in shipped])
+    generate_index_missing(rows)
+    run_stage('card_rankings', generate_card_rankings, cards, pk_data, key=stats)
+    run_stage('wheel_probabilities', generate_wheel_probabilities, cards, pk_data, key=stats)
+
+    # Sync cards.json and the other build artifacts to plugin-v1, plugin-v2, and web directories
+    sync_artifacts.sync_artifacts(OUTPUT_DIR)
+
+    return cards
+
+def source_mtimes():
+    """Return {source name: tuple of file mtimes (None for missing files)}"""
+    mtimes = {}
+    for spec in [BASE_SOURCE] + SOURCES:
+        stamps = []
+        for filepath in source_files(spec):
+            try:
+                stamps.append(os.stat(filepath).st_mtime_ns)
+            except FileNotFoundError:
+                stamps.append(None)
+        mtimes[spec['name']] = tuple(stamps)
+    # An explicit stats_history.py ingest also counts as a stage input change
+    mtimes['stage_inputs'] = tuple(file_stamps(stage_input_files() + stats_history_files()))
+    return mtimes
+
+def reload_sources(loaded, changed, use_cache=True):
+    """Parse the changed sources (names of source_mtimes) again into loaded
+    Returns False if a required source could not be read; its previous rows
+    are kept.
+    """
+    ok = True
+    for name in changed:
+        if name == 'stage_inputs':
+            print("Stage inputs changed")
+            continue
+        spec = BASE_SOURCE if name == BASE_SOURCE['name'] else next(s for s in SOURCES if s['name'] == name)
+        try:
+            loaded[name] = load_source(name, use_cache)
+            print(f"Reloaded {', '.join(source_files(spec))}")
+        except Exception as e:
+            if spec.get('optional'):
+                print(f"Warning: Error reading {spec['file']}: {e}, skipping {name}")
+                loaded[name] = None
+            else:
+                # Usually a file caught mid-save; keep the previous data, the caller retries on the next poll
+                print(f"Error reading {', '.join(source_files(spec))}: {e}, keeping previous data")
+                ok = False
+    return ok
+
+def watch(jobs=None, use_cache=True, interval=0.3):
+    """Build once, then rebuild whenever a source file changes
+    Parsed sources stay in memory and only the changed files are parsed
+    again. The joins are then replayed in memory from the parsed sources
+    (milliseconds), because re-applying one join on top of the previous
+    result would break the priority order between sources. The derived
+    stages only run again when their own inputs changed (run_stage).
+    """
+    check_registry(SOURCES)
+    loaded = load_sources(jobs, use_cache)
+    build_outputs(loaded, jobs)
+    mtimes = source_mtimes()
+    print(f"\nWatching {len(all_source_files())} source files (Ctrl+C to stop)...")
+
+    while True:
+        time.sleep(interval)
+        current = source_mtimes()
+        changed = [name for name, stamps in current.items() if stamps != mtimes[name]]
+        if not changed:
+            continue
+
+        start = time.perf_counter()
+        if not reload_sources(loaded, changed, use_cache):
+            # Keep the old stamps so the broken source is read again on the next poll
+            continue
+        mtimes = current
+        build_outputs(loaded, jobs)
+        print(f"Rebuilt in {(time.perf_counter() - start) * 1000:.0f} ms")
 
-    # Step 8: Load statistics from TSV files (needed before filtering)
-    stats_data = step8_load_statistics()
+def main(argv=None):
+    run(build_parser().parse_args(argv))
 
-    # Step 5: Generate index_raw.csv and filtered index.csv
-    # Pass even_more_set_items and stats_data for filtering logic
-    generate_index_csv(pk_data, even_more_set_items, stats_data)
+def validate(fail_on=None):
+    """Validate the sources (writes validation_report.json, exits at fail_on)"""
+    print("Validating sources...")
+    return validate_sources.run_validation('.', output_path('validation_report.json'), fail_on)
 
-    # Step 7: Match set_o.json and update index.csv
-    step7_match_set_o_json()
+def run(args):
+    """Validate the sources and build (or watch) with the options of build_parser"""
+    source_cache.enabled = not args.no_cache
+    set_roots(args.input_root, args.output_root)
 
-    # Step 9: Generate card_all.json from index.csv with statistics
-    step9_generate_card_all_json(stats_data)
+    validate(args.fail_on or ('error' if args.strict else None))
 
-    # Step 10: Generate index_missing.csv with rows where cnName is empty
-    step10_generate_index_missing()
+    if args.watch:
+        try:
+            watch(args.jobs, not args.no_cache, args.interval)
+        except KeyboardInterrupt:
+            pass
+        return
 
-    # Step 11: Sync card_all.json to plugin-v1, plugin-v2, and web directories
-    step11_sync_card_all_json()
+    run_pipeline(args.jobs, not args.no_cache)
 
-    print("\nDone! Generated index_raw.csv, index.csv, card_all.json, index_missing.csv, and synced cards.json to target directories")
+    print("\nDone! Generated index_raw.csv, index.csv, video_clips.json, translations_zh.json, card_all.json, card_aliases.json, bundles/, card_text_index.json, similar_cards.json, index_missing.csv, card_rankings.json, wheel_probabilities.json, and synced cards.json, the card bundles and card_aliases.json to target directories")
 
 if __name__ == '__main__':
     main()
-
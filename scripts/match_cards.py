@@ -11,21 +11,10 @@
 import json
 import os
 
-def match_cards():
-    # 读取文件路径
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    set_o_path = os.path.join(script_dir, 'set_o.json')
-    card_all_path = os.path.join(script_dir, 'card_all.json')
+import source_cache
 
-    # 读取 set_o.json
-    with open(set_o_path, 'r', encoding='utf-8') as f:
-        set_o_data = json.load(f)
-
-    # 读取 card_all.json
-    with open(card_all_path, 'r', encoding='utf-8') as f:
-        card_all_data = json.load(f)
-
-    # 创建索引：先按 cnName 索引，再按 enName 索引
+def project_name_maps(card_all_data):
+    """创建索引：cnName -> no 和 enName -> no"""
     cn_name_map = {}
     en_name_map = {}
 
@@ -39,6 +28,21 @@ def match_cards():
         if en_name:
             en_name_map[en_name] = no
 
+    return cn_name_map, en_name_map
+
+def match_cards(set_o_path=None, card_all_path=None):
+    # 读取文件路径（默认为脚本目录下的文件）
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    set_o_path = set_o_path or os.path.join(script_dir, 'set_o.json')
+    card_all_path = card_all_path or os.path.join(script_dir, 'card_all.json')
+
+    # 读取 set_o.json
+    with open(set_o_path, 'r', encoding='utf-8') as f:
+        set_o_data = json.load(f)
+
+    # 读取 card_all.json 并创建索引：先按 cnName 索引，再按 enName 索引（经解析缓存）
+    cn_name_map, en_name_map = source_cache.load_json(card_all_path, project_name_maps)
+
     # 为 set_o.json 中的每个条目添加 no 字段
     matched_count = 0
     unmatched_names = []
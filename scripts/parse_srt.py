@@ -3,36 +3,63 @@
 """
 解析SRT文件，提取卡牌讨论段落
 """
+import argparse
 import re
 import json
 
-def parse_srt_to_segments(srt_file):
-    """将SRT文件解析为段落"""
+# 时间格式: H:M:S,小数秒（省略末尾的 0，例如 0:1:37,28 为 37.28 秒，1:39:28,8 为 28.8 秒）
+TIME_PATTERN = r'(\d+):(\d+):(\d+),(\d+)'
+
+def timestamp_to_ms(hours, minutes, seconds, fraction):
+    """fraction 为逗号后的小数位（'8' -> 800 毫秒，'28' -> 280 毫秒）"""
+    milliseconds = int(str(fraction).ljust(3, '0')[:3])
+    return ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + milliseconds
+
+def parse_cues(srt_file):
+    """将SRT文件解析为字幕条目列表: {'seq', 'start_ms', 'end_ms', 'time', 'text'}
+    time 为 H:M:S 格式的开始时间（与 set_o.json 的 time 字段一致）
+    """
     with open(srt_file, 'r', encoding='utf-8') as f:
         content = f.read()
 
+    cues = []
     # 按双换行分割
-    blocks = content.strip().split('\n\n')
-
-    segments = []
-    current_segment = None
-
-    for block in blocks:
+    for block in content.strip().split('\n\n'):
         lines = block.strip().split('\n')
         if len(lines) < 3:
             continue
 
-        seq_num = lines[0]
         time_line = lines[1]
-        text = '\n'.join(lines[2:]).strip()
-
-        # 提取时间
-        time_match = re.match(r'(\d+):(\d+):(\d+),(\d+)', time_line)
-        if time_match:
-            hours, minutes, seconds, milliseconds = time_match.groups()
+        times = re.findall(TIME_PATTERN, time_line)
+        if times:
+            hours, minutes, seconds, _ = times[0]
             time_str = f"{hours}:{minutes}:{seconds}"
+            start_ms = timestamp_to_ms(*times[0])
+            # 个别条目的结束时间早于开始时间（字幕文件笔误），按开始时间截断
+            end_ms = max(timestamp_to_ms(*times[-1]), start_ms)
         else:
             time_str = time_line
+            start_ms = end_ms = None
+
+        cues.append({
+            'seq': lines[0],
+            'start_ms': start_ms,
+            'end_ms': end_ms,
+            'time': time_str,
+            'text': '\n'.join(lines[2:]).strip()
+        })
+
+    return cues
+
+def parse_srt_to_segments(srt_file):
+    """将SRT文件解析为段落"""
+    segments = []
+    current_segment = None
+
+    for cue in parse_cues(srt_file):
+        seq_num = cue['seq']
+        time_str = cue['time']
+        text = cue['text']
 
         # 检查是否是新的卡牌讨论开始（包含"第X张卡"、"这张卡"等关键词）
         if re.search(r'(第[一二三四五六七八九十\d]+张卡|这张卡|接着|然后)', text):
@@ -41,12 +68,15 @@ def parse_srt_to_segments(srt_file):
             current_segment = {
                 'start_time': time_str,
                 'start_seq': seq_num,
+                'start_ms': cue['start_ms'],
+                'end_ms': cue['end_ms'],
                 'texts': [text]
             }
         elif current_segment:
             current_segment['texts'].append(text)
             current_segment['end_time'] = time_str
             current_segment['end_seq'] = seq_num
+            current_segment['end_ms'] = cue['end_ms']
 
     if current_segment:
         segments.append(current_segment)
@@ -87,14 +117,18 @@ def extract_card_info(segments):
 
     return cards
 
-if __name__ == '__main__':
-    srt_file = '待处理文件/even more set 职业_1.srt'
-    segments = parse_srt_to_segments(srt_file)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='解析SRT文件，提取卡牌讨论段落')
+    parser.add_argument('srt_file', nargs='?', default='even more set 职业_1.srt', help='SRT文件路径')
+    parser.add_argument('--output', default='segments.json', help='段落输出文件')
+    args = parser.parse_args(argv)
+
+    segments = parse_srt_to_segments(args.srt_file)
 
     print(f"找到 {len(segments)} 个段落")
 
     # 保存段落信息供人工检查
-    with open('segments.json', 'w', encoding='utf-8') as f:
+    with open(args.output, 'w', encoding='utf-8') as f:
         json.dump(segments, f, ensure_ascii=False, indent=2)
 
     # 尝试提取卡牌信息
@@ -104,3 +138,5 @@ if __name__ == '__main__':
     for i, card in enumerate(cards[:10], 1):  # 只显示前10个
         print(f"{i}. {card['time']} - {card['name']} - {card['tier']}")
 
+if __name__ == '__main__':
+    main()
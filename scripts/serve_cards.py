@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local card query service over card_all.json
+
+Serves paged, filtered and sorted card queries from in-memory indexes and
+hot-reloads when the served file changes. With --rebuild the pipeline
+inputs are watched too and the outputs rebuilt in process, the way
+generate_index.py --watch does: only the changed sources are parsed again
+and only the stages whose inputs changed run.
+
+Usage:
+    python serve_cards.py [--port 8787] [--rebuild]
+
+Endpoints:
+    GET /cards?deck=A&tier_source=baitu&tier=T1&stats=default
+              &min_pwr=2&max_adp=3.5&prefix=lov&sort=pwr&order=desc
+              &page=1&page_size=50
+    GET /cards/<no>
+    GET /health
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import card_library
+import generate_index
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class CardService:
+    """Holds the current CardStore and swaps it when watched files change"""
+
+    def __init__(self, cards_path, rebuild=False, interval=1.0):
+        self.cards_path = cards_path
+        self.rebuild = rebuild
+        self.interval = interval
+        if rebuild:
+            generate_index.set_roots(SCRIPT_DIR)
+            generate_index.check_registry(generate_index.SOURCES)
+            generate_index.validate()
+            self.loaded = generate_index.load_sources()
+            self.source_mtimes = generate_index.source_mtimes()
+        self.store = card_library.CardStore.load(cards_path)
+        self.loaded_at = time.time()
+        self.mtime = self._cards_mtime()
+
+    def _cards_mtime(self):
+        try:
+            return os.stat(self.cards_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def rebuild_changed(self):
+        """Rebuild the outputs if a pipeline input changed"""
+        current = generate_index.source_mtimes()
+        changed = [name for name, stamps in current.items() if stamps != self.source_mtimes[name]]
+        if not changed:
+            return
+
+        print(f"Source changed: {', '.join(changed)}, rebuilding...")
+        start = time.perf_counter()
+        if not generate_index.reload_sources(self.loaded, changed):
+            # Keep the old stamps so the broken source is read again on the next poll
+            return
+        self.source_mtimes = current
+        try:
+            generate_index.validate()
+            generate_index.build_outputs(self.loaded)
+            print(f"Rebuilt in {(time.perf_counter() - start) * 1000:.0f} ms")
+        except Exception:
+            traceback.print_exc()
+            print("Warning: Rebuild failed, keeping previous data")
+
+    def check_reload(self):
+        """Reload the store if the served file changed (rebuilding it first
+        when --rebuild inputs changed). Returns True on reload
+        """
+        if self.rebuild:
+            self.rebuild_changed()
+
+        mtime = self._cards_mtime()
+        if mtime == self.mtime:
+            return False
+
+        try:
+            store = card_library.CardStore.load(self.cards_path)
+        except (OSError, ValueError) as e:
+            # The file may be half-written; retry on the next poll
+            print(f"Warning: Could not reload {self.cards_path}: {e}")
+            return False
+
+        self.store = store
+        self.loaded_at = time.time()
+        self.mtime = mtime
+        print(f"Reloaded {len(store.cards)} cards")
+        return True
+
+    def watch(self):
+        while True:
+            time.sleep(self.interval)
+            self.check_reload()
+
+
+def parse_float(params, name):
+    value = params.get(name, [''])[0]
+    return float(value) if value else None
+
+
+def make_handler(service):
+    class CardRequestHandler(BaseHTTPRequestHandler):
+        def send_json(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            store = service.store
+
+            if url.path == '/health':
+                self.send_json(200, {'cards': len(store.cards), 'loadedAt': service.loaded_at})
+                return
+
+            if url.path.startswith('/cards/'):
+                card = store.get(url.path[len('/cards/'):])
+                if card is None:
+                    self.send_json(404, {'error': 'card not found'})
+                else:
+                    self.send_json(200, card)
+                return
+
+            if url.path != '/cards':
+                self.send_json(404, {'error': 'not found'})
+                return
+
+            params = parse_qs(url.query)
+            try:
+                ranges = {}
+                for metric in card_library.STAT_METRICS:
+                    low = parse_float(params, f'min_{metric}')
+                    high = parse_float(params, f'max_{metric}')
+                    if low is not None or high is not None:
+                        ranges[metric] = (low, high)
+
+                page = max(int(params.get('page', ['1'])[0]), 1)
+                page_size = min(max(int(params.get('page_size', [str(DEFAULT_PAGE_SIZE)])[0]), 1), MAX_PAGE_SIZE)
+                snapshot = params.get('stats', ['default'])[0]
+                if snapshot not in card_library.SNAPSHOTS:
+                    raise ValueError(f"Unknown stats snapshot: {snapshot}")
+
+                total, items = store.query(
+                    deck=params.get('deck', [None])[0],
+                    tier_source=params.get('tier_source', [None])[0],
+                    tier=params.get('tier', [None])[0],
+                    snapshot=snapshot,
+                    ranges=ranges,
+                    prefix=params.get('prefix', [None])[0],
+                    sort=params.get('sort', ['no'])[0],
+                    order=params.get('order', ['asc'])[0],
+                    page=page,
+                    page_size=page_size
+                )
+            except ValueError as e:
+                self.send_json(400, {'error': str(e)})
+                return
+
+            self.send_json(200, {'total': total, 'page': page, 'pageSize': page_size, 'items': items})
+
+        def log_message(self, format, *args):
+            pass
+
+    return CardRequestHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve card queries from card_all.json')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--cards', default=os.path.join(SCRIPT_DIR, 'card_all.json'),
+                        help='Card file to serve (default: card_all.json)')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Also watch pipeline inputs and rebuild the outputs when they change')
+    parser.add_argument('--interval', type=float, default=1.0, help='Polling interval in seconds')
+    args = parser.parse_args()
+
+    service = CardService(os.path.abspath(args.cards), rebuild=args.rebuild, interval=args.interval)
+    print(f"Loaded {len(service.store.cards)} cards from {service.cards_path}")
+
+    threading.Thread(target=service.watch, daemon=True).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Serving on http://{args.host}:{args.port}/cards")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
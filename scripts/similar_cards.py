@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+"Similar cards" nearest-neighbour table from the rules text in pk.json
+
+Effect texts are turned into sparse TF-IDF vectors over words and word
+bigrams (sublinear tf, smoothed idf, L2-normalized), then the top-k cosine
+neighbours of every card are scored through an inverted index of the terms,
+so only the cards sharing a term with it are touched and memory stays at
+one score per card.
+
+Only the cards passed in are candidates: generate_index.py passes the
+cards of card_all.json, so no neighbour points at a card the clients lack.
+
+Usage:
+    python similar_cards.py [--top-k 10] [--output similar_cards.json]
+"""
+
+import argparse
+import json
+import os
+from collections import Counter
+
+import numpy as np
+
+import text_index
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+OUTPUT_FILE = 'similar_cards.json'
+
+TOP_K = 10
+# Neighbours below this cosine similarity are not worth showing
+MIN_SCORE = 0.1
+
+
+def effect_terms(effect):
+    """Words plus adjacent word pairs of an effect text"""
+    words = text_index.tokenize(effect)
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def tfidf_vectors(texts):
+    """Return the L2-normalized TF-IDF vectors of texts as {term: weight} dicts
+
+    Terms found in a single document cannot make two documents similar, so
+    they only count towards the vector norm and are left out of the vector.
+    """
+    counts = [Counter(effect_terms(text)) for text in texts]
+    doc_freq = Counter()
+    for terms in counts:
+        doc_freq.update(terms.keys())
+
+    n_docs = len(texts)
+    vectors = []
+    for terms in counts:
+        weights = {term: (1 + np.log(tf)) * (np.log((1 + n_docs) / (1 + doc_freq[term])) + 1)
+                   for term, tf in terms.items()}
+        norm = np.sqrt(sum(weight * weight for weight in weights.values()))
+        vectors.append({term: weight / norm for term, weight in weights.items() if doc_freq[term] > 1})
+
+    return vectors
+
+
+def top_k_neighbours(vectors, k=TOP_K):
+    """Yield (row, neighbour rows, scores) best first, excluding the row itself"""
+    n_docs = len(vectors)
+    k = min(k, n_docs - 1)
+    if k <= 0:
+        return
+
+    # term -> (rows having it, their weights)
+    postings = {}
+    for row, vector in enumerate(vectors):
+        for term, weight in vector.items():
+            postings.setdefault(term, ([], []))
+            postings[term][0].append(row)
+            postings[term][1].append(weight)
+    postings = {term: (np.array(rows), np.array(weights, dtype=np.float32))
+                for term, (rows, weights) in postings.items()}
+
+    scores = np.zeros(n_docs, dtype=np.float32)
+    for row, vector in enumerate(vectors):
+        scores[:] = 0
+        for term, weight in vector.items():
+            rows, weights = postings[term]
+            scores[rows] += weight * weights
+        scores[row] = -1
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        yield row, top, scores[top]
+
+
+def build_similar_cards(records, k=TOP_K, min_score=MIN_SCORE):
+    """Return {no: [[no, score], ...]} for pk.json records, best first"""
+    nos = [record.get('no', '') for record in records]
+    vectors = tfidf_vectors([record.get('effect', '') for record in records])
+
+    similar = {}
+    for row, neighbours, scores in top_k_neighbours(vectors, k):
+        pairs = [[nos[col], round(float(score), 3)]
+                 for col, score in zip(neighbours, scores) if score >= min_score]
+        if pairs:
+            similar[nos[row]] = pairs
+    return similar
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute similar cards from pk.json effect texts')
+    parser.add_argument('--input', default=os.path.join(SCRIPT_DIR, 'pk.json'))
+    parser.add_argument('--output', default=os.path.join(SCRIPT_DIR, OUTPUT_FILE))
+    parser.add_argument('--top-k', type=int, default=TOP_K)
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+
+    similar = build_similar_cards(records, args.top_k)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(similar, f, ensure_ascii=False, separators=(',', ':'))
+    print(f"Wrote neighbours of {len(similar)} cards to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content-addressed parse cache for the source files used by the scripts
+
+Each entry stores the already-parsed and already-projected result of a
+source file as a pickle under .cache/. The key is made from the file's
+content hash, the name of the function that produced the result and the
+source of the script files that function can reach (its own file and
+the modules of this directory it imports, transitively), so editing
+the source file, the projection or any helper it calls invalidates the
+entry.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import pickle
+import sys
+import types
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SCRIPT_DIR, '.cache')
+
+# Bump to drop every existing cache entry
+CACHE_VERSION = 4
+
+# Set to False (e.g. from a --no-cache flag) to always parse from scratch
+enabled = True
+
+# Script file -> content digest, see function_digest
+_source_digests = {}
+
+
+def file_digest(filepath):
+    """Return the sha256 hex digest of a file's content"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def local_sources(func):
+    """Return the script files of SCRIPT_DIR a function can reach: the file
+    defining it and, transitively, the script modules its globals refer to
+    (imported modules, and the modules of imported functions and classes)
+    """
+    found = set()
+    pending = [(func.__code__.co_filename, func.__globals__)]
+    while pending:
+        filepath, namespace = pending.pop()
+        filepath = os.path.abspath(filepath)
+        if filepath in found or os.path.dirname(filepath) != SCRIPT_DIR:
+            continue
+        found.add(filepath)
+        for value in list(namespace.values()):
+            if isinstance(value, (types.FunctionType, type)):
+                value = sys.modules.get(value.__module__)
+            if isinstance(value, types.ModuleType) and getattr(value, '__file__', None):
+                pending.append((value.__file__, vars(value)))
+    return sorted(found)
+
+
+def function_digest(func):
+    """Return a digest of a function's name and of the source of every
+    script file it can reach (see local_sources)
+    The source stands for the bytecode, which also records the path the
+    script was started by and would differ between entry points.
+    """
+    digest = hashlib.sha256(func.__qualname__.encode('utf-8'))
+    for filepath in local_sources(func):
+        # Digested once per process: the code that runs is the code imported
+        if filepath not in _source_digests:
+            _source_digests[filepath] = file_digest(filepath)
+        digest.update(_source_digests[filepath].encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _entry_prefix(filepath, name):
+    return os.path.join(CACHE_DIR, f"{os.path.basename(filepath)}.{name}.")
+
+
+def load_cached(filepath, parse, name=None, fingerprint=None, use_cache=None):
+    """Return parse(filepath), reusing a cached result for identical content
+
+    parse must be a plain function of the file path; its result must be
+    picklable. name defaults to the function name and fingerprint to
+    function_digest(parse). use_cache overrides the module-wide enabled.
+    """
+    if not (enabled if use_cache is None else use_cache):
+        return parse(filepath)
+
+    name = name or parse.__name__
+    fingerprint = fingerprint or function_digest(parse)
+    key = hashlib.sha256(
+        f"{CACHE_VERSION}:{file_digest(filepath)}:{fingerprint}".encode('utf-8')
+    ).hexdigest()[:32]
+    prefix = _entry_prefix(filepath, name)
+    cache_file = f"{prefix}{key}.pickle"
+
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        print(f"Warning: Ignoring unreadable cache entry {cache_file}: {e}")
+
+    result = parse(filepath)
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Drop stale entries for the same file and projection
+        for stale in glob.glob(f"{glob.escape(prefix)}*.pickle"):
+            os.remove(stale)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Warning: Could not write cache entry {cache_file}: {e}")
+
+    return result
+
+
+def read_json(filepath):
+    """Parse a JSON file"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_json(filepath, project=None):
+    """Load a JSON file through the cache, optionally projected
+
+    project receives the parsed JSON and returns the structure to keep
+    (e.g. a mapping with only the fields a step uses). It must be a
+    module-level function so it can be fingerprinted.
+    """
+    if project is None:
+        return load_cached(filepath, read_json)
+
+    def parse(path):
+        return project(read_json(path))
+
+    return load_cached(filepath, parse, name=project.__name__, fingerprint=function_digest(project))
+
+
+def clear_cache():
+    """Remove every cache entry"""
+    for entry in glob.glob(os.path.join(glob.escape(CACHE_DIR), '*.pickle')):
+        os.remove(entry)
@@ -59,10 +59,10 @@ def srt_to_txt(srt_file_path):
     return txt_file_path
 
 
-def main():
-    """Convert all SRT files in current directory."""
+def main(current_dir=None):
+    """Convert all SRT files in a directory (default: the script directory)."""
     # Get current directory
-    current_dir = os.path.dirname(os.path.abspath(__file__))
+    current_dir = current_dir or os.path.dirname(os.path.abspath(__file__))
 
     # Find all SRT files
     srt_files = glob.glob(os.path.join(current_dir, '*.srt'))
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Append-only columnar history of the card statistics snapshots
+
+Every ingested stats TSV becomes one dated snapshot of a stream ('default'
+for 4p_de.tsv, 'nb' for 4p_nb.tsv). A stream is stored under
+stats_history/<stream>/ as:
+    names.txt        card name dictionary, one name per line (id = line number)
+    snapshots.jsonl  one line per snapshot: date, file digest, first row, row count
+    <column>.bin     raw little-endian columns: snapshot and name ids (int32),
+                     one float64 column per metric (NaN when missing)
+Columns are appended before the snapshot line, so rows past the last
+snapshot line (an interrupted ingest) are ignored on load.
+
+Snapshots are only added by the ingest command; generate_index.py reads
+the history for the statsTrend of each card but never writes to it.
+
+Usage:
+    python stats_history.py ingest default 4p_de.tsv [--date 2025-01-31]
+    python stats_history.py snapshots default
+    python stats_history.py delta default --metric pwr --last 3 [--limit 20]
+    python stats_history.py movers default --metric adp --last 1
+"""
+
+import argparse
+import datetime
+import json
+import os
+
+import numpy as np
+
+import source_cache
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_DIR = os.path.join(SCRIPT_DIR, 'stats_history')
+SNAPSHOTS_FILE = 'snapshots.jsonl'
+
+METRICS = ['pwr', 'adp', 'apr', 'drawPlayRate']
+
+ID_DTYPE = np.dtype('<i4')
+VALUE_DTYPE = np.dtype('<f8')
+
+
+def stream_dir(stream, history_dir=HISTORY_DIR):
+    return os.path.join(history_dir, stream)
+
+
+def read_snapshots(directory):
+    snapshots = []
+    try:
+        with open(os.path.join(directory, SNAPSHOTS_FILE), 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    snapshots.append(json.loads(line))
+    except FileNotFoundError:
+        pass
+    return snapshots
+
+
+def read_names(directory):
+    try:
+        with open(os.path.join(directory, 'names.txt'), 'r', encoding='utf-8') as f:
+            return f.read().splitlines()
+    except FileNotFoundError:
+        return []
+
+
+def ingest(stream, stats, digest, date=None, history_dir=HISTORY_DIR):
+    """Append one snapshot of {card name: {metric: value}} to a stream
+
+    digest identifies the snapshot's content (e.g. the TSV file digest); a
+    snapshot already in the stream is not appended again, so re-ingesting a
+    reverted file is a no-op. Returns True if a snapshot was appended.
+    """
+    directory = stream_dir(stream, history_dir)
+    os.makedirs(directory, exist_ok=True)
+    snapshots = read_snapshots(directory)
+    if any(snapshot['digest'] == digest for snapshot in snapshots):
+        return False
+
+    names = read_names(directory)
+    name_ids = {name: idx for idx, name in enumerate(names)}
+    new_names = [name for name in stats if name not in name_ids]
+    if new_names:
+        with open(os.path.join(directory, 'names.txt'), 'a', encoding='utf-8') as f:
+            for name in new_names:
+                name_ids[name] = len(name_ids)
+                f.write(name + '\n')
+
+    rows = list(stats.items())
+    start = snapshots[-1]['start'] + snapshots[-1]['rows'] if snapshots else 0
+    columns = {
+        'snapshot': np.full(len(rows), len(snapshots), dtype=ID_DTYPE),
+        'name': np.array([name_ids[name] for name, _ in rows], dtype=ID_DTYPE)
+    }
+    for metric in METRICS:
+        columns[metric] = np.array(
+            [np.nan if values.get(metric) is None else values[metric] for _, values in rows],
+            dtype=VALUE_DTYPE
+        )
+
+    for column, values in columns.items():
+        filepath = os.path.join(directory, f"{column}.bin")
+        # Drop rows of an interrupted ingest before appending
+        itemsize = values.dtype.itemsize
+        if os.path.exists(filepath) and os.path.getsize(filepath) != start * itemsize:
+            with open(filepath, 'r+b') as f:
+                f.truncate(start * itemsize)
+        with open(filepath, 'ab') as f:
+            values.tofile(f)
+
+    with open(os.path.join(directory, SNAPSHOTS_FILE), 'a', encoding='utf-8') as f:
+        f.write(json.dumps({
+            'date': date or datetime.date.today().isoformat(),
+            'digest': digest,
+            'start': start,
+            'rows': len(rows)
+        }) + '\n')
+    return True
+
+
+class StatsHistory:
+    """Loaded columns of one stream plus vectorized trend queries"""
+
+    def __init__(self, stream, history_dir=HISTORY_DIR):
+        directory = stream_dir(stream, history_dir)
+        self.stream = stream
+        self.snapshots = read_snapshots(directory)
+        self.names = read_names(directory)
+        total = self.snapshots[-1]['start'] + self.snapshots[-1]['rows'] if self.snapshots else 0
+
+        self.columns = {}
+        for column in ['snapshot', 'name'] + METRICS:
+            dtype = ID_DTYPE if column in ('snapshot', 'name') else VALUE_DTYPE
+            filepath = os.path.join(directory, f"{column}.bin")
+            values = np.fromfile(filepath, dtype=dtype, count=total) if total else np.empty(0, dtype=dtype)
+            self.columns[column] = values
+
+    def matrix(self, metric, last=None):
+        """Return (snapshot indexes, snapshots x names matrix) of a metric, NaN where missing"""
+        count = len(self.snapshots)
+        first = max(count - last, 0) if last else 0
+        rows = self.columns['snapshot'] >= first
+        matrix = np.full((count - first, len(self.names)), np.nan)
+        matrix[self.columns['snapshot'][rows] - first, self.columns['name'][rows]] = self.columns[metric][rows]
+        return np.arange(first, count), matrix
+
+    def delta(self, metric, last=1):
+        """Change of a metric per name between the latest snapshot and `last` snapshots earlier
+        Returns an array over names (NaN where either value is missing), or None
+        with fewer than last + 1 snapshots.
+        """
+        if len(self.snapshots) <= last:
+            return None
+        _, matrix = self.matrix(metric, last + 1)
+        return matrix[-1] - matrix[0]
+
+    def movers(self, metric, last=1, limit=20):
+        """Return [(name, delta)] with the largest absolute change, biggest first"""
+        delta = self.delta(metric, last)
+        if delta is None:
+            return []
+        order = np.argsort(-np.nan_to_num(np.abs(delta), nan=-1), kind='stable')
+        return [(self.names[idx], float(delta[idx])) for idx in order[:limit] if not np.isnan(delta[idx])]
+
+    def trends(self, last=1):
+        """Return {name: {'since': date, metric: delta}} against `last` snapshots earlier"""
+        if len(self.snapshots) <= last:
+            return {}
+        since = self.snapshots[-1 - last]['date']
+        deltas = {metric: self.delta(metric, last) for metric in METRICS}
+        trends = {}
+        for idx, name in enumerate(self.names):
+            values = {metric: round(float(delta[idx]), 4) for metric, delta in deltas.items()
+                      if not np.isnan(delta[idx])}
+            if values:
+                trends[name] = {'since': since, **values}
+        return trends
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Append-only history of the card statistics snapshots')
+    parser.add_argument('--dir', default=HISTORY_DIR, help='History directory')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help='Append stats TSVs as snapshots, oldest first')
+    ingest_parser.add_argument('stream')
+    ingest_parser.add_argument('files', nargs='+')
+    ingest_parser.add_argument('--date', help='Snapshot date (default: today); only with a single file')
+
+    subparsers.add_parser('snapshots', help='List snapshots').add_argument('stream')
+
+    for command in ['delta', 'movers']:
+        query_parser = subparsers.add_parser(command)
+        query_parser.add_argument('stream')
+        query_parser.add_argument('--metric', choices=METRICS, default='pwr')
+        query_parser.add_argument('--last', type=int, default=1, help='Compare with this many snapshots back')
+        query_parser.add_argument('--limit', type=int, default=20)
+
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        # Deferred: generate_index imports this module
+        from generate_index import parse_tsv_stats
+        if args.date and len(args.files) > 1:
+            parser.error('--date only applies to a single file')
+        for filepath in args.files:
+            appended = ingest(args.stream, parse_tsv_stats(filepath), source_cache.file_digest(filepath),
+                              args.date, args.dir)
+            print(f"{'Appended' if appended else 'Already ingested'}: {filepath}")
+        return
+
+    history = StatsHistory(args.stream, args.dir)
+    if args.command == 'snapshots':
+        for idx, snapshot in enumerate(history.snapshots):
+            print(f"{idx}\t{snapshot['date']}\t{snapshot['rows']} rows\t{snapshot['digest'][:12]}")
+    elif args.command == 'delta':
+        delta = history.delta(args.metric, args.last)
+        if delta is None:
+            print(f"Need at least {args.last + 1} snapshots, have {len(history.snapshots)}")
+            return
+        order = np.argsort(np.nan_to_num(-delta, nan=np.inf), kind='stable')
+        for idx in order[:args.limit]:
+            if not np.isnan(delta[idx]):
+                print(f"{history.names[idx]}\t{delta[idx]:+.4f}")
+    else:
+        for name, delta in history.movers(args.metric, args.last, args.limit):
+            print(f"{name}\t{delta:+.4f}")
+
+
+if __name__ == '__main__':
+    main()
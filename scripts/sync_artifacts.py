@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Copy the build outputs of generate_index.py to the client directories
+
+cards.json (card_all.json without the stats detail) goes to plugin-v1,
+plugin-v2/assets and web/public; the other artifacts only go to the
+clients that load them, and each client only gets its own card bundles
+(card_bundles.py).
+Targets already identical to their source are left untouched.
+
+Usage:
+    python sync_artifacts.py [--output-dir .] [--project-root ..]
+"""
+
+import argparse
+import filecmp
+import os
+import shutil
+
+import card_bundles
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+# (build output, file name in the target directory, card_bundles.TARGETS loading it)
+SYNC_ARTIFACTS = [
+    (os.path.join(card_bundles.BUNDLE_DIR, card_bundles.FALLBACK_FILE), 'cards.json', list(card_bundles.TARGETS)),
+    # Name lookups of the plugin-v1 content script
+    ('card_aliases.json', 'card_aliases.json', ['plugin-v1'])
+]
+
+
+def sync_artifacts(output_dir=SCRIPT_DIR, project_root=PROJECT_ROOT):
+    """Sync cards.json and build artifacts from output_dir to plugin-v1, plugin-v2, and web directories"""
+    print("Syncing build artifacts to target directories...")
+
+    for source_name, target_name, targets in SYNC_ARTIFACTS:
+        target_dirs = [os.path.join(project_root, card_bundles.TARGETS[target]['dir']) for target in targets]
+        source_file = os.path.join(output_dir, source_name)
+
+        # Check if source file exists
+        if not os.path.exists(source_file):
+            print(f"Error: Source file {source_file} does not exist!")
+            continue
+
+        # Copy to each target location
+        copied_count = 0
+        for target_dir in target_dirs:
+            target = os.path.join(target_dir, target_name)
+            try:
+                # Leave identical targets untouched
+                if os.path.exists(target) and filecmp.cmp(source_file, target, shallow=False):
+                    copied_count += 1
+                    print(f"  Up to date: {target}")
+                    continue
+
+                # Create target directory if it doesn't exist
+                os.makedirs(target_dir, exist_ok=True)
+
+                # Copy the file
+                shutil.copy2(source_file, target)
+                copied_count += 1
+                print(f"  Copied to: {target}")
+            except Exception as e:
+                print(f"  Error copying to {target}: {e}")
+
+        print(f"Successfully synced {source_name} to {copied_count}/{len(target_dirs)} locations")
+
+    # Each target only gets its own card bundles
+    for target, spec in card_bundles.TARGETS.items():
+        for locale in spec['locales']:
+            name = card_bundles.bundle_file(locale)
+            source_file = os.path.join(output_dir, card_bundles.BUNDLE_DIR, target, name)
+            target_file = os.path.join(project_root, spec['dir'], name)
+            if not os.path.exists(source_file):
+                print(f"Error: Source file {source_file} does not exist!")
+                continue
+            try:
+                if os.path.exists(target_file) and filecmp.cmp(source_file, target_file, shallow=False):
+                    print(f"  Up to date: {target_file}")
+                    continue
+                shutil.copy2(source_file, target_file)
+                print(f"  Copied to: {target_file}")
+            except Exception as e:
+                print(f"  Error copying to {target_file}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Copy the build outputs to the client directories')
+    parser.add_argument('--output-dir', default=SCRIPT_DIR, help='Directory of the generate_index.py outputs')
+    parser.add_argument('--project-root', default=PROJECT_ROOT, help='Directory holding plugin-v1, plugin-v2 and web')
+    args = parser.parse_args()
+
+    sync_artifacts(args.output_dir, args.project_root)
+
+
+if __name__ == '__main__':
+    main()
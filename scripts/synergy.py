@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Card co-play / co-win synergy from local game logs (see game_logs.py for the schema)
+
+Every pair of cards played by the same player in a game is a co-play, and
+a co-win when that player won. Pairs are collected per chunk of games as
+int64 codes, counted with NumPy and merged into sorted running arrays, so
+memory is bounded by the number of distinct pairs plus one chunk,
+whatever the number of games.
+
+Synergy of a pair is how much better the player did when both cards were
+played than the two cards do on average on their own:
+    (co-wins + m * e) / (co-plays + m) - e
+with e the mean play win rate of the two cards and m = PRIOR_GAMES, which
+shrinks rarely seen pairs towards zero.
+
+Usage:
+    python synergy.py game_logs/ [--top-k 10] [--output synergy.json] [--players 4] ...
+"""
+
+import argparse
+import json
+import os
+from array import array
+
+import numpy as np
+
+import game_logs
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+OUTPUT_FILE = 'synergy.json'
+
+TOP_K = 10
+CHUNK_GAMES = 20000
+# Pairs seen less often than this are not reported
+MIN_CO_PLAYS = 10
+PRIOR_GAMES = 20
+
+# Pair code = first card id * CODE_BASE + second card id
+CODE_BASE = 1 << 20
+
+
+class PairCounter:
+    """Sorted pair codes with co-play and co-win counts"""
+
+    def __init__(self):
+        self.codes = np.empty(0, dtype=np.int64)
+        self.counts = np.empty((0, 2), dtype=np.int64)
+
+    def add(self, codes, wins):
+        """Merge a chunk: codes of the pairs and whether each one was a co-win"""
+        if not len(codes):
+            return
+        codes = np.concatenate([self.codes, np.frombuffer(codes, dtype=np.int64)])
+        weights = np.concatenate([
+            self.counts,
+            np.stack([np.ones(len(wins), dtype=np.int64), np.frombuffer(wins, dtype=np.int8).astype(np.int64)], axis=1)
+        ])
+        self.codes, inverse = np.unique(codes, return_inverse=True)
+        self.counts = np.stack([
+            np.bincount(inverse, weights=weights[:, column], minlength=len(self.codes)).astype(np.int64)
+            for column in range(2)
+        ], axis=1)
+
+
+def count_pairs(path, filters=None, chunk_games=CHUNK_GAMES):
+    """Stream the logs and count pairs
+    Returns (card names, plays per card id, wins per card id, PairCounter).
+    """
+    names = []
+    ids = {}
+    plays = []
+    wins = []
+    pairs = PairCounter()
+
+    chunk_codes = array('q')
+    chunk_wins = array('b')
+    games = 0
+
+    for filepath in game_logs.log_files(path):
+        for game in game_logs.iter_games(filepath):
+            if not game_logs.game_matches(game, filters or {}):
+                continue
+            for seat in game['seats']:
+                winner = bool(seat.get('winner'))
+                played = set()
+                for entry in seat.get('played', []):
+                    name = game_logs.card_name(entry)
+                    if not name:
+                        continue
+                    if name not in ids:
+                        ids[name] = len(names)
+                        names.append(name)
+                        plays.append(0)
+                        wins.append(0)
+                    played.add(ids[name])
+
+                played = sorted(played)
+                for idx, first in enumerate(played):
+                    plays[first] += 1
+                    wins[first] += winner
+                    for second in played[idx + 1:]:
+                        chunk_codes.append(first * CODE_BASE + second)
+                        chunk_wins.append(winner)
+
+            games += 1
+            if games % chunk_games == 0:
+                pairs.add(chunk_codes, chunk_wins)
+                chunk_codes = array('q')
+                chunk_wins = array('b')
+
+    pairs.add(chunk_codes, chunk_wins)
+    return names, np.array(plays, dtype=float), np.array(wins, dtype=float), pairs
+
+
+def top_partners(names, plays, wins, pairs, k=TOP_K, min_co_plays=MIN_CO_PLAYS):
+    """Return {card name: [[partner name, synergy, co-plays], ...]}, best first"""
+    co_plays = pairs.counts[:, 0]
+    keep = co_plays >= min_co_plays
+    first = pairs.codes[keep] // CODE_BASE
+    second = pairs.codes[keep] % CODE_BASE
+    co_plays = co_plays[keep]
+    co_wins = pairs.counts[keep, 1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        win_rate = np.where(plays > 0, wins / plays, 0)
+    expected = (win_rate[first] + win_rate[second]) / 2
+    synergy = (co_wins + PRIOR_GAMES * expected) / (co_plays + PRIOR_GAMES) - expected
+
+    # Both directions, then the k best partners of each card
+    cards = np.concatenate([first, second])
+    partners = np.concatenate([second, first])
+    scores = np.concatenate([synergy, synergy])
+    counts = np.concatenate([co_plays, co_plays])
+    order = np.lexsort((-scores, cards))
+    cards, partners, scores, counts = cards[order], partners[order], scores[order], counts[order]
+    starts = np.flatnonzero(np.r_[True, cards[1:] != cards[:-1]]) if len(cards) else np.empty(0, dtype=int)
+    rank = np.arange(len(cards)) - np.repeat(starts, np.diff(np.r_[starts, len(cards)]))
+    selected = (rank < k) & (scores > 0)
+
+    result = {}
+    for card, partner, score, count in zip(cards[selected], partners[selected], scores[selected], counts[selected]):
+        result.setdefault(names[card], []).append([names[partner], round(float(score), 4), int(count)])
+    return result
+
+
+def build_synergy(path, records, filters=None, k=TOP_K):
+    """Return {no: [[partner no, synergy, co-plays], ...]}; records map enName to no"""
+    nos_by_name = {}
+    for record in records:
+        name = record.get('enName', '').strip()
+        if name and record.get('no'):
+            nos_by_name.setdefault(name, []).append(record['no'])
+
+    names, plays, wins, pairs = count_pairs(path, filters)
+    synergy = {}
+    for name, partners in top_partners(names, plays, wins, pairs, k).items():
+        resolved = [[no, score, count] for partner, score, count in partners
+                    for no in nos_by_name.get(partner, [])[:1]]
+        if not resolved:
+            continue
+        for no in nos_by_name.get(name, []):
+            synergy[no] = resolved
+    return dict(sorted(synergy.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute card synergy partners from game logs')
+    parser.add_argument('logs', help='Log directory (or a single .jsonl/.jsonl.gz file)')
+    parser.add_argument('--pk', default=os.path.join(SCRIPT_DIR, 'pk.json'), help='Cards with no and enName')
+    parser.add_argument('--output', default=os.path.join(SCRIPT_DIR, OUTPUT_FILE))
+    parser.add_argument('--top-k', type=int, default=TOP_K)
+    game_logs.add_filter_arguments(parser)
+    args = parser.parse_args()
+
+    with open(args.pk, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+
+    synergy = build_synergy(args.logs, records, game_logs.filters_from_args(args), args.top_k)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(synergy, f, ensure_ascii=False, separators=(',', ':'))
+    print(f"Wrote synergy partners of {len(synergy)} cards to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
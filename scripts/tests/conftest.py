@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""Make the modules of scripts/ importable from the tests"""
+
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+
+import pytest
+
+import card_library
+
+CARDS = [
+    {'no': 'A001', 'cnName': '情人', 'enName': 'Lover', 'baituTier': 'T1',
+     'stats': {'default': {'pwr': 5.31, 'adp': 1.55}}},
+    {'no': 'A002', 'cnName': '粪坑', 'enName': 'Cesspit', 'baituTier': 'T2',
+     'stats': {'default': {'pwr': 4.85, 'adp': 1.65}}},
+    {'no': 'B001', 'cnName': '石材保管人', 'enName': 'Stone Custodian', 'baituTier': 'T1',
+     'stats': {'default': {'pwr': 0.95, 'adp': 5.25}}},
+    {'no': 'C001', 'enName': 'Lover'}
+]
+
+
+@pytest.fixture
+def library(tmp_path):
+    filepath = tmp_path / 'card_all.json'
+    filepath.write_text(json.dumps(CARDS, ensure_ascii=False), 'utf-8')
+    return card_library.CardLibrary(str(filepath))
+
+
+def nos(cards):
+    return [card['no'] if card else None for card in cards]
+
+
+def test_get_and_batch_get(library):
+    assert library.get('A002')['enName'] == 'Cesspit'
+    assert library.get('Z999') is None
+    assert nos(library.batch_get(['B001', 'Z999', 'A001'])) == ['B001', None, 'A001']
+    assert len(library) == 4
+
+
+def test_by_name_ignores_case_width_and_space(library):
+    assert nos(library.by_name(' lover ')) == ['A001', 'C001']
+    assert nos(library.by_name('ＬＯＶＥＲ')) == ['A001', 'C001']
+    assert nos(library.by_name('石材保管人')) == ['B001']
+    assert library.by_name('nobody') == []
+
+
+def test_filter(library):
+    assert nos(library.filter(deck='A', sort='pwr', order='desc')) == ['A001', 'A002']
+    assert nos(library.filter(tier_source='baitu', tier='T1', max_adp=2)) == ['A001']
+    assert nos(library.filter(prefix='sto')) == ['B001']
+    assert nos(library.filter(prefix='ＳＴＯＮＥ c')) == ['B001']
+    assert nos(library.filter(min_pwr=1, sort='pwr', limit=1)) == ['A002']
+    with pytest.raises(TypeError):
+        library.filter(min_elo=1)
+
+
+def test_reload_reads_the_file_again(library):
+    assert library.get('A001')['cnName'] == '情人'
+    assert library.cache_info().currsize == 1
+
+    cards = [dict(CARDS[0], cnName='恋人')]
+    with open(library.filepath, 'w', encoding='utf-8') as f:
+        json.dump(cards, f, ensure_ascii=False)
+    library.reload()
+
+    assert library.get('A001')['cnName'] == '恋人'
+    assert nos(library.by_name('恋人')) == ['A001']
+    assert library.by_name('Cesspit') == []
+    assert library.cache_info().currsize == 1
+
+
+def test_lookups_during_reloads(library):
+    errors = []
+
+    def lookup():
+        try:
+            for _ in range(500):
+                assert library.get('A001')['enName'] == 'Lover'
+                assert nos(library.by_name('Cesspit')) == ['A002']
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=lookup) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        library.reload()
+    for thread in threads:
+        thread.join()
+    assert errors == []
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import cli
+import generate_index
+
+
+def build_args(argv):
+    return cli.build_parser(generate_index.build_parser(add_help=False, roots=False)).parse_args(argv)
+
+
+def test_build_takes_generate_index_options():
+    args = build_args(['--input-root', 'data', 'build', '--jobs', '2', '--strict'])
+    assert (args.input_root, args.jobs, args.strict, args.watch) == ('data', 2, True, False)
+    assert args.run is cli.run_build
+
+
+def test_build_rejects_unknown_options():
+    with pytest.raises(SystemExit):
+        build_args(['build', '--job', '2', '--bogus'])
+
+
+def test_other_commands_reject_unknown_options():
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args(['sync', '--jobs', '2'])
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+import diff_outputs
+
+
+def test_list_field_counts_each_card_once():
+    rows_a = [
+        {'no': 'A001', 'videoClips': [['v1', 10], ['v2', 20]], 'stats': {'default': {'pwr': 1.0}}},
+        {'no': 'A002', 'videoClips': [['v1', 30]], 'stats': {'default': {'pwr': 2.0}}}
+    ]
+    rows_b = [
+        {'no': 'A001', 'videoClips': [['v1', 11], ['v2', 21]], 'stats': {'default': {'pwr': 1.0}}},
+        {'no': 'A002', 'videoClips': [['v1', 30]], 'stats': {'default': {'pwr': 2.5}}}
+    ]
+
+    report = diff_outputs.diff_rows(rows_a, rows_b)
+    assert report['changed'] == 2
+    assert {field: spec['count'] for field, spec in report['fields'].items()} == {
+        'videoClips[]': 1,
+        'stats.default.pwr': 1
+    }
+    assert len(report['fields']['videoClips[]']['examples']) == 2
+
+
+def test_tolerance_and_ignore():
+    rows_a = [{'no': 'A001', 'pwr': 1.0, 'statsTrend': [1]}, {'no': 'A002', 'pwr': 1.0}]
+    rows_b = [{'no': 'A001', 'pwr': 1.0 + 1e-9, 'statsTrend': [2]}, {'no': 'A003', 'pwr': 1.0}]
+
+    report = diff_outputs.diff_rows(rows_a, rows_b, ignore=['statsTrend'])
+    assert report['changed'] == 0
+    assert report['fields'] == {}
+    assert (report['only_a'], report['only_b']) == (['A002'], ['A003'])
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+import game_logs
+
+
+def totals(deals, drafted, plays, w_play, players=4):
+    values = dict.fromkeys(game_logs.COUNTERS, 0)
+    values.update(deals=deals, drafted=drafted, plays=plays, w_play=w_play,
+                  expected_wins=plays / players, expected_variance=plays / players * (1 - 1 / players))
+    return [values[name] for name in game_logs.COUNTERS]
+
+
+def test_pwr_matches_spreadsheet_scale():
+    # Lover and Breeder Buyer of 4p_de.tsv
+    rows = {row['Card Name']: row for row in game_logs.stats_rows({
+        'Lover': totals(780, 779, 722, 290),
+        'Breeder Buyer': totals(324, 44, 1, 0)
+    })}
+    assert round(rows['Lover']['PWR'], 2) == 5.31
+    assert rows['Breeder Buyer']['PWR'] == 0
+
+
+def test_pwr_does_not_grow_with_plays():
+    rows = {row['Card Name']: row for row in game_logs.stats_rows({
+        'small': totals(100, 90, 80, 30),
+        'large': totals(10000, 9000, 8000, 3000)
+    })}
+    assert rows['small']['PWR'] == pytest.approx(rows['large']['PWR'])
+    assert rows['large']['PWR-Z'] == pytest.approx(10 * rows['small']['PWR-Z'])
+
+
+def test_logs_to_tsv(tmp_path):
+    seats = [{'winner': seat == 0, 'dealt': ['Lover', 'Cesspit'], 'drafted': [{'card': 'Lover', 'pick': 1}],
+              'played': [{'card': 'Lover', 'round': 3}] if seat < 2 else []} for seat in range(4)]
+    (tmp_path / 'games.jsonl').write_text(json.dumps({'players': 4, 'seats': seats}) + '\n', 'utf-8')
+
+    games, aggregated = game_logs.aggregate_logs(str(tmp_path), jobs=1)
+    rows = game_logs.stats_rows(aggregated)
+    game_logs.write_stats_tsv(rows, str(tmp_path / 'out.tsv'))
+
+    assert games == 1
+    assert rows[0]['Card Name'] == 'Lover'
+    assert rows[0]['PWR'] == pytest.approx(100 / 7 / 4)
+    header = (tmp_path / 'out.tsv').read_text('utf-8').splitlines()[0].split('\t')
+    assert [col.strip() for col in header] == game_logs.TSV_HEADER
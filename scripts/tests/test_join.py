@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import csv
+import json
+
+import generate_index
+
+DATABASE = '''Deck,Number,Name,Type,Text
+A,1,Lover,Occupation,
+A,2,Cesspit,Minor Improvement,
+A,3,Basket Carrier,Occupation,
+A,4,Unrated,Occupation,
+A,1,Lover Reprint,Occupation,
+X,9,Other Deck,Occupation,
+'''
+
+STATS_HEADER = 'Rank\tCard Name\tPWR\tADP\tAPR\tDeals\tDrafted\tPlays\tW-Hand\tW-Play\n'
+
+
+def write_sources(root):
+    (root / 'Agricola Database - Database.csv').write_text(DATABASE, 'utf-8')
+    (root / 'Agricola Database - Database (in progress).csv').write_text(
+        'Deck,Number,Name,Type,Text\nB,1,Stone Custodian,Occupation,\n', 'utf-8')
+    (root / 'cards.json').write_text(json.dumps([
+        {'no': 'A001', 'name': '情人', 'tier': 'T1', 'desc': 'baitu'},
+        {'no': 'A002', 'name': '粪坑', 'tier': 'T2', 'desc': ''}
+    ], ensure_ascii=False), 'utf-8')
+    # e.csv overrides the cnName of cards.json; rows without a name are skipped
+    (root / 'e.csv').write_text('no,name\nA001,恋人\nA002,\n', 'utf-8')
+    (root / 'en.json').write_text(json.dumps([
+        {'card_title': 'Lover', 'insight': 'good', 'rating': 5},
+        {'card_title': 'Cesspit', 'insight': '', 'rating': 0}
+    ]), 'utf-8')
+    # Matched on no (filling an empty cnName) and on the cnName set by e.csv
+    (root / 'even_more_set_minor_improvements.json').write_text(json.dumps([
+        {'no': 'A003', 'name': '篮子搬运工', 'tier': 'A', 'desc': 'chen'},
+        {'no': '', 'name': '恋人', 'tier': 'S', 'desc': 'chen lover'}
+    ], ensure_ascii=False), 'utf-8')
+    (root / 'cards_gamewiki_jp_merged.jsonl').write_text(
+        json.dumps({'card_id': 'A001', 'name_jp': '恋人', 'comment_jpwiki_cn': 'jp'}, ensure_ascii=False) + '\n',
+        'utf-8')
+    # Index stage: A004 has no rating, so it is not in index.csv to be joined
+    (root / 'set_o.json').write_text(json.dumps([
+        {'no': 'A002', 'tier': 'B', 'desc': 'set o'},
+        {'no': 'A004', 'tier': 'A', 'desc': 'set o'}
+    ]), 'utf-8')
+    # A stats row keeps an unrated card
+    (root / '4p_de.tsv').write_text(STATS_HEADER + '1\tStone Custodian\t0.95\t5.25\t7.94\t10\t8\t3\t2\t1\n', 'utf-8')
+    (root / '4p_nb.tsv').write_text(STATS_HEADER, 'utf-8')
+
+
+def test_registry_join(tmp_path, monkeypatch):
+    write_sources(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(generate_index, 'OUTPUT_DIR', str(tmp_path))
+
+    loaded = generate_index.load_sources(jobs=1, use_cache=False)
+    assert loaded['cards_export'] is None
+    generate_index.join_sources(loaded, jobs=1)
+
+    with open(tmp_path / 'index.csv', encoding='utf-8', newline='') as f:
+        rows = {row['no']: row for row in csv.DictReader(f)}
+    assert list(rows) == ['A001', 'A002', 'A003', 'B001']
+
+    def fields(no, *names):
+        return tuple(rows[no][name] for name in names)
+
+    assert fields('A001', 'cnName', 'enName', 'baituTier', 'enTier', 'chenTier', 'jpName', 'enDesc', 'chenDesc') == \
+        ('恋人', 'Lover', 'T1', 'A', 'S', '恋人', 'good', 'chen lover')
+    assert fields('A002', 'cnName', 'enTier', 'chenTier', 'chenDesc') == ('粪坑', '', 'B', 'set o')
+    assert fields('A003', 'cnName', 'chenTier') == ('篮子搬运工', 'A')
+    assert fields('B001', 'enName', 'baituTier', 'chenTier') == ('Stone Custodian', '', '')
+
+    with open(tmp_path / 'index_raw.csv', encoding='utf-8', newline='') as f:
+        raw = {row['no']: row for row in csv.DictReader(f)}
+    assert list(raw) == ['A001', 'A002', 'A003', 'A004', 'B001']
+    assert raw['A001']['enName'] == 'Lover' and raw['A004']['chenTier'] == ''
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+import re
+
+import parse_srt
+
+
+def parse(timestamp):
+    return parse_srt.timestamp_to_ms(*re.fullmatch(parse_srt.TIME_PATTERN, timestamp).groups())
+
+
+def test_fraction_is_decimal():
+    assert parse('1:39:28,8') == 5968800
+    assert parse('1:39:28,14') == 5968140
+    assert parse('0:1:37,28') == 97280
+    assert parse('0:0:1,005') == 1005
+    assert parse('0:0:1,0') == 1000
+
+
+def test_whole_seconds():
+    assert parse_srt.timestamp_to_ms('0', '2', '3', 0) == 123000
+
+
+def test_cues_end_after_start(tmp_path):
+    srt = tmp_path / 'clip.srt'
+    srt.write_text('1\n1:39:28,14 --> 1:39:28,8\nLover\n\n2\n1:39:28,8 --> 1:39:30,5\nnext\n', 'utf-8')
+
+    cues = parse_srt.parse_cues(str(srt))
+    assert [(cue['start_ms'], cue['end_ms']) for cue in cues] == [(5968140, 5968800), (5968800, 5970500)]
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+import card_library
+import generate_index
+import serve_cards
+
+CARDS = [
+    {'no': 'A001', 'enName': 'Lover', 'stats': {'default': {'pwr': 5.31, 'adp': 1.55}}},
+    {'no': 'A002', 'enName': 'Cesspit', 'stats': {'default': {'pwr': 4.85, 'adp': 1.65}}},
+    {'no': 'B001', 'enName': 'Stone Custodian', 'stats': {'default': {'pwr': 0.95, 'adp': 5.25}}},
+    {'no': 'C001', 'enName': 'Unplayed'}
+]
+
+
+@pytest.fixture
+def service(tmp_path):
+    filepath = tmp_path / 'card_all.json'
+    filepath.write_text(json.dumps(CARDS), 'utf-8')
+    return serve_cards.CardService(str(filepath))
+
+
+def nos(cards):
+    return [card['no'] for card in cards]
+
+
+def test_query_pages_and_sorts_cards_without_the_metric_last():
+    store = card_library.CardStore(CARDS)
+
+    total, items = store.query(sort='pwr', order='desc', page=1, page_size=3)
+    assert total == 4 and nos(items) == ['A001', 'A002', 'B001']
+    total, items = store.query(sort='pwr', order='desc', page=2, page_size=3)
+    assert total == 4 and nos(items) == ['C001']
+
+    assert nos(store.query(sort='adp')[1]) == ['A001', 'A002', 'B001', 'C001']
+    assert nos(store.query(prefix='u', sort='pwr')[1]) == ['C001']
+    assert store.query(sort='pwr', page=3, page_size=2) == (4, [])
+
+
+def test_cards_endpoint(service):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), serve_cards.make_handler(service))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urlopen(f"{url}/cards?sort=pwr&order=desc&page=2&page_size=2") as response:
+            payload = json.load(response)
+        assert (payload['total'], payload['page'], payload['pageSize']) == (4, 2, 2)
+        assert nos(payload['items']) == ['B001', 'C001']
+
+        with urlopen(f"{url}/cards/A002") as response:
+            assert json.load(response)['enName'] == 'Cesspit'
+
+        with pytest.raises(HTTPError) as error:
+            urlopen(f"{url}/cards?stats=6p")
+        assert error.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_rebuild_retries_a_broken_source(service, monkeypatch):
+    calls = []
+    reloads = iter([False, True])
+    monkeypatch.setattr(generate_index, 'source_mtimes', lambda: {'e_csv': (2,)})
+    monkeypatch.setattr(generate_index, 'reload_sources', lambda loaded, changed: next(reloads))
+    monkeypatch.setattr(generate_index, 'validate', lambda: calls.append('validate'))
+    monkeypatch.setattr(generate_index, 'build_outputs', lambda loaded: calls.append('build'))
+    service.rebuild, service.loaded, service.source_mtimes = True, {}, {'e_csv': (1,)}
+
+    service.rebuild_changed()
+    assert calls == [] and service.source_mtimes == {'e_csv': (1,)}
+
+    service.rebuild_changed()
+    assert calls == ['validate', 'build'] and service.source_mtimes == {'e_csv': (2,)}
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+import similar_cards
+
+RECORDS = [
+    {'no': 'A001', 'effect': 'When you play this card, take 1 wood and 1 clay.'},
+    {'no': 'A002', 'effect': 'When you play this card, take 1 wood and 1 reed.'},
+    {'no': 'A003', 'effect': 'At the end of the game, gain 2 bonus points.'},
+    {'no': 'A004', 'effect': 'At the end of the game, gain 1 bonus point per pasture.'}
+]
+
+
+def test_tfidf_vectors_are_sparse_and_normalized():
+    vectors = similar_cards.tfidf_vectors([record['effect'] for record in RECORDS])
+    # 'clay' only occurs once, so it gets no weight
+    assert 'clay' not in vectors[0] and 'wood' in vectors[0]
+    assert sum(weight * weight for weight in vectors[0].values()) < 1
+
+
+def test_neighbours_only_among_the_given_records():
+    similar = similar_cards.build_similar_cards(RECORDS, k=1)
+    assert [no for no, _ in similar['A001']] == ['A002']
+    assert [no for no, _ in similar['A004']] == ['A003']
+
+    similar = similar_cards.build_similar_cards(RECORDS[:3], k=3)
+    assert all(no != 'A004' for neighbours in similar.values() for no, _ in neighbours)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import importlib
+import pickle
+import sys
+
+import source_cache
+
+
+def load_module(tmp_path, name, helper_body):
+    (tmp_path / f'{name}_helpers.py').write_text(f'def helper(text):\n    return {helper_body}\n', 'utf-8')
+    (tmp_path / f'{name}.py').write_text(
+        f'from {name}_helpers import helper\n\n\ndef parse(path):\n'
+        '    with open(path, encoding="utf-8") as f:\n        return helper(f.read())\n', 'utf-8')
+    for module in (name, f'{name}_helpers'):
+        sys.modules.pop(module, None)
+    importlib.invalidate_caches()
+    return importlib.import_module(name)
+
+
+def cache_entries(tmp_path):
+    return sorted((tmp_path / '.cache').glob('*.pickle'))
+
+
+def test_helper_edit_invalidates_entry(tmp_path, monkeypatch):
+    monkeypatch.setattr(source_cache, 'enabled', True)
+    monkeypatch.setattr(source_cache, 'SCRIPT_DIR', str(tmp_path))
+    monkeypatch.setattr(source_cache, 'CACHE_DIR', str(tmp_path / '.cache'))
+    monkeypatch.setattr(source_cache, '_source_digests', {})
+    monkeypatch.syspath_prepend(str(tmp_path))
+    source = tmp_path / 'source.txt'
+    source.write_text('abc', 'utf-8')
+
+    module = load_module(tmp_path, 'cached_parser', 'text.upper()')
+    assert source_cache.load_cached(str(source), module.parse) == 'ABC'
+    entries = cache_entries(tmp_path)
+    assert len(entries) == 1
+
+    # A hit returns the pickled result without calling parse
+    with open(entries[0], 'wb') as f:
+        pickle.dump('cached', f)
+    assert source_cache.load_cached(str(source), module.parse) == 'cached'
+    assert cache_entries(tmp_path) == entries
+    assert sorted(p.rsplit('/', 1)[-1] for p in source_cache.local_sources(module.parse)) == \
+        ['cached_parser.py', 'cached_parser_helpers.py']
+
+    monkeypatch.setattr(source_cache, '_source_digests', {})
+    module = load_module(tmp_path, 'cached_parser', 'text[::-1]')
+    assert source_cache.load_cached(str(source), module.parse) == 'cba'
+    assert len(cache_entries(tmp_path)) == 1 and cache_entries(tmp_path) != entries
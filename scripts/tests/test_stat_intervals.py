@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+import card_bundles
+import generate_index
+
+
+def test_wilson_interval():
+    low, high = generate_index.wilson_interval(np.array([5.0, 0.0, 10.0]), np.array([10.0, 10.0, 10.0]))
+    assert low == pytest.approx([0.2366, 0.0, 0.7225], abs=1e-4)
+    assert high == pytest.approx([0.7634, 0.2775, 1.0], abs=1e-4)
+
+
+def test_wilson_interval_without_trials_is_nan():
+    low, high = generate_index.wilson_interval(np.array([0.0]), np.array([0.0]))
+    assert np.isnan(low[0]) and np.isnan(high[0])
+
+
+def test_shrunk_interval():
+    # Beta(5 + 20 * 0.25, 5 + 20 * 0.75) posterior
+    mean, low, high = generate_index.shrunk_interval(np.array([5.0, 0.0]), np.array([10.0, 0.0]), 0.25)
+    assert mean == pytest.approx([1 / 3, 0.25])
+    assert low[0] == pytest.approx(1 / 3 - 1.96 * np.sqrt(2 / 9 / 31))
+    assert high[0] == pytest.approx(1 / 3 + 1.96 * np.sqrt(2 / 9 / 31))
+
+
+def test_compute_stat_intervals():
+    stats_map = {
+        'Lover': {'drafted': 779, 'plays': 722, 'winsHand': 302, 'winsPlay': 290},
+        'Rare': {'drafted': 3, 'plays': 1, 'winsHand': 1, 'winsPlay': 1},
+        'Undrafted': {'drafted': 0, 'plays': 0, 'winsHand': 0, 'winsPlay': 0}
+    }
+    generate_index.compute_stat_intervals(stats_map)
+
+    lover, rare, undrafted = stats_map['Lover'], stats_map['Rare'], stats_map['Undrafted']
+    assert lover['drawPlayRate'] == 722 / 779
+    assert lover['drawPlayRateLow'] < lover['drawPlayRate'] < lover['drawPlayRateHigh']
+    assert not lover['lowSample'] and rare['lowSample']
+    # One win in one play is pulled most of the way back to the pooled rate
+    assert rare['winRatePlay'] < 0.5
+    assert undrafted['drawPlayRate'] is None and undrafted['winRateHand'] is None
+
+
+def test_stats_detail_stays_out_of_cards_json():
+    cards = [{'no': 'A001', 'stats': {'default': {'pwr': 5.31, 'drafted': 779, 'winRatePlayLow': 0.36}}},
+             {'no': 'A002', 'enName': 'Cesspit'}]
+
+    assert card_bundles.fallback_cards(cards) == [{'no': 'A001', 'stats': {'default': {'pwr': 5.31}}},
+                                                  {'no': 'A002', 'enName': 'Cesspit'}]
+    assert card_bundles.stats_detail(cards) == {'A001': {'default': {'drafted': 779, 'winRatePlayLow': 0.36}}}
+    assert cards[0]['stats']['default']['drafted'] == 779
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import stats_history
+
+
+def test_ingest_skips_known_snapshots(tmp_path):
+    first = {'Lover': {'pwr': 5.0, 'adp': 1.5}, 'Cesspit': {'pwr': 4.0}}
+    edited = {'Lover': {'pwr': 6.0, 'adp': 1.5}, 'Cesspit': {'pwr': 4.0}}
+    assert stats_history.ingest('default', first, 'a', '2025-01-01', str(tmp_path))
+    assert stats_history.ingest('default', edited, 'b', '2025-02-01', str(tmp_path))
+    # Reverting the file does not add a third snapshot
+    assert not stats_history.ingest('default', first, 'a', '2025-03-01', str(tmp_path))
+
+    history = stats_history.StatsHistory('default', str(tmp_path))
+    assert [snapshot['date'] for snapshot in history.snapshots] == ['2025-01-01', '2025-02-01']
+    trends = history.trends()
+    assert trends['Lover'] == {'since': '2025-01-01', 'pwr': pytest.approx(1.0), 'adp': 0.0}
+    assert trends['Cesspit'] == {'since': '2025-01-01', 'pwr': 0.0}
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import json
+import sys
+
+import pytest
+
+import translation_memory as tm
+
+OLD_DESC = 'Good early. Weak late.'
+NEW_DESC = 'Good early. Strong late!'
+
+
+def record(no, desc, translation=''):
+    return {'no': no, tm.SOURCE_FIELD: desc, tm.TARGET_FIELD: translation}
+
+
+def test_split_sentences_keeps_closing_quotes():
+    assert tm.split_sentences('He said "Go." Then  left.') == ['He said "Go."', 'Then left.']
+
+
+def test_stub_output_is_not_a_translation(tmp_path):
+    memory_file = tmp_path / tm.MEMORY_FILE
+    memory = tm.TranslationMemory(str(memory_file))
+    records = [record('A001', OLD_DESC)]
+
+    tm.translate_pending(tm.pending_sentences(records, memory), memory, tm.StubTranslator())
+
+    reloaded = tm.TranslationMemory(str(memory_file))
+    translations, pending = tm.build_translations(records, reloaded)
+    assert translations == {}
+    assert pending == ['Good early.', 'Weak late.']
+    assert all(json.loads(line)['backend'] == tm.STUB_BACKEND for line in memory_file.read_text('utf-8').splitlines())
+
+
+def test_stub_does_not_replace_a_translation(tmp_path):
+    memory = tm.TranslationMemory(str(tmp_path / tm.MEMORY_FILE))
+    memory.add([('Good early.', '前期好。')], 'command')
+    memory.add([('Good early.', '[待译] Good early.')], tm.STUB_BACKEND)
+
+    assert tm.TranslationMemory(memory.filepath).get('Good early.') == '前期好。'
+
+
+def test_revised_insight_makes_export_stale(tmp_path):
+    memory = tm.TranslationMemory(str(tmp_path / tm.MEMORY_FILE))
+    memory.add([('Good early.', '前期好。'), ('Weak late.', '后期弱。')], 'command')
+    sources = {'A001': tm.sentence_key(OLD_DESC)}
+
+    current = [record('A001', OLD_DESC, '导出的翻译')]
+    assert tm.build_translations(current, memory, sources) == ({}, [])
+    assert tm.stale_records(current, sources) == []
+
+    revised = [record('A001', NEW_DESC, '导出的翻译')]
+    translations, pending = tm.build_translations(revised, memory, sources)
+    assert translations == {}
+    assert pending == ['Strong late!']
+    assert tm.stale_records(revised, sources) == ['A001']
+
+    memory.add([('Strong late!', '后期强！')], 'command')
+    translations, pending = tm.build_translations(revised, memory, sources)
+    assert translations == {'A001': {'text': '前期好。后期强！', 'source': tm.sentence_key(NEW_DESC)}}
+    assert pending == []
+
+
+def test_stamp_sources(tmp_path):
+    export_file = tmp_path / tm.EXPORT_FILE
+    export_file.write_text(json.dumps([
+        {'id': 'A001', tm.TARGET_FIELD: '导出的翻译'},
+        {'id': 'A002', tm.TARGET_FIELD: ''}
+    ]), 'utf-8')
+    records = [record('A001', OLD_DESC), record('A002', OLD_DESC)]
+
+    assert tm.stamp_sources(records, str(export_file)) == ['A001']
+    assert tm.export_sources(tm.read_export(str(export_file))) == {'A001': tm.sentence_key(OLD_DESC)}
+    assert tm.stamp_sources(records, str(export_file)) == []
+
+
+def test_command_output_must_be_a_list():
+    translator = tm.CommandTranslator(f'"{sys.executable}" -c "print(1)"')
+    with pytest.raises(ValueError, match='returned int instead of a list'):
+        translator.translate(['Take 1 wood.'])
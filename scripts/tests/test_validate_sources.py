@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import json
+
+import validate_sources
+
+
+def write_sources(tmp_path):
+    (tmp_path / 'Agricola Database - Database.csv').write_text(
+        'Deck,Number,Name,Type,Text\nA,1,Lover,Occupation,\nA,2,Cesspit,Minor Improvement,\n', 'utf-8')
+    (tmp_path / 'cards.json').write_text(json.dumps([
+        {'no': 'A001', 'name': '情人', 'tier': 'T1', 'desc': 'x'},
+        {'no': 'A002', 'name': '粪坑', 'tier': 'T2', 'desc': 'y'},
+        {'no': 'A002', 'name': '粪坑', 'tier': 'T2', 'desc': ''},
+        {'no': 'Z999', 'name': '无', 'tier': 'T3', 'desc': ''}
+    ], ensure_ascii=False), 'utf-8')
+    (tmp_path / 'e.csv').write_text('no,name\nA001,恋人\n', 'utf-8')
+
+
+def issues(report, check):
+    return {(issue['source'], issue['key']): issue for issue in report.issues if issue['check'] == check}
+
+
+def test_registry_driven_checks(tmp_path):
+    write_sources(tmp_path)
+    report = validate_sources.validate(*validate_sources.load_sources(str(tmp_path)))
+
+    conflict = issues(report, 'field_conflict')[('cards.json+e.csv', 'A001')]
+    assert conflict['severity'] == 'warning'
+    assert conflict['detail']['kept'] == 'e.csv'
+
+    assert issues(report, 'duplicate_no')[('cards.json', 'A002')]['severity'] == 'error'
+    assert ('cards.json', 'Z999') in issues(report, 'orphan')
+    assert report.count('error') == 1
+
+
+def test_strict_passes_on_overrides_only(tmp_path):
+    write_sources(tmp_path)
+    cards = json.loads((tmp_path / 'cards.json').read_text('utf-8'))
+    (tmp_path / 'cards.json').write_text(json.dumps(cards[:2] + cards[3:], ensure_ascii=False), 'utf-8')
+
+    report = validate_sources.run_validation(str(tmp_path), str(tmp_path / 'report.json'), 'error')
+    assert report.count('error') == 0
+    assert json.loads((tmp_path / 'report.json').read_text('utf-8'))['warnings'] == report.count('warning')
+
+
+def test_duplicate_join_keys_of_every_source(tmp_path):
+    write_sources(tmp_path)
+    (tmp_path / 'en.json').write_text(json.dumps([
+        {'card_title': 'Lover', 'insight': 'good', 'rating': 5},
+        {'card_title': 'Lover', 'insight': 'bad', 'rating': 1},
+        {'card_title': 'Cesspit', 'insight': '', 'rating': 3},
+        {'card_title': 'Cesspit', 'insight': '', 'rating': 3}
+    ]), 'utf-8')
+    (tmp_path / 'even_more_set_minor_improvements.json').write_text(json.dumps([
+        {'no': '', 'name': '粪坑', 'tier': 'A', 'desc': ''},
+        {'no': '', 'name': '粪坑', 'tier': 'B', 'desc': ''}
+    ], ensure_ascii=False), 'utf-8')
+    report = validate_sources.validate(*validate_sources.load_sources(str(tmp_path)))
+
+    duplicates = issues(report, 'duplicate_key')
+    assert duplicates[('en.json', 'Lover')]['severity'] == 'error'
+    assert duplicates[('en.json', 'Lover')]['detail']['field'] == 'enName'
+    assert duplicates[('en.json', 'Cesspit')]['severity'] == 'warning'
+    assert duplicates[('even_more_set_minor_improvements.json', '粪坑')]['detail']['field'] == 'cnName'
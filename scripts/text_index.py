@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Full-text inverted index over card effects and reviewer comments
+
+Tokenization is CJK-aware: runs of Chinese/Japanese characters become
+overlapping character bigrams, everything else becomes lowercase words.
+Every field gets its own postings. A posting stores the delta-encoded
+document number as a varint followed by the card's BM25 weight for the
+term, quantized to one byte, so a query only sums precomputed weights.
+
+Usage:
+    python text_index.py "stone accumulation space" [--field desc] [--any] [--limit 20]
+"""
+
+import argparse
+import base64
+import json
+import math
+import os
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+INDEX_FILE = 'card_text_index.json'
+
+# Card fields that get indexed, as written to card_all.json ('desc' is the effect text)
+TEXT_FIELDS = ['desc', 'baituDesc', 'enDesc', 'chenDesc', 'comment_jpwiki_cn', 'enDesc_trans2zh']
+
+INDEX_VERSION = 1
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Kana, CJK unified ideographs (plus extension A) and compatibility ideographs
+CJK_CHARS = '\u3040-\u30ff\u31f0-\u31ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+TOKEN_RE = re.compile(f"[{CJK_CHARS}]+|[a-z0-9]+")
+CJK_RE = re.compile(f"[{CJK_CHARS}]")
+
+
+def stem(word):
+    """Very light English stemming so 'spaces' finds 'space'"""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Split text into index terms: CJK character bigrams and stemmed words"""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    tokens = []
+    for run in TOKEN_RE.findall(text):
+        if CJK_RE.match(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens += [run[i:i + 2] for i in range(len(run) - 1)]
+        else:
+            tokens.append(stem(run))
+    return tokens
+
+
+def encode_varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_postings(data):
+    """Yield (doc, quantized weight) pairs from encoded postings"""
+    doc = 0
+    i = 0
+    while i < len(data):
+        delta = 0
+        shift = 0
+        while True:
+            byte = data[i]
+            i += 1
+            delta |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        doc += delta
+        yield doc, data[i]
+        i += 1
+
+
+def build_text_index(cards, fields=TEXT_FIELDS):
+    """Build the index artifact (a JSON-serializable dict) from card_all.json cards"""
+    docs = [card.get('no', '') for card in cards]
+    index = {
+        'version': INDEX_VERSION,
+        'docs': docs,
+        'fields': {}
+    }
+
+    for field in fields:
+        term_freqs = []
+        lengths = []
+        doc_freq = Counter()
+        for card in cards:
+            counts = Counter(tokenize(card.get(field, '')))
+            term_freqs.append(counts)
+            lengths.append(sum(counts.values()))
+            doc_freq.update(counts.keys())
+
+        indexed = sum(1 for length in lengths if length)
+        if not indexed:
+            continue
+        avgdl = sum(lengths) / indexed
+
+        weights = defaultdict(list)
+        for doc, counts in enumerate(term_freqs):
+            norm = K1 * (1 - B + B * lengths[doc] / avgdl)
+            for term, tf in counts.items():
+                idf = math.log(1 + (indexed - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                weights[term].append((doc, idf * tf * (K1 + 1) / (tf + norm)))
+
+        max_weight = max(weight for postings in weights.values() for _, weight in postings)
+        terms = {}
+        for term in sorted(weights):
+            out = bytearray()
+            previous = 0
+            for doc, weight in weights[term]:
+                encode_varint(doc - previous, out)
+                out.append(max(1, round(255 * weight / max_weight)))
+                previous = doc
+            terms[term] = base64.b64encode(bytes(out)).decode('ascii')
+
+        index['fields'][field] = {
+            'maxWeight': max_weight,
+            'terms': terms
+        }
+
+    return index
+
+
+class TextIndex:
+    """Query API over a built index"""
+
+    def __init__(self, index):
+        if index.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported text index version: {index.get('version')}")
+        self.docs = index['docs']
+        self.fields = index['fields']
+        self._postings = {}
+
+    @classmethod
+    def load(cls, filepath=os.path.join(SCRIPT_DIR, INDEX_FILE)):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def postings(self, field, term):
+        """Return {doc: weight} for a term in a field, decoded on first use"""
+        key = (field, term)
+        if key not in self._postings:
+            encoded = self.fields[field]['terms'].get(term)
+            scale = self.fields[field]['maxWeight'] / 255
+            self._postings[key] = {} if encoded is None else {
+                doc: quantized * scale for doc, quantized in decode_postings(base64.b64decode(encoded))
+            }
+        return self._postings[key]
+
+    def search(self, query, fields=None, limit=20, match_all=True):
+        """Return [(no, score)] best first
+
+        fields restricts the search to some of the indexed fields (default all).
+        With match_all, a card must contain every query term in one field.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        for field in fields or []:
+            if field not in self.fields:
+                raise ValueError(f"Field is not indexed: {field}")
+
+        scores = defaultdict(float)
+        for field in fields or list(self.fields):
+            postings = [self.postings(field, term) for term in terms]
+            if match_all:
+                candidates = set(min(postings, key=len))
+                for term_postings in postings:
+                    candidates &= term_postings.keys()
+            else:
+                candidates = set().union(*postings)
+            for doc in candidates:
+                scores[doc] += sum(term_postings.get(doc, 0) for term_postings in postings)
+
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+        if limit:
+            ranked = ranked[:limit]
+        return [(self.docs[doc], round(score, 4)) for doc, score in ranked]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search the card text index')
+    parser.add_argument('query')
+    parser.add_argument('--field', action='append', choices=TEXT_FIELDS,
+                        help='Only search this field (repeatable)')
+    parser.add_argument('--any', action='store_true', help='Match cards containing any query term')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--index', default=os.path.join(SCRIPT_DIR, INDEX_FILE))
+    args = parser.parse_args()
+
+    index = TextIndex.load(args.index)
+    for no, score in index.search(args.query, args.field, args.limit, match_all=not args.any):
+        print(f"{no}\t{score}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sentence-level translation memory for the English insights (enDesc -> zh)
+
+Every enDesc is split into sentences. A sentence is keyed by the sha256 of
+its normalized text (NFKC, single spaces), so identical sentences of
+several cards are translated once, and a revised insight in en.json only
+needs its changed sentences translated again. A card's translation is
+the concatenation of its sentence translations; it is only produced once
+every sentence is in the memory.
+
+The memory is the append-only translation_memory.jsonl, one entry per line:
+    {"key": "<sha256>", "source": "<sentence>", "zh": "<translation>", "backend": "stub"}
+A later line with the same key replaces an earlier one, so a translation
+is corrected by appending it again (or by editing the file by hand).
+Lines of the stub backend are placeholders: they are never read back as
+translations.
+
+The hand-maintained translations of cards_export.json keep, in
+enDesc_source, the key of the enDesc they translate. When the insight is
+revised in en.json the keys differ: the card is stale, its sentences are
+translated again from the memory, and the memory translation replaces
+the exported one once complete. The stamp command records the key of the
+current enDesc for exported translations (after a translator updated one).
+
+Translations come from a pluggable backend: any object with a
+translate(sentences) method returning one translation per sentence. The
+build itself never calls a backend; it only reads the memory and reports
+the sentences still missing, which the translate command fills in batches:
+    stub            placeholder translations, for trying the pipeline locally
+    command         runs --command, writing the sentences to its stdin as a
+                    JSON array and reading a JSON array of translations back
+    module:Class    any importable translator class
+
+Usage:
+    python translation_memory.py status
+    python translation_memory.py translate --backend command --command "python my_translator.py" [--batch-size 50]
+    python translation_memory.py stamp [--no D175 ...]
+"""
+
+import argparse
+import csv
+import datetime
+import hashlib
+import importlib
+import json
+import os
+import re
+import shlex
+import subprocess
+import unicodedata
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MEMORY_FILE = 'translation_memory.jsonl'
+OUTPUT_FILE = 'translations_zh.json'
+
+EXPORT_FILE = 'cards_export.json'
+
+SOURCE_FIELD = 'enDesc'
+TARGET_FIELD = 'enDesc_trans2zh'
+# Key of the enDesc an exported translation was made from
+SOURCE_KEY_FIELD = 'enDesc_source'
+
+STUB_BACKEND = 'stub'
+
+BATCH_SIZE = 50
+
+# Sentence ends: . ! ? (optionally closed by a quote or parenthesis) followed
+# by whitespace and something that starts a sentence
+SENTENCE_END = re.compile(r'(?:(?<=[.!?])|(?<=[.!?]["\')]))\s+(?=["(]?[A-Z0-9])')
+
+
+def normalize_text(text):
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFKC', text)).strip()
+
+
+def split_sentences(text):
+    """Split a text into normalized sentences"""
+    text = normalize_text(text)
+    if not text:
+        return []
+    return [sentence.strip() for sentence in SENTENCE_END.split(text) if sentence.strip()]
+
+
+def sentence_key(sentence):
+    return hashlib.sha256(normalize_text(sentence).encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    """The entries of translation_memory.jsonl, by sentence key"""
+
+    def __init__(self, filepath=None):
+        self.filepath = filepath or os.path.join(SCRIPT_DIR, MEMORY_FILE)
+        self.entries = {}
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                for line_num, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        print(f"Warning: Invalid JSON on line {line_num} of {self.filepath}: {e}")
+                        continue
+                    # Placeholders never replace or stand in for a translation
+                    if entry.get('key') and entry.get('zh') and entry.get('backend') != STUB_BACKEND:
+                        self.entries[entry['key']] = entry
+        except FileNotFoundError:
+            pass
+
+    def get(self, sentence):
+        entry = self.entries.get(sentence_key(sentence))
+        return entry['zh'] if entry else None
+
+    def add(self, pairs, backend):
+        """Append [(sentence, translation)] to the memory file"""
+        date = datetime.date.today().isoformat()
+        with open(self.filepath, 'a', encoding='utf-8') as f:
+            for sentence, translation in pairs:
+                if not translation:
+                    continue
+                entry = {
+                    'key': sentence_key(sentence),
+                    'source': sentence,
+                    'zh': translation,
+                    'backend': backend,
+                    'date': date
+                }
+                if backend != STUB_BACKEND:
+                    self.entries[entry['key']] = entry
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def needs_translation(record, sources):
+    """True when a record has an enDesc and no exported translation of that enDesc
+
+    sources maps a no to the enDesc_source of its exported translation; an
+    exported translation without one is taken as current.
+    """
+    if not record.get(SOURCE_FIELD, '').strip():
+        return False
+    if not record.get(TARGET_FIELD, '').strip():
+        return True
+    source = sources.get(record.get('no'))
+    return bool(source) and source != sentence_key(record[SOURCE_FIELD])
+
+
+def pending_sentences(records, memory, sources=None):
+    """Distinct sentences of the records needing a translation that are not in the memory, in record order"""
+    pending = {}
+    for record in records:
+        if not needs_translation(record, sources or {}):
+            continue
+        for sentence in split_sentences(record[SOURCE_FIELD]):
+            if memory.get(sentence) is None:
+                pending.setdefault(sentence_key(sentence), sentence)
+    return list(pending.values())
+
+
+def stale_records(records, sources):
+    """nos of the records whose exported translation was made from another enDesc"""
+    return [record['no'] for record in records
+            if record.get(TARGET_FIELD, '').strip() and needs_translation(record, sources)]
+
+
+def build_translations(records, memory, sources=None):
+    """Return ({no: {'text': translation, 'source': key of the source text}}, pending sentences)
+    for the records with an enDesc and no current enDesc_trans2zh (none, or a stale one)
+    """
+    translations = {}
+    for record in records:
+        if not record.get('no') or not needs_translation(record, sources or {}):
+            continue
+        sentences = split_sentences(record.get(SOURCE_FIELD, ''))
+        translated = [memory.get(sentence) for sentence in sentences]
+        if sentences and all(translated):
+            translations[record['no']] = {
+                'text': ''.join(translated),
+                'source': sentence_key(record[SOURCE_FIELD])
+            }
+    return dict(sorted(translations.items())), pending_sentences(records, memory, sources)
+
+
+class StubTranslator:
+    """Local placeholder backend: marks each sentence instead of translating it"""
+
+    name = STUB_BACKEND
+
+    def translate(self, sentences):
+        return [f"[待译] {sentence}" for sentence in sentences]
+
+
+class CommandTranslator:
+    """Runs an external command per batch: JSON array of sentences on stdin,
+    JSON array of translations on stdout
+    """
+
+    name = 'command'
+
+    def __init__(self, command):
+        if not command:
+            raise ValueError('the command backend needs --command')
+        self.command = shlex.split(command)
+
+    def translate(self, sentences):
+        result = subprocess.run(self.command, input=json.dumps(sentences, ensure_ascii=False),
+                                capture_output=True, text=True, encoding='utf-8', check=True)
+        translations = json.loads(result.stdout)
+        if not isinstance(translations, list):
+            raise ValueError(f"{self.command[0]} returned {type(translations).__name__} "
+                             f"instead of a list of translations")
+        if len(translations) != len(sentences):
+            raise ValueError(f"{self.command[0]} returned {len(translations)} translations "
+                             f"for {len(sentences)} sentences")
+        return translations
+
+
+BACKENDS = {
+    STUB_BACKEND: StubTranslator,
+    'command': CommandTranslator
+}
+
+
+def load_backend(name, command=None):
+    """Instantiate a backend by name, or by 'module:Class' for custom translators"""
+    if name == 'command':
+        return CommandTranslator(command)
+    if name in BACKENDS:
+        return BACKENDS[name]()
+    module_name, _, class_name = name.partition(':')
+    if not class_name:
+        raise ValueError(f"unknown backend {name} (use {', '.join(BACKENDS)} or module:Class)")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def translate_pending(sentences, memory, backend, batch_size=BATCH_SIZE):
+    """Translate sentences in batches, appending each batch to the memory as it completes"""
+    name = getattr(backend, 'name', type(backend).__name__)
+    for start in range(0, len(sentences), batch_size):
+        batch = sentences[start:start + batch_size]
+        memory.add(zip(batch, backend.translate(batch)), name)
+        print(f"Translated {min(start + batch_size, len(sentences))}/{len(sentences)} sentences")
+
+
+def read_export(export_json):
+    """Items of cards_export.json ([] when missing)"""
+    try:
+        with open(export_json, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def export_sources(items):
+    """{no: enDesc_source} of the exported translations"""
+    return {item.get('id'): item[SOURCE_KEY_FIELD] for item in items
+            if item.get(TARGET_FIELD, '').strip() and item.get(SOURCE_KEY_FIELD)}
+
+
+def load_records(index_csv, export_json):
+    """Records of index.csv with the enDesc_trans2zh of cards_export.json, as the build joins them,
+    and the enDesc_source of the exported translations
+    """
+    with open(index_csv, 'r', encoding='utf-8', newline='') as f:
+        records = list(csv.DictReader(f))
+    items = read_export(export_json)
+    exported = {item.get('id'): item.get(TARGET_FIELD, '') for item in items}
+    for record in records:
+        record[TARGET_FIELD] = exported.get(record.get('no'), '')
+    return records, export_sources(items)
+
+
+def stamp_sources(records, export_json, nos=None):
+    """Record the key of the current enDesc as the enDesc_source of exported translations:
+    of the given nos, or of those without one. Returns the stamped nos.
+    """
+    items = read_export(export_json)
+    descs = {record.get('no'): record.get(SOURCE_FIELD, '') for record in records}
+    stamped = []
+    for item in items:
+        no = item.get('id')
+        if not item.get(TARGET_FIELD, '').strip() or not descs.get(no, '').strip():
+            continue
+        if (no in nos) if nos else not item.get(SOURCE_KEY_FIELD):
+            item[SOURCE_KEY_FIELD] = sentence_key(descs[no])
+            stamped.append(no)
+    if stamped:
+        with open(export_json, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(items, ensure_ascii=False, indent=2) + '\n')
+    return stamped
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sentence translation memory for the English insights')
+    parser.add_argument('--index', default=os.path.join(SCRIPT_DIR, 'index.csv'), help='Cards with no and enDesc')
+    parser.add_argument('--export', default=os.path.join(SCRIPT_DIR, 'cards_export.json'),
+                        help='Hand-maintained translations, which are not translated again')
+    parser.add_argument('--memory', default=os.path.join(SCRIPT_DIR, MEMORY_FILE))
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('status', help='Count translated cards and pending sentences')
+
+    translate_parser = subparsers.add_parser('translate', help='Translate the pending sentences')
+    translate_parser.add_argument('--backend', required=True,
+                                  help=f"{', '.join(BACKENDS)} or module:Class ({STUB_BACKEND} only writes placeholders)")
+    translate_parser.add_argument('--command', dest='backend_command', help='Translator command of the command backend')
+    translate_parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    translate_parser.add_argument('--limit', type=int, help='Translate at most this many sentences')
+
+    stamp_parser = subparsers.add_parser('stamp', help='Record the enDesc of exported translations as their source')
+    stamp_parser.add_argument('--no', action='append', dest='nos',
+                              help='Card whose exported translation was updated (default: those without a source)')
+
+    args = parser.parse_args()
+
+    records, sources = load_records(args.index, args.export)
+    memory = TranslationMemory(args.memory)
+
+    if args.command == 'stamp':
+        stamped = stamp_sources(records, args.export, args.nos)
+        print(f"Stamped {len(stamped)} exported translations")
+        records, sources = load_records(args.index, args.export)
+
+    if args.command == 'translate':
+        pending = pending_sentences(records, memory, sources)[:args.limit]
+        translate_pending(pending, memory, load_backend(args.backend, args.backend_command), args.batch_size)
+
+    translations, pending = build_translations(records, memory, sources)
+    stale = stale_records(records, sources)
+    print(f"{len(memory.entries)} sentences in memory, {len(translations)} cards translated, "
+          f"{len(stale)} stale exported translations, {len(pending)} sentences pending")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,20 +7,17 @@
 """
 
 import json
-import pandas as pd
 from pathlib import Path
 
-def main():
-    # 文件路径
-    script_dir = Path(__file__).parent
-    excel_path = script_dir / '卡牌.xlsx'
-    json_path = script_dir / 'cards.json'
+import source_cache
+
+def parse_excel_maps(excel_path):
+    """读取 Excel 文件并创建映射字典（结果按文件内容缓存）"""
+    # 只在解析 Excel 时才导入 pandas（缓存命中时不需要）
+    import pandas as pd
 
-    # 读取 Excel 文件
-    print(f"正在读取 Excel 文件: {excel_path}")
     df = pd.read_excel(excel_path)
 
-    # 创建映射字典
     # no -> cnName 映射
     no_to_cnname = {}
     # cnName -> (no, cnName) 映射（用于通过中文名匹配）
@@ -48,6 +45,18 @@ def main():
                 'cnName': cn_name
             }
 
+    return no_to_cnname, cnname_to_info, enname_to_info
+
+def main(excel_path=None, json_path=None):
+    # 文件路径（默认为脚本目录下的文件）
+    script_dir = Path(__file__).parent
+    excel_path = Path(excel_path) if excel_path else script_dir / '卡牌.xlsx'
+    json_path = Path(json_path) if json_path else script_dir / 'cards.json'
+
+    # 读取 Excel 文件
+    print(f"正在读取 Excel 文件: {excel_path}")
+    no_to_cnname, cnname_to_info, enname_to_info = source_cache.load_cached(str(excel_path), parse_excel_maps)
+
     print(f"Excel 文件包含 {len(no_to_cnname)} 个 no 映射，{len(cnname_to_info)} 个 cnName 映射，{len(enname_to_info)} 个 enName 映射")
 
     # 读取 JSON 文件
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Referential-integrity checks across the generate_index.py sources
+
+The sources, their join keys, fields and priorities come from the
+generate_index.py registry (BASE_SOURCE and SOURCES) and are read through
+its loaders, so the checks see the rows the build joins. Reports:
+- duplicate_no: the same no appears more than once in a source keyed by no
+  (an error when the repeats differ: only one of them ships)
+- duplicate_key: the same value of another join key (e.g. card_title in
+  en.json) or of a fallback key appears more than once in a source; like
+  duplicate_no, the last row silently wins
+- duplicate_name: the same name maps to different no (within a source, or
+  across the cnName of every source writing cnName)
+- field_conflict: two sources give different values for the same field of
+  the same card (e.g. cnName from cards.json vs e.csv); a warning, since the
+  registry priority decides which value ships (reported as 'kept')
+- orphan: a source row whose key (or fallback key) matches no Database card
+
+Usage:
+    python validate_sources.py [--report validation_report.json] [--strict] [--fail-on warning]
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+
+import source_cache
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SEVERITIES = ['warning', 'error']
+
+# Default severity of each check; repeated nos lose rows, conflicts between
+# sources are settled by the registry priority, orphans only mean a row is unused
+CHECK_SEVERITY = {
+    'duplicate_no': 'error',
+    'duplicate_key': 'error',
+    'duplicate_name': 'warning',
+    'field_conflict': 'warning',
+    'orphan': 'warning'
+}
+
+
+def load_sources(base_dir='.'):
+    """Load the base rows and the projected rows of every registered source
+    whose files exist
+    Returns (base rows, [(spec, projected rows)]).
+    """
+    # generate_index imports this module
+    import generate_index
+
+    base = []
+    for filename in generate_index.source_files(generate_index.BASE_SOURCE):
+        filepath = os.path.join(base_dir, filename)
+        if os.path.exists(filepath):
+            base += source_cache.load_cached(filepath, generate_index.load_base_rows)
+
+    sources = []
+    for spec in generate_index.SOURCES:
+        if not os.path.exists(os.path.join(base_dir, spec['file'])):
+            continue
+        try:
+            rows = generate_index.load_source(spec['name'], source_cache.enabled, base_dir)
+        except Exception as e:
+            if not spec.get('optional'):
+                raise
+            print(f"Warning: Error reading {spec['file']}: {e}, not validating {spec['name']}")
+            continue
+        sources.append((spec, rows))
+    return base, sources
+
+
+class Report:
+    def __init__(self):
+        self.issues = []
+
+    def add(self, check, source, key, severity=None, **detail):
+        self.issues.append({
+            'check': check,
+            'severity': severity or CHECK_SEVERITY[check],
+            'source': source,
+            'key': key,
+            'detail': detail
+        })
+
+    def count(self, severity):
+        return sum(1 for issue in self.issues if issue['severity'] == severity)
+
+    def summary(self):
+        counts = defaultdict(int)
+        for issue in self.issues:
+            counts[f"{issue['check']}:{issue['source']}"] += 1
+        return dict(sorted(counts.items()))
+
+    def to_dict(self):
+        return {
+            'errors': self.count('error'),
+            'warnings': self.count('warning'),
+            'summary': self.summary(),
+            'issues': self.issues
+        }
+
+
+def check_duplicate_no(report, source, rows, check='duplicate_no', **detail):
+    """rows: iterable of (key, value); report each key seen more than once
+    Repeats with identical values (e.g. reprints in the Database) are warnings.
+    """
+    seen = defaultdict(list)
+    for no, value in rows:
+        if no:
+            seen[no].append(value)
+    for no, values in seen.items():
+        if len(values) > 1:
+            severity = 'error' if len(set(map(json.dumps, values))) > 1 else 'warning'
+            report.add(check, source, no, severity=severity, values=values, **detail)
+
+
+def check_duplicate_name(report, source, rows):
+    """rows: iterable of (no, name); report names mapping to different no"""
+    name_to_nos = defaultdict(set)
+    for no, name in rows:
+        if no and name:
+            name_to_nos[name].add(no)
+    for name, nos in name_to_nos.items():
+        if len(nos) > 1:
+            report.add('duplicate_name', source, name, nos=sorted(nos))
+
+
+def check_field_conflicts(report, field, values_by_spec):
+    """values_by_spec: [(spec, {no: value})]; report no whose non-empty values
+    differ, with the source whose value the join keeps
+    """
+    by_no = defaultdict(list)
+    for spec, values in values_by_spec:
+        for no, value in values.items():
+            if no and value not in ('', None):
+                by_no[no].append((spec, value))
+    for no, entries in by_no.items():
+        if len({json.dumps(value, sort_keys=True) for _, value in entries}) < 2:
+            continue
+        # Joins run in ascending priority; fill_only sources never replace a value
+        kept = None
+        for spec, value in sorted(entries, key=lambda entry: entry[0]['priority']):
+            if kept is None or field not in spec.get('fill_only', []):
+                kept = spec
+        report.add('field_conflict', '+'.join(sorted(spec['file'] for spec, _ in entries)), no, field=field,
+                   values={spec['file']: value for spec, value in entries}, kept=kept['file'])
+
+
+def check_orphans(report, source, keys, known, key_name):
+    for key in keys:
+        if key and key not in known:
+            report.add('orphan', source, key, missing=key_name)
+
+
+def validate(base, sources):
+    """Run every check over the rows of load_sources and return a Report"""
+    import generate_index
+
+    report = Report()
+
+    # generate_index only keeps the decks of BASE_SOURCE, but ratings of
+    # other decks still name real cards
+    decks = generate_index.BASE_SOURCE['decks']
+    database = [(generate_index.create_no(row['Deck'], row['Number']), row['Name'].strip())
+                for row in base if row['Deck'].strip() in decks and row['Number'].strip() and row['Name'].strip()]
+    known = {
+        'no': {no for no, _ in database},
+        'enName': {row['Name'].strip() for row in base if row['Name'].strip()}
+    }
+
+    # Duplicate keys (generate_index keeps the first Database row, sources keep the last)
+    check_duplicate_no(report, 'database', database)
+    check_duplicate_name(report, 'database', database)
+    for spec, rows in sources:
+        key_field = spec['key'][0]
+        keyed = [(row['key'], row['values']) for row in rows]
+        if key_field == 'no':
+            check_duplicate_no(report, spec['file'], keyed)
+        else:
+            check_duplicate_no(report, spec['file'], keyed, 'duplicate_key', field=key_field)
+        if 'fallback_key' in spec:
+            # Only rows without a key join on the fallback key
+            fallback = [(row['fallback'], row['values']) for row in rows if not row['key']]
+            check_duplicate_no(report, spec['file'], fallback, 'duplicate_key', field=spec['fallback_key'][0])
+
+    # Duplicate Chinese names mapping to different no
+    cn_rows = []
+    for spec, rows in sources:
+        if spec['key'][0] == 'no' and 'cnName' in spec['fields']:
+            named = [(row['key'], row['values']['cnName'].strip()) for row in rows]
+            check_duplicate_name(report, spec['file'], named)
+            cn_rows += named
+    check_duplicate_name(report, 'cnName', cn_rows)
+    known['cnName'] = {name for no, name in cn_rows if no in known['no']}
+
+    # Cross-source field conflicts, per record field written by several no-keyed sources
+    by_field = defaultdict(list)
+    for spec, rows in sources:
+        if spec['key'][0] == 'no':
+            for field in spec['fields']:
+                by_field[field].append((spec, {row['key']: row['values'][field] for row in rows}))
+    for field, values_by_spec in by_field.items():
+        if len(values_by_spec) > 1:
+            check_field_conflicts(report, field, values_by_spec)
+
+    # Orphans: rows that cannot join to a Database card
+    for spec, rows in sources:
+        key_field = spec['key'][0]
+        check_orphans(report, spec['file'], [row['key'] for row in rows], known.get(key_field, set()), key_field)
+        if 'fallback_key' in spec:
+            fallback_field = spec['fallback_key'][0]
+            check_orphans(report, spec['file'], [row['fallback'] for row in rows if not row['key']],
+                          known.get(fallback_field, set()), fallback_field)
+
+    return report
+
+
+def run_validation(base_dir='.', report_path='validation_report.json', fail_on=None):
+    """Validate the sources in base_dir and write the report
+    Returns the Report; exits with status 1 if an issue at or above fail_on is found.
+    """
+    report = validate(*load_sources(base_dir))
+
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+
+    print(f"Validation: {report.count('error')} errors, {report.count('warning')} warnings (see {report_path})")
+    for key, count in report.summary().items():
+        print(f"  {key}: {count}")
+
+    if fail_on:
+        threshold = SEVERITIES.index(fail_on)
+        failing = [issue for issue in report.issues if SEVERITIES.index(issue['severity']) >= threshold]
+        if failing:
+            print(f"Validation failed: {len(failing)} issues at or above '{fail_on}'")
+            sys.exit(1)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the generate_index.py sources for duplicates, conflicts and orphans')
+    parser.add_argument('--dir', default=SCRIPT_DIR, help='Directory containing the source files')
+    parser.add_argument('--report', default=os.path.join(SCRIPT_DIR, 'validation_report.json'))
+    parser.add_argument('--strict', action='store_true', help='Exit with status 1 if any error is found')
+    parser.add_argument('--fail-on', choices=SEVERITIES, help='Exit with status 1 if any issue at this severity or above is found')
+    args = parser.parse_args()
+
+    fail_on = args.fail_on or ('error' if args.strict else None)
+    run_validation(args.dir, args.report, fail_on)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Link cards to the moments of the review videos that discuss them
+
+Each video has an SRT transcript and a curated review file (the source of
+chenTier/chenDesc). Every reviewed card is anchored to one transcript cue:
+- 'time' videos: the review's time field is the start second of its cue
+  (H:M:S, as written by parse_srt.py)
+- 'text' videos: the reviews carry no time, so they are aligned to the
+  transcript in order. Each (review, cue) pair is scored by how much of the
+  review's desc appears in the next few cues, plus how much of its name
+  appears at the cue itself, and a dynamic program picks the increasing
+  sequence of cues with the best total score.
+A clip runs from its anchor cue to the end of the cue before the next
+anchor, capped at MAX_CLIP_MS.
+
+Usage:
+    python video_clips.py [--output video_clips.json]
+"""
+
+import argparse
+import json
+import os
+import re
+from bisect import bisect_left
+
+import numpy as np
+
+import parse_srt
+import source_cache
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+OUTPUT_FILE = 'video_clips.json'
+
+# video id, transcript, curated reviews of the same video, how reviews are anchored
+VIDEOS = [
+    {
+        'video': 'even more set 职业_1',
+        'srt': 'even more set 职业_1.srt',
+        'reviews': 'set_o.json',
+        'anchor': 'time'
+    },
+    {
+        'video': 'even more set 次发',
+        'srt': 'even more set 次发.srt',
+        'reviews': 'even_more_set_minor_improvements.json',
+        'anchor': 'text'
+    }
+]
+
+MAX_CLIP_MS = 5 * 60 * 1000
+
+# Text alignment: cues compared with a review's desc, cues compared with its name,
+# weight of the name score and minimum score for a review to be anchored
+DESC_WINDOW = 6
+NAME_WINDOW = 2
+NAME_WEIGHT = 3.0
+MIN_SCORE = 0.3
+
+
+def project_reviews(data):
+    """(no, name, time, desc) for each review"""
+    return [
+        (item.get('no', '').strip(), item.get('name', '').strip(),
+         item.get('time', '').strip(), item.get('desc', '').strip())
+        for item in data if isinstance(item, dict)
+    ]
+
+
+def bigrams(text):
+    """Set of character bigrams of text without punctuation or spaces"""
+    text = re.sub(r'[\W_]', '', text.lower())
+    return {text[i:i + 2] for i in range(len(text) - 1)} or set(text)
+
+
+def window_matrix(cue_terms, vocabulary, width):
+    """Boolean matrix (cues x vocabulary): term occurs in cue i..i+width-1"""
+    matrix = np.zeros((len(cue_terms), len(vocabulary)), dtype=np.float32)
+    cols = [[vocabulary[t] for t in terms if t in vocabulary] for terms in cue_terms]
+    for i in range(len(cue_terms)):
+        for j in range(i, min(i + width, len(cue_terms))):
+            matrix[i, cols[j]] = 1
+    return matrix
+
+
+def review_matrix(texts, vocabulary):
+    """Row-normalized matrix (reviews x vocabulary) of the bigrams of texts"""
+    matrix = np.zeros((len(texts), len(vocabulary)), dtype=np.float32)
+    for row, text in enumerate(texts):
+        cols = [vocabulary[t] for t in bigrams(text)]
+        if cols:
+            matrix[row, cols] = 1 / len(cols)
+    return matrix
+
+
+def align_reviews(cues, reviews):
+    """Anchor reviews (in video order) to cues; returns {review index: cue index}"""
+    cue_terms = [bigrams(cue['text']) for cue in cues]
+    terms = set()
+    for _, name, _, desc in reviews:
+        terms |= bigrams(name) | bigrams(desc)
+    vocabulary = {term: col for col, term in enumerate(sorted(terms))}
+
+    # scores[k, i]: share of review k's desc in the window at cue i, plus weighted share of its name
+    scores = review_matrix([desc for _, _, _, desc in reviews], vocabulary) @ \
+        window_matrix(cue_terms, vocabulary, DESC_WINDOW).T
+    scores += NAME_WEIGHT * (review_matrix([name for _, name, _, _ in reviews], vocabulary) @
+                             window_matrix(cue_terms, vocabulary, NAME_WINDOW).T)
+    scores[scores < MIN_SCORE] = -np.inf
+
+    # best[k, i]: best total for the first k reviews using the first i cues
+    n_reviews, n_cues = scores.shape
+    best = np.zeros((n_reviews + 1, n_cues + 1))
+    gains = np.full((n_reviews, n_cues + 1), -np.inf)
+    for k in range(n_reviews):
+        gains[k, 1:] = best[k, :-1] + scores[k]
+        best[k + 1] = np.maximum(best[k], np.maximum.accumulate(gains[k]))
+
+    anchors = {}
+    i = n_cues
+    for k in range(n_reviews, 0, -1):
+        if best[k, i] == best[k - 1, i]:
+            continue
+        i = int(np.argmax(gains[k - 1, :i + 1])) - 1
+        anchors[k - 1] = i
+    return anchors
+
+
+def anchor_by_time(cues, reviews):
+    """Anchor each review to the first cue starting at or after its H:M:S time"""
+    starts = [cue['start_ms'] for cue in cues]
+    anchors = {}
+    for k, (_, _, time, _) in enumerate(reviews):
+        match = re.fullmatch(r'(\d+):(\d+):(\d+)', time)
+        if match:
+            i = bisect_left(starts, parse_srt.timestamp_to_ms(*match.groups(), 0))
+            if i < len(cues):
+                anchors[k] = i
+    return anchors
+
+
+def build_video_clips(records, base_dir='.'):
+    """Return {no: [[video, start_ms, end_ms], ...]}
+    records supply the cnName -> no map for reviews without no.
+    """
+    no_by_name = {}
+    for record in records:
+        name = str(record.get('cnName', '')).strip()
+        if name and record.get('no'):
+            no_by_name.setdefault(name, record['no'])
+
+    clips = {}
+    for video in VIDEOS:
+        srt_path = os.path.join(base_dir, video['srt'])
+        reviews_path = os.path.join(base_dir, video['reviews'])
+        if not os.path.exists(srt_path) or not os.path.exists(reviews_path):
+            print(f"Warning: {video['srt']} or {video['reviews']} not found, skipping {video['video']}")
+            continue
+
+        cues = [cue for cue in source_cache.load_cached(srt_path, parse_srt.parse_cues)
+                if cue['start_ms'] is not None]
+        reviews = source_cache.load_json(reviews_path, project_reviews)
+        if video['anchor'] == 'time':
+            anchors = anchor_by_time(cues, reviews)
+        else:
+            anchors = align_reviews(cues, reviews)
+
+        starts = sorted(set(anchors.values()))
+        next_start = dict(zip(starts, starts[1:] + [len(cues)]))
+        resolved = 0
+        for k, i in sorted(anchors.items()):
+            no, name = reviews[k][0], reviews[k][1]
+            no = no or no_by_name.get(name)
+            if not no:
+                continue
+            start_ms = cues[i]['start_ms']
+            end_ms = min(cues[next_start[i] - 1]['end_ms'], start_ms + MAX_CLIP_MS)
+            clips.setdefault(no, []).append([video['video'], start_ms, end_ms])
+            resolved += 1
+        print(f"  {video['video']}: {resolved}/{len(reviews)} reviews linked to clips")
+
+    return {no: sorted(items, key=lambda clip: (clip[0], clip[1])) for no, items in sorted(clips.items())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Link cards to review video timestamps')
+    parser.add_argument('--dir', default=SCRIPT_DIR, help='Directory containing the transcripts and reviews')
+    parser.add_argument('--records', default=os.path.join(SCRIPT_DIR, 'card_all.json'),
+                        help='Cards with no and cnName, used to resolve reviews without no')
+    parser.add_argument('--output', default=os.path.join(SCRIPT_DIR, OUTPUT_FILE))
+    args = parser.parse_args()
+
+    with open(args.records, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+
+    clips = build_video_clips(records, args.dir)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(clips, f, ensure_ascii=False, separators=(',', ':'))
+    print(f"Wrote clips of {len(clips)} cards to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -43,7 +43,9 @@ const iconMap: Record<string, React.ComponentType<{ className?: string }>> = {
 };
 
 function App() {
-  const { t } = useTranslation();
+  const { t, i18n } = useTranslation();
+  // Card bundle of the UI locale (scripts/card_bundles.py); only zh shows the translated comments
+  const bundleLocale = i18n.language === 'zh' || i18n.language.startsWith('zh-') ? 'zh' : 'en';
   const [cardsData, setCardsData] = useState<ICard[]>([]);
   const [authorsData, setAuthorsData] = useState<IAuthors | undefined>(undefined);
   const [socialLinks, setSocialLinks] = useState<SocialLink[]>([]);
@@ -52,38 +54,30 @@ function App() {
   const [recommendedCards, setRecommendedCards] = useState<ICard[]>([]);
   const [displayCount, setDisplayCount] = useState(PAGE_SIZE);
 
-  // Load cards and authors data
+  // Load the cards of the UI locale, again when the language changes
   useEffect(() => {
-    const loadData = async () => {
+    const loadCards = async () => {
       try {
-        setIsLoading(true);
-
-        // Load cards.json
-        const cardsResponse = await fetch('/cards.json');
-        const cards = await cardsResponse.json();
-        setCardsData(cards);
-
-        // Generate random recommended cards (prioritize cards with chenTier and chenDesc)
-        const recommended = getRandomRecommendedCards(cards, 3);
-        setRecommendedCards(recommended);
-
-        // Load authors.json
+        let cards: ICard[];
         try {
-          const authorsResponse = await fetch('/authors.json');
-          const authors = await authorsResponse.json();
-          setAuthorsData(authors);
-        } catch (error) {
-          console.warn('Authors data not found, continuing without it:', error);
+          const bundleResponse = await fetch(`/cards.${bundleLocale}.json`);
+          if (!bundleResponse.ok) throw new Error(`cards.${bundleLocale}.json: HTTP ${bundleResponse.status}`);
+          cards = await bundleResponse.json();
+        } catch {
+          // Fall back to the bundle with every field
+          const cardsResponse = await fetch('/cards.json');
+          if (!cardsResponse.ok) throw new Error(`cards.json: HTTP ${cardsResponse.status}`);
+          cards = await cardsResponse.json();
         }
+        setCardsData(cards);
 
-        // Load socialLinks.json
-        try {
-          const socialLinksResponse = await fetch('/socialLinks.json');
-          const socialLinks = await socialLinksResponse.json();
-          setSocialLinks(socialLinks);
-        } catch (error) {
-          console.warn('Social links data not found, continuing without it:', error);
-        }
+        // Generate random recommended cards (prioritize cards with chenTier and chenDesc),
+        // and keep the same ones when switching language
+        setRecommendedCards((current) =>
+          current.length > 0
+            ? current.map((card) => cards.find((c) => c.no === card.no) ?? card)
+            : getRandomRecommendedCards(cards, 3)
+        );
       } catch (error) {
         console.error('Error loading cards data:', error);
       } finally {
@@ -91,6 +85,31 @@ function App() {
       }
     };
 
+    loadCards();
+  }, [bundleLocale]);
+
+  // Load authors and social links data
+  useEffect(() => {
+    const loadData = async () => {
+      // Load authors.json
+      try {
+        const authorsResponse = await fetch('/authors.json');
+        const authors = await authorsResponse.json();
+        setAuthorsData(authors);
+      } catch (error) {
+        console.warn('Authors data not found, continuing without it:', error);
+      }
+
+      // Load socialLinks.json
+      try {
+        const socialLinksResponse = await fetch('/socialLinks.json');
+        const socialLinks = await socialLinksResponse.json();
+        setSocialLinks(socialLinks);
+      } catch (error) {
+        console.warn('Social links data not found, continuing without it:', error);
+      }
+    };
+
     loadData();
   }, []);
 